@@ -0,0 +1,8 @@
+"""Stand-alone benchmarks for Itchcraft.
+
+Run a benchmark module from the project root, for example:
+
+.. code:: shell
+
+   poetry run python -m benchmarks.discovery
+"""
@@ -0,0 +1,57 @@
+"""Measures PyUSB discovery time as a function of the number of
+discovery workers, with a fixed latency per string descriptor read."""
+
+from functools import partial
+import timeit
+
+from itchcraft import devices
+from tests.fakes import fake_bus, FakeUsbBackend, FakeUsbDevice
+
+HEALERS = 16
+STRING_LATENCY = 0.005
+WORKERS = (1, 2, 4, 8, 16)
+REPEAT = 5
+
+
+def _heat_it(address: int) -> FakeUsbDevice:
+    return FakeUsbDevice(
+        idVendor=0x32F9,
+        idProduct=0xFCBA,
+        product='heat it',
+        serial_number=f'{address:04d}',
+        address=address,
+    )
+
+
+def _discover(workers: int) -> None:
+    # PyUSB caches string descriptors per device object, so every round
+    # needs a fresh backend to include the descriptor reads.
+    healers = [_heat_it(address) for address in range(1, HEALERS + 1)]
+    backend = FakeUsbBackend(
+        fake_bus(HEALERS, healers), string_latency=STRING_LATENCY
+    )
+    for bite_healer in devices.find_bite_healers(
+        backend=backend, workers=workers
+    ):
+        assert bite_healer.serial_number is not None
+
+
+def main() -> None:
+    """Prints discovery timings and speedups for each worker count."""
+    print(f"{'workers':>8} {'discovery':>12} {'speedup':>8}")
+    baseline = None
+    for workers in WORKERS:
+        elapsed = min(
+            timeit.repeat(
+                partial(_discover, workers), number=1, repeat=REPEAT
+            )
+        )
+        baseline = baseline or elapsed
+        print(
+            f'{workers:>8} {elapsed * 1e3:>9.1f} ms'
+            + f' {baseline / elapsed:>7.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
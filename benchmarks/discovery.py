@@ -0,0 +1,45 @@
+"""Measures enumeration time as a function of USB bus size."""
+
+from collections.abc import Callable
+from functools import partial
+import timeit
+
+from itchcraft import devices
+from tests.fakes import fake_bus, FakeUsbBackend, FakeUsbDevice
+
+BUS_SIZES = (10, 100, 1000)
+REPEAT = 20
+
+
+def _heat_it() -> FakeUsbDevice:
+    return FakeUsbDevice(
+        idVendor=0x32F9,
+        idProduct=0xFCBA,
+        product='heat it',
+        serial_number='0815',
+    )
+
+
+def _enumerate(backend: FakeUsbBackend) -> None:
+    list(devices.find_bite_healers(backend=backend))
+
+
+def _best_of(function: Callable[[], object]) -> float:
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    """Prints enumeration timings for each bus size."""
+    print(f"{'bus size':>10} {'find_bite_healers':>20}")
+    for size in BUS_SIZES:
+        enumeration = _best_of(
+            partial(
+                _enumerate,
+                FakeUsbBackend(fake_bus(size, healers=[_heat_it()])),
+            )
+        )
+        print(f'{size:>10} {enumeration * 1e3:>17.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
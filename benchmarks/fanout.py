@@ -0,0 +1,46 @@
+"""Measures wall time of activating many bite healers at once."""
+
+import logging
+import time
+from typing import Optional
+from unittest.mock import patch
+
+from itchcraft import devices
+from itchcraft.prefs import Preferences
+from itchcraft.start import start_all_with_preferences
+from tests.fakes import fake_bite_healer, FakeBulkTransferDevice
+
+DEVICE_COUNTS = (1, 4, 12)
+LATENCY = 0.01
+"""Time in seconds that each fake bulk transfer takes."""
+
+
+def _run(count: int, max_workers: Optional[int]) -> float:
+    bite_healers = [
+        fake_bite_healer(FakeBulkTransferDevice(latency=LATENCY))
+        for _ in range(count)
+    ]
+    with patch.object(
+        devices, 'find_bite_healers', lambda **_: iter(bite_healers)
+    ):
+        start_time = time.perf_counter()
+        start_all_with_preferences(Preferences(), max_workers=max_workers)
+        return time.perf_counter() - start_time
+
+
+def main() -> None:
+    """Prints sequential and concurrent timings for each device
+    count."""
+    logging.disable(logging.CRITICAL)
+    print(f"{'devices':>10} {'sequential':>14} {'concurrent':>14}")
+    for count in DEVICE_COUNTS:
+        sequential = _run(count, max_workers=1)
+        concurrent = _run(count, max_workers=None)
+        print(
+            f'{count:>10} {sequential * 1e3:>11.1f} ms'
+            + f' {concurrent * 1e3:>11.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
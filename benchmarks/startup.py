@@ -0,0 +1,92 @@
+"""Measures CLI import time with `python -X importtime`."""
+
+from collections.abc import Mapping
+import os
+import subprocess
+import sys
+from typing import Optional
+
+COMMANDS = (('--version',), ('--help',))
+HEAVY_MODULES = frozenset(('usb', 'tenacity', 'fire'))
+"""Top-level modules that `--version` must never import."""
+
+REPEAT = 5
+
+_IMPORT_TIME_PREFIX = 'import time:'
+_HEADER_SUFFIX = '| imported package'
+
+
+def import_times(
+    *args: str, env: Optional[Mapping[str, str]] = None
+) -> dict[str, int]:
+    """Runs the CLI in a fresh interpreter and returns the cumulative
+    import time in microseconds for each module that was imported at
+    the top level, i.e. not as a dependency of another module.
+
+    :param args:
+        the command line arguments for the CLI.
+
+    :param env:
+        environment variables to set in addition to the current ones.
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'itchcraft', *args],
+        capture_output=True,
+        check=False,
+        env={**os.environ, **(env or {})},
+        text=True,
+    ).stderr
+    times: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith(_IMPORT_TIME_PREFIX) or line.endswith(
+            _HEADER_SUFFIX
+        ):
+            continue
+        _, cumulative, module = line.rsplit('|', maxsplit=2)
+        if not module.startswith('  '):
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def heavy_modules(*args: str) -> list[str]:
+    """Returns the heavy modules that the CLI imports when run with
+    the given arguments."""
+    stderr = subprocess.run(
+        [
+            sys.executable,
+            '-X',
+            'importtime',
+            '-c',
+            'from itchcraft import cli; cli.run()',
+            *args,
+        ],
+        capture_output=True,
+        check=False,
+        text=True,
+    ).stderr
+    return sorted(
+        {
+            line.rsplit('|', maxsplit=1)[1].strip()
+            for line in stderr.splitlines()
+            if line.startswith(_IMPORT_TIME_PREFIX)
+        }
+        & HEAVY_MODULES
+    )
+
+
+def main() -> None:
+    """Prints the best-of-N total import time for each command and
+    exits with a non-zero status if `--version` loads a heavy
+    module."""
+    print(f"{'command':>10} {'import time':>14}")
+    for args in COMMANDS:
+        best = min(
+            sum(import_times(*args).values()) for _ in range(REPEAT)
+        )
+        print(f"{' '.join(args):>10} {best / 1e3:>11.1f} ms")
+    if loaded := heavy_modules('--version'):
+        sys.exit(f"--version imported {', '.join(loaded)}")
+
+
+if __name__ == '__main__':
+    main()
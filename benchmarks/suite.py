@@ -0,0 +1,230 @@
+"""Runs all micro-benchmarks and reports the results as JSON.
+
+Usage from the project root:
+
+.. code:: shell
+
+   poetry run python -m benchmarks.suite --output results.json
+   poetry run python -m benchmarks.suite --baseline results.json
+
+With `--baseline`, exits with a non-zero status if any benchmark got
+slower than the baseline by more than the given tolerance.
+"""
+
+import argparse
+from collections.abc import Callable, Iterator
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from typing import Any, cast
+
+import usb.core
+
+from itchcraft import devices
+from itchcraft.backend import UsbBulkTransferDevice
+from itchcraft.device import from_usb_device
+from itchcraft.format import format_table
+from itchcraft.heat_it import GET_STATUS, HeatItDevice
+from itchcraft.prefs import Preferences
+from itchcraft.support import SUPPORT_STATEMENTS
+from tests.fakes import (
+    fake_bite_healer,
+    fake_bus,
+    FakeBulkTransferDevice,
+    FakePyUsbDevice,
+    FakeUsbBackend,
+    FakeUsbDevice,
+)
+
+BUS_SIZES = (10, 100, 1000)
+TABLE_SIZES = (10, 1000)
+DISPATCHED_COMMAND = ('--backend=sim', 'info', '--format=json')
+"""Command that is timed both with the dispatcher and with Fire."""
+
+COLD_START_COMMANDS = (('--version',), ('--help',), DISPATCHED_COMMAND)
+
+REPEAT = 20
+"""Number of rounds per benchmark; the fastest round counts."""
+
+DEFAULT_TOLERANCE = 0.25
+"""Relative slowdown against the baseline that is still accepted."""
+
+SCHEMA_VERSION = 1
+
+Benchmark = Callable[[], float]
+"""A function that runs one round and returns the time per operation
+in seconds."""
+
+
+def _timed(function: Callable[[], object], number: int) -> Benchmark:
+    return lambda: timeit.timeit(function, number=number) / number
+
+
+def _heat_it() -> FakeUsbDevice:
+    return FakeUsbDevice(
+        idVendor=0x32F9,
+        idProduct=0xFCBA,
+        product='heat it',
+        serial_number='0815',
+    )
+
+
+def _find_bite_healers(size: int) -> Benchmark:
+    backend = FakeUsbBackend(fake_bus(size, healers=[_heat_it()]))
+    return _timed(
+        lambda: list(devices.find_bite_healers(backend=backend)), number=1
+    )
+
+
+def _from_usb_device() -> float:
+    # PyUSB caches string descriptors per device object, so every round
+    # needs fresh ones to include the descriptor reads. Metadata reads
+    # them lazily, so they are accessed explicitly.
+    usb_devices = list(
+        usb.core.find(
+            find_all=True,
+            backend=FakeUsbBackend(fake_bus(100, healers=[_heat_it()])),
+        )
+    )
+    statement = SUPPORT_STATEMENTS[0]
+    start_time = time.perf_counter()
+    for usb_device in usb_devices:
+        metadata = from_usb_device(usb_device, statement)
+        _strings = (metadata.usb_product_name, metadata.serial_number)
+    return (time.perf_counter() - start_time) / len(usb_devices)
+
+
+def _msg_start_heating() -> Benchmark:
+    bite_healer = HeatItDevice(FakeBulkTransferDevice())
+    preferences = Preferences()
+
+    def send() -> None:
+        bite_healer.msg_start_heating(preferences)
+        cast(FakeBulkTransferDevice, bite_healer.device).requests.clear()
+
+    return _timed(send, number=10_000)
+
+
+def _bulk_transfer() -> Benchmark:
+    device = UsbBulkTransferDevice(
+        cast(usb.core.Device, FakePyUsbDevice())
+    )
+    return _timed(lambda: device.bulk_transfer(GET_STATUS), number=10_000)
+
+
+def _format_table(size: int) -> Benchmark:
+    bite_healers = [
+        fake_bite_healer(FakeBulkTransferDevice(serial_number=f'{index}'))
+        for index in range(size)
+    ]
+    return _timed(lambda: format_table(bite_healers), number=1)
+
+
+def _cold_start(*args: str, use_fire: bool = False) -> Benchmark:
+    env = {**os.environ, 'ITCHCRAFT_USE_FIRE': '1' if use_fire else ''}
+
+    def run() -> None:
+        subprocess.run(
+            [sys.executable, '-m', 'itchcraft', *args],
+            capture_output=True,
+            check=False,
+            env=env,
+        )
+
+    return _timed(run, number=1)
+
+
+def benchmarks() -> Iterator[tuple[str, Benchmark]]:
+    """Yields the name and function of each benchmark."""
+    for size in BUS_SIZES:
+        yield f'find_bite_healers[bus={size}]', _find_bite_healers(size)
+    yield 'from_usb_device', _from_usb_device
+    yield 'msg_start_heating', _msg_start_heating()
+    yield 'bulk_transfer', _bulk_transfer()
+    for size in TABLE_SIZES:
+        yield f'format_table[devices={size}]', _format_table(size)
+    for args in COLD_START_COMMANDS:
+        yield f"cold_start[{' '.join(args)}]", _cold_start(*args)
+    yield (
+        f"cold_start_fire[{' '.join(DISPATCHED_COMMAND)}]",
+        _cold_start(*DISPATCHED_COMMAND, use_fire=True),
+    )
+
+
+def run(repeat: int = REPEAT) -> dict[str, Any]:
+    """Runs all benchmarks and returns a JSON-serializable report.
+
+    :param repeat:
+        number of rounds per benchmark. The fastest round counts.
+    """
+    results = {
+        name: min(benchmark() for _ in range(repeat))
+        for name, benchmark in benchmarks()
+    }
+    return {
+        'schema': SCHEMA_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'unit': 'seconds per operation',
+        'results': results,
+    }
+
+
+def regressions(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    """Compares a report against a baseline and describes every
+    benchmark that got slower by more than `tolerance`.
+
+    Benchmarks that are missing from either side are ignored.
+    """
+    baseline_results: dict[str, float] = baseline['results']
+    return [
+        f'{name}: {current * 1e6:.1f} µs'
+        + f' vs. {previous * 1e6:.1f} µs in baseline'
+        for name, current in report['results'].items()
+        if (previous := baseline_results.get(name)) is not None
+        and current > previous * (1 + tolerance)
+    ]
+
+
+def main() -> None:
+    """Writes a JSON report and optionally fails on regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '-o', '--output', help='write the report to this file'
+    )
+    parser.add_argument(
+        '-b', '--baseline', help='compare against this earlier report'
+    )
+    parser.add_argument(
+        '-t', '--tolerance', type=float, default=DEFAULT_TOLERANCE
+    )
+    parser.add_argument('-r', '--repeat', type=int, default=REPEAT)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    report = run(args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if slower := regressions(report, baseline, args.tolerance):
+            sys.exit('Regressions found:\n' + '\n'.join(slower))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Measures sysfs discovery time as a function of USB bus size."""
+
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+import tempfile
+import timeit
+
+from itchcraft import sysfs
+from tests.fakes import write_sysfs_device
+
+BUS_SIZES = (10, 100, 1000)
+REPEAT = 20
+
+
+def _fake_sysfs(root: Path, size: int) -> None:
+    write_sysfs_device(
+        root, '1-0', vid=0x32F9, pid=0xFCBA, product='heat it'
+    )
+    for index in range(1, size):
+        write_sysfs_device(root, f'1-{index}', vid=0x1D6B, pid=0x0002)
+
+
+def _best_of(function: Callable[[], object]) -> float:
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    """Prints sysfs discovery timings for each bus size."""
+    print(f"{'bus size':>10} {'sysfs discovery':>18}")
+    for size in BUS_SIZES:
+        with tempfile.TemporaryDirectory() as sysfs_root:
+            _fake_sysfs(Path(sysfs_root), size)
+            discovery = _best_of(
+                partial(
+                    sysfs.find_usb_devices, Path(sysfs_root), {0x32F9}
+                )
+            )
+        print(f'{size:>10} {discovery * 1e3:>15.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Measures the per-call overhead of `UsbBulkTransferDevice`."""
+
+import array
+import logging
+import timeit
+from typing import Any, cast, Optional
+
+import usb.core
+
+from itchcraft.backend import UsbBulkTransferDevice
+from itchcraft.heat_it import GET_STATUS
+from itchcraft.types import SizedPayload
+from tests.fakes import FakePyUsbDevice
+
+ITERATIONS = 100_000
+
+
+class _LegacyUsbBulkTransferDevice(UsbBulkTransferDevice):
+    """Allocates a fresh response buffer on every call, as
+    `UsbBulkTransferDevice` used to."""
+
+    def bulk_transfer(self, request: SizedPayload) -> bytes:
+        buffer = array.array('B', bytearray(self.MAX_RESPONSE_LENGTH))
+        assert self.device.write(self.endpoint_out, request) == len(
+            request
+        )
+        num_bytes_received = self.device.read(self.endpoint_in, buffer)
+        response = buffer[:num_bytes_received].tobytes()
+        logging.getLogger(__name__).debug(
+            'Got response: %s (%s)', response.hex(' '), response
+        )
+        return response
+
+
+def _connect(cls: type[UsbBulkTransferDevice]) -> UsbBulkTransferDevice:
+    return cls(cast(usb.core.Device, _NonRecordingDevice()))
+
+
+class _NonRecordingDevice(FakePyUsbDevice):
+    def write(
+        self,
+        endpoint: object,
+        data: SizedPayload,
+        timeout: Optional[int] = None,
+    ) -> int:
+        self.written[:] = [data]
+        return len(data)
+
+    def read(
+        self, endpoint: object, buffer: Any, timeout: Optional[int] = None
+    ) -> int:
+        response = bytes(self.written[-1])
+        buffer[: len(response)] = array.array('B', response)
+        return len(response)
+
+
+def main() -> None:
+    """Prints the mean time per call for each variant."""
+    logging.disable(logging.CRITICAL)
+    legacy = _connect(_LegacyUsbBulkTransferDevice)
+    current = _connect(UsbBulkTransferDevice)
+    out = memoryview(
+        array.array('B', bytes(UsbBulkTransferDevice.MAX_RESPONSE_LENGTH))
+    )
+    variants = {
+        'legacy': lambda: legacy.bulk_transfer(GET_STATUS),
+        'bulk_transfer': lambda: current.bulk_transfer(GET_STATUS),
+        'bulk_transfer_into': lambda: current.bulk_transfer_into(
+            GET_STATUS, out
+        ),
+    }
+    for name, variant in variants.items():
+        elapsed = timeit.timeit(variant, number=ITERATIONS)
+        print(f'{name:>20} {elapsed / ITERATIONS * 1e9:>8.0f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -62,6 +62,7 @@ def skip_module(app, what, name, obj, skip, options):
             in [
                 'itchcraft.__main__',
                 'itchcraft.cli',
+                'itchcraft.dispatch',
                 'itchcraft.fire_workarounds',
                 'itchcraft.version',
                 'itchcraft.settings',
@@ -79,6 +80,7 @@ templates_path = []
 exclude_patterns = [
     '**/itchcraft/__main__/**',
     '**/itchcraft/cli/**',
+    '**/itchcraft/dispatch/**',
     '**/itchcraft/fire_workarounds/**',
     '**/itchcraft/version/**',
     '**/itchcraft/settings/**',
@@ -9,15 +9,38 @@ Usage example:
    api.hello()
 """
 
-# Re-export these symbols
-# (This promotes them from itchcraft.api to itchcraft)
-from itchcraft.api import Api as Api
+from collections.abc import Callable
+import importlib
+from typing import Any, Optional, TYPE_CHECKING
 
-from itchcraft.version import version
+if TYPE_CHECKING:
+    # Re-export these symbols
+    # (This promotes them from itchcraft.api to itchcraft)
+    from itchcraft.api import Api as Api
+
+    __version__: Optional[str]
 
 __all__ = [
     # Modules that every subpackage should see
     'settings',
 ]
 
-__version__ = version()
+# Loaded on first access so that `itchcraft --version` doesn’t import
+# PyUSB, tenacity, or fire
+_LAZY_ATTRIBUTES: dict[str, Callable[[], Any]] = {
+    'Api': lambda: importlib.import_module('itchcraft.api').Api,
+    '__version__': lambda: importlib.import_module(
+        'itchcraft.version'
+    ).version(),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        load = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}'
+        ) from None
+    value = globals()[name] = load()
+    return value
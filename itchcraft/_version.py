@@ -0,0 +1,4 @@
+"""Version number of this project, generated from `pyproject.toml`;
+do not edit."""
+
+VERSION = '0.4.1'
@@ -1,45 +1,91 @@
 """The primary module in itchcraft."""
 
-from . import prefs
-from .devices import find_bite_healers
+# Modules that depend on PyUSB or tenacity are imported where they are
+# needed so that `--help` stays fast.
+# pylint: disable=import-outside-toplevel
+
+from collections.abc import Iterable
+import sys
+from typing import Optional, TYPE_CHECKING
+
+from . import prefs, settings
 from .errors import (
     BackendInitializationError,
     BiteHealerError,
     CliError,
+    DaemonUnavailableError,
 )
-from .format import format_table
+from .export import Format
 from .logging import get_logger
 from .prefs import (
+    Backend,
     CliEnum,
     Duration,
     Generation,
     Preferences,
     SkinSensitivity,
 )
-from .start import start_with_preferences
+from .settings import DAEMON_SOCKET
+
+if TYPE_CHECKING:
+    from .device import BiteHealerMetadata
+    from .devices import DeviceSelector
 
 logger = get_logger(__name__)
 
 
 # pylint: disable=too-few-public-methods
 class Api:
-    """Tech demo for interfacing with heat-based USB insect bite healers."""
+    """Tech demo for interfacing with heat-based USB insect bite healers.
 
-    # pylint: disable=no-self-use
-    def info(self) -> None:
+    :param backend:
+        `usb` to talk to real bite healers, or `sim` to simulate them.
+        Overrides the `ITCHCRAFT_BACKEND` environment variable.
+
+    :param transfer_timeout:
+        Time limit in seconds for each USB read or write.
+        Overrides the `ITCHCRAFT_TRANSFER_TIMEOUT` environment variable.
+
+    :param session_timeout:
+        Time limit in seconds for testing and activating a bite healer.
+        Overrides the `ITCHCRAFT_SESSION_TIMEOUT` environment variable.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CliEnum[Backend]] = None,
+        transfer_timeout: Optional[float] = None,
+        session_timeout: Optional[float] = None,
+    ) -> None:
+        self._overrides = settings.Overrides(
+            backend=(
+                None if backend is None else str(prefs.parse(backend, Backend))
+            ),
+            transfer_timeout=(
+                None
+                if transfer_timeout is None
+                else _positive(transfer_timeout, 'transfer_timeout')
+            ),
+            session_timeout=(
+                None
+                if session_timeout is None
+                else _positive(session_timeout, 'session_timeout')
+            ),
+        )
+
+    # pylint: disable=redefined-builtin
+    def info(self, format: CliEnum[Format] = str(Format.TEXT)) -> None:
         """Shows a list of USB bite healers that are connected to
         the host.
+
+        :param format:
+            One of `text`, `json`, `ndjson`, or `csv`.
         """
-        if not (bite_healers := list(find_bite_healers())):
-            logger.info('No known bite healers detected')
-            return
-        logger.info(
-            f'Detected {(n := len(bite_healers))}'
-            + f" bite healer{'' if n == 1 else 's'}"
-        )
-        print(format_table(bite_healers))
+        output_format = prefs.parse(format, Format)
+        with settings.overridden(self._overrides):
+            _info(output_format)
 
-    # pylint: disable=no-self-use
+    # pylint: disable=redefined-builtin, too-many-arguments
     def start(
         self,
         duration: CliEnum[Duration] = prefs.default(Duration),
@@ -47,6 +93,12 @@ class Api:
         skin_sensitivity: CliEnum[SkinSensitivity] = prefs.default(
             SkinSensitivity
         ),
+        all: bool = False,
+        follow: bool = False,
+        usb_serial: Optional[str] = None,
+        usb_bus: Optional[int] = None,
+        usb_address: Optional[int] = None,
+        usb_id: Optional[str] = None,
     ) -> None:
         """Activates (i.e. heats up) a connected USB bite healer for
         demonstration purposes.
@@ -59,6 +111,28 @@ class Api:
 
         :param skin_sensitivity:
             `regular` or `sensitive`.
+
+        :param all:
+            Activate all connected bite healers concurrently instead of
+            only the first one.
+
+        :param follow:
+            Keep polling the bite healer after activation and log each
+            status change, until the status has stayed the same for 30
+            seconds.
+
+        :param usb_serial:
+            Only consider the bite healer with this serial number.
+
+        :param usb_bus:
+            Only consider bite healers attached to this USB bus.
+
+        :param usb_address:
+            Only consider bite healers with this address on their bus.
+
+        :param usb_id:
+            Only consider bite healers with this USB vendor ID and
+            product ID, e.g. `32f9:fcba`.
         """
 
         preferences = Preferences(
@@ -68,9 +142,166 @@ class Api:
                 skin_sensitivity, SkinSensitivity
             ),
         )
+        if all and follow:
+            raise CliError('--follow cannot be combined with --all')
+        from .devices import DeviceSelector
+        from .support import VidPid
+
         try:
-            start_with_preferences(preferences)
-        except BackendInitializationError as e:
+            selector = DeviceSelector(
+                serial_number=(
+                    None if usb_serial is None else str(usb_serial)
+                ),
+                bus=_optional_int(usb_bus, 'usb_bus'),
+                address=_optional_int(usb_address, 'usb_address'),
+                vid_pid=(
+                    None
+                    if usb_id is None
+                    else VidPid.parse(str(usb_id))
+                ),
+            )
+        except ValueError as e:
             raise CliError(e) from e
-        except BiteHealerError as e:
+        with settings.overridden(self._overrides):
+            try:
+                _start(
+                    preferences,
+                    all_bite_healers=all,
+                    follow=follow,
+                    selector=selector,
+                )
+            except BackendInitializationError as e:
+                raise CliError(e) from e
+            except BiteHealerError as e:
+                raise CliError(e) from e
+
+    def daemon(self) -> None:
+        """Runs in the foreground, keeping all supported bite healers
+        connected, and serves `start` and `status` requests from other
+        Itchcraft commands until interrupted.
+        """
+        from .daemon import serve
+
+        with settings.overridden(self._overrides):
+            try:
+                serve(DAEMON_SOCKET)
+            except BackendInitializationError as e:
+                raise CliError(e) from e
+            except BiteHealerError as e:
+                raise CliError(e) from e
+
+    # pylint: disable=no-self-use
+    def status(self) -> None:
+        """Shows the bite healers that are managed by a running
+        daemon.
+        """
+        from .daemon import send_request
+
+        try:
+            response = send_request(DAEMON_SOCKET, {'command': 'status'})
+        except DaemonUnavailableError as e:
             raise CliError(e) from e
+        for bite_healer in response['bite_healers']:
+            print(
+                f"{bite_healer['product_name']}"
+                + f" (S/N: {bite_healer['serial_number']},"
+                + f" vendor: {bite_healer['vendor_name']})"
+            )
+
+
+def _positive(value: float, name: str) -> float:
+    if not isinstance(value, (int, float)) or value <= 0:
+        raise CliError(f'`{name}` must be a positive number of seconds')
+    return float(value)
+
+
+def _optional_int(value: Optional[int], name: str) -> Optional[int]:
+    if value is not None and (
+        not isinstance(value, int) or isinstance(value, bool)
+    ):
+        raise CliError(f'`{name}` must be an integer')
+    return value
+
+
+def _info(output_format: Format) -> None:
+    from .devices import find_bite_healers
+
+    if output_format is not Format.TEXT:
+        _export(find_bite_healers(), output_format)
+        return
+
+    from .device import prefetch_usb_strings
+    from .format import format_table
+
+    if not (bite_healers := list(find_bite_healers())):
+        logger.info('No known bite healers detected')
+        return
+    prefetch_usb_strings(bite_healers)
+    logger.info(
+        f'Detected {(n := len(bite_healers))}'
+        + f" bite healer{'' if n == 1 else 's'}"
+    )
+    print(format_table(bite_healers))
+
+
+def _export(
+    bite_healers: Iterable['BiteHealerMetadata'], output_format: Format
+) -> None:
+    from .export import write_records
+
+    count = write_records(bite_healers, output_format, sys.stdout)
+    logger.debug('Exported %d bite healer(s)', count)
+
+
+def _start(
+    preferences: Preferences,
+    all_bite_healers: bool,
+    follow: bool,
+    selector: 'DeviceSelector',
+) -> None:
+    from .start import start_via_daemon, start_with_preferences
+
+    if all_bite_healers:
+        _start_all(preferences, selector)
+        return
+    if (
+        not follow
+        and selector.by_serial_number_only
+        and _daemon_applies()
+        and DAEMON_SOCKET.exists()
+    ):
+        try:
+            start_via_daemon(
+                preferences, DAEMON_SOCKET, selector.serial_number
+            )
+        except DaemonUnavailableError as e:
+            logger.debug('%s; falling back to direct access', e)
+        else:
+            return
+    start_with_preferences(
+        preferences, follow=follow, selector=selector
+    )
+
+
+def _daemon_applies() -> bool:
+    # The daemon talks to real bite healers, with its own timeouts
+    overrides = settings.current_overrides()
+    return (
+        prefs.parse(settings.backend_name(), Backend) is Backend.USB
+        and overrides.transfer_timeout is None
+        and overrides.session_timeout is None
+    )
+
+
+def _start_all(
+    preferences: Preferences, selector: 'DeviceSelector'
+) -> None:
+    from .start import start_all_with_preferences
+
+    results = start_all_with_preferences(preferences, selector=selector)
+    if failed := [result for result in results if not result.succeeded]:
+        raise BiteHealerError(
+            f'{len(failed)} of {len(results)} bite healers'
+            + ' could not be activated'
+        )
+    logger.info('Activated %d bite healer(s)', len(results))
@@ -2,16 +2,45 @@
 
 from abc import ABC, abstractmethod
 import array
-from collections.abc import Callable
-from typing import Optional
+import asyncio
+from collections.abc import Callable, Sequence
+import contextvars
+from functools import lru_cache, partial
+import logging as python_logging
+import threading
+from typing import Optional, TYPE_CHECKING
 
 import usb.core
 import usb.util
 
+from . import deadline
+from .endpoints import ENDPOINT_CACHE, EndpointLayout
 from .errors import BackendInitializationError, EndpointNotFound
 from .logging import get_logger
 from .types import SizedPayload, usb as usb_types
 
+# https://github.com/python/mypy/issues/5264#issuecomment-399407428
+if TYPE_CHECKING:  # pylint: disable=consider-ternary-expression
+    _ArrayOfInts = array.array[int]
+else:
+    _ArrayOfInts = array.array
+
+_UNSIGNED_BYTE = 'B'
+"""Type code of the byte arrays that are exchanged with PyUSB."""
+
+_GET_STATUS_REQUEST_TYPE = (
+    usb.util.CTRL_IN
+    | usb.util.CTRL_TYPE_STANDARD
+    | usb.util.CTRL_RECIPIENT_DEVICE
+)
+"""Request type of a standard GET_STATUS request to a device."""
+
+_GET_STATUS = 0x00
+"""Standard request code of GET_STATUS."""
+
+_GET_STATUS_LENGTH = 2
+"""Length in bytes of the response to GET_STATUS."""
+
 logger = get_logger(__name__)
 
 
@@ -29,6 +58,59 @@ class BulkTransferDevice(ABC):
         :return: the response received from the device.
         """
 
+    def bulk_transfer_into(
+        self, request: SizedPayload, out: memoryview
+    ) -> int:
+        """Sends a payload via USB bulk transfer and writes the response
+        from the device into a caller-provided buffer.
+
+        Subclasses may override this to avoid allocating a response
+        object on every call.
+
+        :param `request`: the request payload from the host.
+
+        :param `out`: a writable buffer that is large enough to hold
+            the response.
+
+        :return: the number of bytes written into `out`.
+        """
+        response = self.bulk_transfer(request)
+        out[: len(response)] = response
+        return len(response)
+
+    def transact_many(
+        self, requests: Sequence[SizedPayload]
+    ) -> list[bytes]:
+        """Sends several payloads and returns one response per payload,
+        in the same order.
+
+        Subclasses may override this to pipeline the transfers instead
+        of waiting for each response before sending the next payload.
+
+        :param `requests`: the request payloads from the host.
+
+        :return: the responses received from the device.
+        """
+        return [self.bulk_transfer(request) for request in requests]
+
+    def discard_pending(self) -> None:
+        """Discards responses that the device has sent but the host
+        hasn’t read yet, e.g. after a failed :py:meth:`transact_many`.
+
+        The default implementation does nothing.
+        """
+
+    def is_alive(self) -> bool:  # pylint: disable=no-self-use
+        """Returns whether the device still responds, using a request
+        that is cheaper than a bulk transfer.
+
+        The default implementation always returns `True`.
+        """
+        return True
+
+    def close(self) -> None:
+        """Releases any resources held by this device."""
+
     @property
     @abstractmethod
     def product_name(self) -> Optional[str]:
@@ -40,20 +122,114 @@ class BulkTransferDevice(ABC):
         """Serial number of the device that this backend represents."""
 
 
+class AsyncBulkTransferDevice(ABC):
+    """Abstract base class for USB devices with two bulk transfer
+    endpoints, driven from an asyncio event loop."""
+
+    @abstractmethod
+    async def bulk_transfer(self, request: SizedPayload) -> bytes:
+        """Sends a payload via USB bulk transfer and waits for a response
+        from the device without blocking the event loop.
+
+        :param `request`: the request payload from the host.
+
+        :return: the response received from the device.
+        """
+
+    @property
+    @abstractmethod
+    def product_name(self) -> Optional[str]:
+        """Product name of the device that this backend represents."""
+
+    @property
+    @abstractmethod
+    def serial_number(self) -> Optional[str]:
+        """Serial number of the device that this backend represents."""
+
+
+class ThreadedAsyncBulkTransferDevice(AsyncBulkTransferDevice):
+    """Adapts a synchronous :py:class:`BulkTransferDevice` for use from
+    an asyncio event loop.
+
+    Transfers run on the event loop’s default executor, which is shared
+    among all devices. Transfers to the same device are serialized.
+    A :py:func:`~.deadline.deadline` set by the calling task also
+    applies to the transfers it starts.
+
+    :param device:
+        the synchronous device to which to delegate.
+    """
+
+    device: BulkTransferDevice
+
+    def __init__(self, device: BulkTransferDevice) -> None:
+        self.device = device
+        self._lock = threading.Lock()
+
+    async def bulk_transfer(self, request: SizedPayload) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            partial(
+                contextvars.copy_context().run,
+                self._serialized_transfer,
+                request,
+            ),
+        )
+
+    def _serialized_transfer(self, request: SizedPayload) -> bytes:
+        # The lock is held on the worker thread, so a cancelled caller
+        # can’t let another transfer start while this one is in flight
+        with self._lock:
+            return self.device.bulk_transfer(request)
+
+    @property
+    def product_name(self) -> Optional[str]:
+        return self.device.product_name
+
+    @property
+    def serial_number(self) -> Optional[str]:
+        return self.device.serial_number
+
+
 class UsbBulkTransferDevice(BulkTransferDevice):
     """USB device with two bulk transfer endpoints.
 
+    Responses are received into a buffer that is allocated once per
+    device. Requests given as :py:class:`bytes` are encoded for PyUSB
+    only once and then reused. Endpoint locations are looked up in
+    :py:data:`~.endpoints.ENDPOINT_CACHE` first and only searched for
+    if the cached layout doesn’t match the device.
+
     :param device:
         the PyUSB device with which to initiate the bulk transfer.
+
+    :param timeout:
+        time limit in seconds for each write and each read, or `None`
+        for PyUSB’s default. A shorter :py:func:`~.deadline.deadline`
+        takes precedence.
     """
 
     MAX_RESPONSE_LENGTH = 12
 
+    MAX_PENDING_RESPONSES = 8
+    """Upper bound for the number of responses that
+    :py:meth:`discard_pending` reads."""
+
+    DISCARD_TIMEOUT_MILLIS = 10
+    """Time limit for each read in :py:meth:`discard_pending`."""
+
+    LIVENESS_TIMEOUT_MILLIS = 100
+    """Time limit for the control request in :py:meth:`is_alive`."""
+
     device: usb.core.Device
     endpoint_out: usb.core.Endpoint
     endpoint_in: usb.core.Endpoint
+    interface_index: usb_types.InterfaceIndex
+    timeout: Optional[float]
 
-    def __init__(self, device: usb.core.Device) -> None:
+    def __init__(
+        self, device: usb.core.Device, timeout: Optional[float] = None
+    ) -> None:
         if (config := _get_config_if_exists(device)) is None:
             try:
                 device.set_configuration()
@@ -66,36 +242,169 @@ class UsbBulkTransferDevice(BulkTransferDevice):
 
         interface = config[(0, 0)]
         self.device = device
+        self.timeout = timeout
+        self.interface_index = interface.index
+        self._response_buffer: _ArrayOfInts = array.array(
+            _UNSIGNED_BYTE, bytes(self.MAX_RESPONSE_LENGTH)
+        )
+        self._response_view = memoryview(self._response_buffer)
 
         _detach_driver_if_needed(device, interface.index)
 
+        if (
+            layout := ENDPOINT_CACHE.get(device.idVendor, device.idProduct)
+        ) is not None and (
+            endpoints := _endpoints_from_layout(interface, layout)
+        ) is not None:
+            logger.debug('Using cached endpoint layout: %s', layout)
+            self.endpoint_out, self.endpoint_in = endpoints
+            return
+
         try:
-            self.endpoint_out = _find_endpoint(interface, _match_out)
+            out_index, self.endpoint_out = _find_endpoint(
+                interface, _match_out
+            )
         except EndpointNotFound as ex:
             raise BackendInitializationError(
                 f'Outbound endpoint not found for {device.product}',
             ) from ex
         logger.debug('Found outbound endpoint: %s', self.endpoint_out)
         try:
-            self.endpoint_in = _find_endpoint(interface, _match_in)
+            in_index, self.endpoint_in = _find_endpoint(interface, _match_in)
         except EndpointNotFound as ex:
             raise BackendInitializationError(
                 f'Inbound endpoint not found for {device.product}',
             ) from ex
         logger.debug('Found inbound endpoint: %s', self.endpoint_in)
+        ENDPOINT_CACHE.put(
+            device.idVendor,
+            device.idProduct,
+            EndpointLayout(
+                out_index=out_index,
+                out_address=self.endpoint_out.bEndpointAddress,
+                in_index=in_index,
+                in_address=self.endpoint_in.bEndpointAddress,
+            ),
+        )
 
     def bulk_transfer(self, request: SizedPayload) -> bytes:
-        buffer = array.array('B', bytearray(self.MAX_RESPONSE_LENGTH))
-        assert self.device.write(self.endpoint_out, request) == len(
-            request
-        )
-        num_bytes_received = self.device.read(self.endpoint_in, buffer)
-        response = buffer[:num_bytes_received].tobytes()
-        logger.debug(
-            'Got response: %s (%s)', response.hex(' '), response
-        )
+        num_bytes_received = self._transfer(request)
+        response = self._response_view[:num_bytes_received].tobytes()
+        if logger.isEnabledFor(python_logging.DEBUG):
+            logger.debug(
+                'Got response: %s (%s)', response.hex(' '), response
+            )
         return response
 
+    def transact_many(
+        self, requests: Sequence[SizedPayload]
+    ) -> list[bytes]:
+        """Writes all payloads back to back, then reads all responses.
+
+        The device must answer each payload with exactly one response,
+        in order.
+        """
+        for request in requests:
+            self._write(request)
+        responses = [
+            self._response_view[: self._read()].tobytes()
+            for _ in requests
+        ]
+        if logger.isEnabledFor(python_logging.DEBUG):
+            for response in responses:
+                logger.debug(
+                    'Got response: %s (%s)', response.hex(' '), response
+                )
+        return responses
+
+    def bulk_transfer_into(
+        self, request: SizedPayload, out: memoryview
+    ) -> int:
+        """Sends a payload via USB bulk transfer and writes the response
+        from the device into a caller-provided buffer.
+
+        If `out` spans a whole `array.array('B')`, the response is read
+        directly into that array. Otherwise, it is read into an internal
+        buffer first and then copied into `out`.
+
+        :param `request`: the request payload from the host.
+
+        :param `out`: a writable buffer that is large enough to hold
+            the response.
+
+        :return: the number of bytes written into `out`.
+        """
+        if (buffer := _byte_array_of(out)) is not None:
+            self._write(request)
+            return self._read(buffer)
+        num_bytes_received = self._transfer(request)
+        out[:num_bytes_received] = self._response_view[
+            :num_bytes_received
+        ]
+        return num_bytes_received
+
+    def _transfer(self, request: SizedPayload) -> int:
+        self._write(request)
+        return self._read()
+
+    def _write(self, request: SizedPayload) -> None:
+        encoded_request = _encode(request)
+        assert self.device.write(
+            self.endpoint_out,
+            encoded_request,
+            timeout=self._timeout_millis(),
+        ) == len(encoded_request)
+
+    def _read(self, buffer: Optional[_ArrayOfInts] = None) -> int:
+        return self.device.read(
+            self.endpoint_in,
+            self._response_buffer if buffer is None else buffer,
+            timeout=self._timeout_millis(),
+        )
+
+    def discard_pending(self) -> None:
+        """Reads and discards responses until a read times out."""
+        for _ in range(self.MAX_PENDING_RESPONSES):
+            try:
+                self.device.read(
+                    self.endpoint_in,
+                    self._response_buffer,
+                    timeout=self.DISCARD_TIMEOUT_MILLIS,
+                )
+            except usb.core.USBError:
+                return
+
+    def is_alive(self) -> bool:
+        """Issues a standard GET_STATUS control request to the device.
+        Unlike a bulk transfer, it doesn’t interact with the bite
+        healer’s protocol state."""
+        try:
+            self.device.ctrl_transfer(
+                _GET_STATUS_REQUEST_TYPE,
+                _GET_STATUS,
+                data_or_wLength=_GET_STATUS_LENGTH,
+                timeout=self.LIVENESS_TIMEOUT_MILLIS,
+            )
+        except usb.core.USBError as ex:
+            logger.debug('Device no longer responds: %s', ex)
+            return False
+        return True
+
+    def close(self) -> None:
+        """Releases the claimed interface and all other resources that
+        PyUSB holds for the device."""
+        try:
+            usb.util.release_interface(self.device, self.interface_index)
+        except usb.core.USBError as ex:
+            logger.debug('Unable to release interface: %s', ex)
+        usb.util.dispose_resources(self.device)
+
+    def _timeout_millis(self) -> Optional[int]:
+        if (seconds := deadline.timeout(self.timeout)) is None:
+            return None
+        # PyUSB treats 0 as “wait forever”
+        return max(1, round(seconds * 1000))
+
     @property
     def product_name(self) -> Optional[str]:
         return self.device.product
@@ -105,6 +414,34 @@ class UsbBulkTransferDevice(BulkTransferDevice):
         return self.device.serial_number
 
 
+def _byte_array_of(out: memoryview) -> Optional[_ArrayOfInts]:
+    # PyUSB reads only into array.array objects, so `out` must cover
+    # the whole array for the read to land in the right place
+    if (
+        isinstance(buffer := out.obj, array.array)
+        and buffer.typecode == _UNSIGNED_BYTE
+        and out.c_contiguous
+        and not out.readonly
+        and out.nbytes == len(buffer)
+    ):
+        return buffer
+    return None
+
+
+def _encode(request: SizedPayload) -> _ArrayOfInts:
+    if isinstance(request, array.array):
+        return request
+    if isinstance(request, bytes):
+        return _encode_bytes(request)
+    return array.array(_UNSIGNED_BYTE, request)
+
+
+@lru_cache(maxsize=64)
+def _encode_bytes(request: bytes) -> _ArrayOfInts:
+    # PyUSB never modifies the payload, so sharing is safe
+    return array.array(_UNSIGNED_BYTE, request)
+
+
 def _detach_driver_if_needed(
     device: usb.core.Device, interface_index: usb_types.InterfaceIndex
 ) -> None:
@@ -130,18 +467,35 @@ def _detach_driver_if_needed(
     logger.debug('Driver successfully detached')
 
 
+def _endpoints_from_layout(
+    interface: usb.core.Interface, layout: EndpointLayout
+) -> Optional[tuple[usb.core.Endpoint, usb.core.Endpoint]]:
+    try:
+        endpoint_out, endpoint_in = (
+            interface[usb_types.EndpointIndex(index)]
+            for index in (layout.out_index, layout.in_index)
+        )
+    except IndexError:
+        return None
+    if (
+        endpoint_out.bEndpointAddress != layout.out_address
+        or endpoint_in.bEndpointAddress != layout.in_address
+        or not _match_out(endpoint_out)
+        or not _match_in(endpoint_in)
+    ):
+        logger.debug('Cached endpoint layout does not match device')
+        return None
+    return endpoint_out, endpoint_in
+
+
 def _find_endpoint(
     interface: usb.core.Interface,
     custom_match: Callable[[usb.core.Endpoint], bool],
-) -> usb.core.Endpoint:
-    if (
-        endpoint := usb.util.find_descriptor(
-            interface,
-            custom_match=custom_match,
-        )
-    ) is None:
-        raise EndpointNotFound('find_descriptor returned None')
-    return endpoint
+) -> tuple[int, usb.core.Endpoint]:
+    for index, endpoint in enumerate(interface):
+        if custom_match(endpoint):
+            return index, endpoint
+    raise EndpointNotFound('No matching endpoint in interface')
 
 
 def _get_config_if_exists(
@@ -6,21 +6,45 @@ import os
 import sys
 from typing import NoReturn
 
-import fire  # type: ignore
-
-from . import __version__, api, fire_workarounds
+from . import settings
 from .errors import CliError
-from .logging import get_logger
 from .settings import debugMode, PROJECT_ROOT, PYPROJECT_TOML
 
 
-logger = get_logger(__name__)
-
-
 def run(*args: str) -> None:
-    """Runs the command line interface."""
+    """Runs the command line interface.
+
+    Known commands are dispatched directly. Python Fire is only
+    imported for help texts and for arguments that the dispatcher
+    doesn’t understand.
+    """
     with _cli_context(*args) as combined_args:
-        fire.Fire(api.Api, command=combined_args)
+        # pylint: disable=import-outside-toplevel
+        from . import api, dispatch
+        from .logging import queued_logging
+
+        invocation = (
+            None
+            if settings.useFire
+            else dispatch.parse(api.Api, combined_args)
+        )
+        if invocation is None:
+            _run_fire(combined_args)
+            return
+        with queued_logging():
+            invocation()
+
+
+def _run_fire(args: list[str]) -> None:
+    # pylint: disable=import-outside-toplevel
+    import fire  # type: ignore
+
+    from . import api, fire_workarounds
+    from .logging import queued_logging
+
+    fire_workarounds.apply_fire()
+    with queued_logging():
+        fire.Fire(api.Api, command=args)
 
 
 @contextmanager
@@ -30,18 +54,25 @@ def _cli_context(*args: str) -> Generator[list[str], None, NoReturn]:
         print(_version_text())
         sys.exit(0)
 
-    fire_workarounds.apply()
+    # pylint: disable=import-outside-toplevel
+    from . import fire_workarounds
+    from .logging import get_logger
+
+    fire_workarounds.apply_colorama()
     try:
         yield combined_args
     except CliError as e:
         if debugMode:
             raise e
-        logger.error(e)
+        get_logger(__name__).error(e)
         sys.exit(1)
     sys.exit(0)
 
 
 def _version_text() -> str:
+    # pylint: disable=import-outside-toplevel
+    from . import __version__
+
     if __version__ is None:
         return 'Itchcraft (unknown version)'
     if os.path.exists(PYPROJECT_TOML):
@@ -0,0 +1,531 @@
+"""Long-running daemon that keeps bite healer connections open"""
+
+from collections.abc import Callable, Iterable
+from contextlib import ExitStack
+import contextvars
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import socket
+import socketserver
+import stat
+import threading
+import time
+from types import TracebackType
+from typing import Any, Optional
+
+from . import devices, prefs, settings
+from .deadline import deadline
+from .device import BiteHealerMetadata, SupportedBiteHealerMetadata
+from .errors import (
+    BackendInitializationError,
+    BiteHealerError,
+    DaemonUnavailableError,
+)
+from .logging import get_logger
+from .prefs import (
+    Backend,
+    Duration,
+    Generation,
+    Preferences,
+    SkinSensitivity,
+)
+from .registry import DeviceRegistry, NetlinkEventSource
+from .types import BiteHealer
+
+logger = get_logger(__name__)
+
+Message = dict[str, Any]
+"""A request or response exchanged with the daemon."""
+
+CLIENT_TIMEOUT = 5.0
+"""Time in seconds that a client waits for the daemon to respond."""
+
+RECONNECT_DELAY = 0.5
+"""Time in seconds after which the daemon retries a bite healer that it
+failed to connect to. Doubles with each further failure, up to
+:py:data:`RECONNECT_MAX_DELAY`."""
+
+RECONNECT_MAX_DELAY = 30.0
+"""Longest time in seconds between two attempts to connect to the same
+bite healer."""
+
+_PRIVATE_DIRECTORY_MODE = 0o700
+
+
+@dataclass(frozen=True)
+class _Failure:
+    attempts: int
+    retry_at: float
+
+    @classmethod
+    def after(cls, previous: Optional['_Failure']) -> '_Failure':
+        """Records another failure, which doubles the delay."""
+        attempts = 1 if previous is None else previous.attempts + 1
+        delay = min(
+            RECONNECT_DELAY * 2 ** (attempts - 1), RECONNECT_MAX_DELAY
+        )
+        return cls(attempts, time.monotonic() + delay)
+
+    @property
+    def due(self) -> bool:
+        """Whether it’s time to try connecting again."""
+        return time.monotonic() >= self.retry_at
+
+
+@dataclass
+class _ManagedBiteHealer:
+    metadata: SupportedBiteHealerMetadata
+    bite_healer: BiteHealer
+    exit_stack: ExitStack
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def close(self) -> None:
+        """Closes the connection once no request is using it."""
+        with self.lock:
+            self.exit_stack.close()
+
+    def describe(self) -> Message:
+        """Returns a response object that describes the bite healer."""
+        return {
+            'vendor_name': self.metadata.vendor_name,
+            'product_name': self.metadata.product_name,
+            'usb_product_name': self.metadata.usb_product_name,
+            'serial_number': self.metadata.serial_number,
+        }
+
+
+class Daemon:  # pylint: disable=too-many-instance-attributes
+    """Owns all supported bite healers that are connected to the host,
+    and accepts requests over a Unix domain socket.
+
+    Each bite healer is connected and self-tested exactly once, either
+    when the daemon is entered as a context manager or, with a
+    registry, when it is plugged in. The connections stay open until
+    the bite healer is unplugged or the daemon exits.
+
+    :param socket_path:
+        the path of the Unix domain socket on which to listen.
+
+    :param find_bite_healers:
+        a callable that discovers the bite healers to be managed.
+        Ignored if `registry` is given.
+
+    :param registry:
+        if given, the bite healers that it tracks are managed, and
+        hotplug events are applied while the daemon is running.
+    """
+
+    socket_path: Path
+
+    def __init__(
+        self,
+        socket_path: Path,
+        find_bite_healers: Callable[
+            [], Iterable[BiteHealerMetadata]
+        ] = devices.find_bite_healers,
+        registry: Optional[DeviceRegistry] = None,
+    ) -> None:
+        self.socket_path = socket_path
+        self._find_bite_healers = find_bite_healers
+        self._registry = registry
+        self._generation: Optional[int] = None
+        self._bite_healers: dict[
+            SupportedBiteHealerMetadata, _ManagedBiteHealer
+        ] = {}
+        self._failures: dict[SupportedBiteHealerMetadata, _Failure] = {}
+        self._exit_stack = ExitStack()
+        self._server: Optional[_Server] = None
+
+    def __enter__(self) -> 'Daemon':
+        with ExitStack() as exit_stack:
+            exit_stack.callback(self._exit_stack.close)
+            self._exit_stack.callback(self._manage, ())
+            if self._registry is None:
+                self._manage(self._find_bite_healers())
+                if not self._bite_healers:
+                    raise BiteHealerError(
+                        'No supported bite healer connected'
+                    )
+            else:
+                self.refresh()
+            self.socket_path.parent.mkdir(
+                mode=_PRIVATE_DIRECTORY_MODE, parents=True, exist_ok=True
+            )
+            _check_private_directory(self.socket_path.parent)
+            _remove_stale_socket(self.socket_path)
+            self._server = _bind(self.socket_path, self)
+            self._exit_stack.callback(self._close_server)
+            exit_stack.pop_all()
+        logger.info('Listening on %s', self.socket_path)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._exit_stack.close()
+
+    def serve_forever(self) -> None:
+        """Handles requests until :py:meth:`shutdown` is called."""
+        assert self._server is not None
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stops handling requests. Must be called from a different
+        thread than :py:meth:`serve_forever`."""
+        assert self._server is not None
+        self._server.shutdown()
+
+    def refresh(self) -> None:
+        """Starts managing bite healers that have been plugged in, and
+        stops managing those that have been unplugged, since the last
+        call.
+
+        Bite healers that could not be connected to are retried with
+        exponential backoff, e.g. in case udev hadn’t applied their
+        permissions yet when they were plugged in.
+
+        Does nothing unless the daemon has a registry.
+        """
+        if self._registry is None:
+            return
+        snapshot = self._registry.poll()
+        if snapshot.generation == self._generation and not any(
+            failure.due for failure in self._failures.values()
+        ):
+            return
+        self._generation = snapshot.generation
+        self._manage(snapshot.bite_healers)
+
+    def handle(self, request: object) -> Message:
+        """Handles a single request and returns the response.
+
+        :param request:
+            a decoded JSON value, which must be an object whose
+            `command` is either `status` or `start`.
+        """
+        try:
+            return self._dispatch(request)
+        # Whatever goes wrong, the client deserves a response
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            logger.error(ex)
+            return {'error': str(ex) or type(ex).__name__}
+
+    def _dispatch(self, request: object) -> Message:
+        if not isinstance(request, dict):
+            return {'error': 'Malformed request: expected a JSON object'}
+        handlers: dict[str, Callable[[Message], Message]] = {
+            'status': self._status,
+            'start': self._start,
+        }
+        command = str(request.get('command'))
+        if (handler := handlers.get(command)) is None:
+            return {'error': f'Unknown command: {command}'}
+        return handler(request)
+
+    def _manage(self, found: Iterable[BiteHealerMetadata]) -> None:
+        # Requests run in other threads, so the dict is replaced rather
+        # than modified in place
+        previous = self._bite_healers
+        current: dict[SupportedBiteHealerMetadata, _ManagedBiteHealer] = {}
+        supported = [
+            metadata
+            for metadata in found
+            if isinstance(metadata, SupportedBiteHealerMetadata)
+        ]
+        for metadata in supported:
+            if (managed := previous.get(metadata)) is None:
+                managed = self._try_connect(metadata)
+            if managed is not None:
+                current[metadata] = managed
+        self._bite_healers = current
+        self._failures = {
+            metadata: failure
+            for metadata, failure in self._failures.items()
+            if metadata in supported
+        }
+        for metadata, managed in previous.items():
+            if metadata not in current:
+                logger.info(
+                    'No longer managing bite healer: %s',
+                    managed.bite_healer,
+                )
+                managed.close()
+
+    def _try_connect(
+        self, metadata: SupportedBiteHealerMetadata
+    ) -> Optional[_ManagedBiteHealer]:
+        if (
+            failure := self._failures.get(metadata)
+        ) is not None and not failure.due:
+            return None
+        if (managed := _connect(metadata)) is None:
+            self._failures[metadata] = _Failure.after(failure)
+            logger.debug(
+                'Retrying in %.1f seconds',
+                self._failures[metadata].retry_at - time.monotonic(),
+            )
+        else:
+            self._failures.pop(metadata, None)
+        return managed
+
+    def _close_server(self) -> None:
+        assert self._server is not None
+        self._server.server_close()
+        self.socket_path.unlink()
+
+    def _status(self, _request: Message) -> Message:
+        return {
+            'bite_healers': [
+                managed.describe()
+                for managed in self._bite_healers.values()
+            ]
+        }
+
+    def _start(self, request: Message) -> Message:
+        preferences = _parse_preferences(request)
+        managed = self._select(request.get('serial_number'))
+        with managed.lock, deadline(settings.session_timeout()):
+            managed.bite_healer.start_with_preferences(preferences)
+        return managed.describe()
+
+    def _select(self, serial_number: Optional[str]) -> _ManagedBiteHealer:
+        for managed in self._bite_healers.values():
+            if serial_number in (None, managed.metadata.serial_number):
+                return managed
+        if serial_number is None:
+            raise BiteHealerError('No supported bite healer connected')
+        raise BiteHealerError(f'No bite healer with S/N {serial_number}')
+
+
+def serve(socket_path: Path) -> None:
+    """Runs a daemon that manages all supported bite healers until
+    interrupted.
+
+    :param socket_path:
+        the path of the Unix domain socket on which to listen.
+    """
+    with ExitStack() as exit_stack:
+        if (registry := _open_registry()) is not None:
+            exit_stack.callback(registry.close)
+        daemon = exit_stack.enter_context(
+            Daemon(socket_path, registry=registry)
+        )
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            logger.info('Daemon stopped')
+
+
+def send_request(
+    socket_path: Path, request: Message, timeout: float = CLIENT_TIMEOUT
+) -> Message:
+    """Sends a request to a running daemon and returns its response.
+
+    :param socket_path:
+        the path of the Unix domain socket on which the daemon listens.
+
+    :param request:
+        the request object to send.
+
+    :param timeout:
+        time in seconds to wait for a response.
+
+    :return:
+        the response object.
+
+    :raise DaemonUnavailableError:
+        if the daemon can’t be reached, doesn’t respond in time, or
+        responds with anything other than a complete message.
+
+    :raise BiteHealerError:
+        if the daemon responds with an error.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            response = _exchange(client, socket_path, request)
+        # Timeouts are OSErrors, and incomplete responses ValueErrors
+        except (OSError, ValueError) as ex:
+            raise DaemonUnavailableError(
+                f'Unable to reach daemon at {socket_path}: {ex}'
+            ) from ex
+    if (error := response.get('error')) is not None:
+        raise BiteHealerError(error)
+    return response
+
+
+def start_request(
+    preferences: Preferences, serial_number: Optional[str] = None
+) -> Message:
+    """Returns a request that tells the daemon to start heating.
+
+    :param preferences:
+        how the user wants the device to be configured.
+
+    :param serial_number:
+        the serial number of the bite healer to start, or None for the
+        first one that the daemon manages.
+    """
+    request: Message = {
+        'command': 'start',
+        'duration': preferences.duration.name.lower(),
+        'generation': preferences.generation.name.lower(),
+        'skin_sensitivity': preferences.skin_sensitivity.name.lower(),
+    }
+    if serial_number is not None:
+        request['serial_number'] = serial_number
+    return request
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: Daemon) -> None:
+        self.daemon = daemon
+        # Request threads see the settings overrides of the thread that
+        # created the server
+        self._context = contextvars.copy_context()
+        super().__init__(socket_path, _RequestHandler)
+
+    def process_request_thread(
+        self,
+        request: Any,
+        client_address: Any,
+    ) -> None:
+        self._context.copy().run(
+            super().process_request_thread, request, client_address
+        )
+
+    def service_actions(self) -> None:
+        self.daemon.refresh()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError as ex:
+            response: Message = {'error': f'Malformed request: {ex}'}
+        else:
+            response = self.server.daemon.handle(request)
+        self.wfile.write(_encode(response))
+
+
+def _connect(
+    metadata: SupportedBiteHealerMetadata,
+) -> Optional[_ManagedBiteHealer]:
+    with ExitStack() as exit_stack:
+        try:
+            bite_healer = _connect_and_self_test(metadata, exit_stack)
+        # Failures must not stop the daemon from serving other devices
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            logger.error('Unable to connect to bite healer: %s', ex)
+            return None
+        logger.info('Managing bite healer: %s', bite_healer)
+        return _ManagedBiteHealer(
+            metadata, bite_healer, exit_stack.pop_all()
+        )
+
+
+def _connect_and_self_test(
+    metadata: SupportedBiteHealerMetadata, exit_stack: ExitStack
+) -> BiteHealer:
+    bite_healer = exit_stack.enter_context(metadata.connect())
+    with deadline(settings.session_timeout()):
+        bite_healer.self_test()
+    return bite_healer
+
+
+def _open_registry() -> Optional[DeviceRegistry]:
+    if prefs.parse(settings.backend_name(), Backend) is not Backend.USB:
+        return None
+    try:
+        event_source = NetlinkEventSource()
+    except BackendInitializationError as ex:
+        logger.debug('Not following hotplug events: %s', ex)
+        return None
+    try:
+        return DeviceRegistry(event_source)
+    except BackendInitializationError as ex:
+        event_source.close()
+        logger.debug('Not following hotplug events: %s', ex)
+        return None
+
+
+def _exchange(
+    client: socket.socket, socket_path: Path, request: Message
+) -> Message:
+    client.connect(str(socket_path))
+    client.sendall(_encode(request))
+    with client.makefile('rb') as stream:
+        response = json.loads(stream.readline())
+    if not isinstance(response, dict):
+        raise ValueError(f'Unexpected response: {response!r}')
+    return response
+
+
+def _check_private_directory(directory: Path) -> None:
+    # The directory may have existed before, for example because
+    # another user created it in the shared temporary directory to
+    # take over the socket
+    status = directory.lstat()
+    if (
+        not stat.S_ISDIR(status.st_mode)
+        or status.st_uid != os.getuid()
+        or stat.S_IMODE(status.st_mode) != _PRIVATE_DIRECTORY_MODE
+    ):
+        raise BiteHealerError(
+            f'Refusing to listen in {directory}, which must be a directory'
+            + ' owned by the current user with mode 0700'
+        )
+
+
+def _bind(socket_path: Path, daemon: Daemon) -> _Server:
+    # Keep other users from connecting before the socket is in place,
+    # which a chmod after binding would allow
+    previous_umask = os.umask(0o177)
+    try:
+        return _Server(str(socket_path), daemon)
+    finally:
+        os.umask(previous_umask)
+
+
+def _encode(message: Message) -> bytes:
+    return json.dumps(message).encode('utf-8') + b'\n'
+
+
+def _parse_preferences(request: Message) -> Preferences:
+    return Preferences(
+        duration=prefs.parse(
+            request.get('duration', prefs.default(Duration)), Duration
+        ),
+        generation=prefs.parse(
+            request.get('generation', prefs.default(Generation)),
+            Generation,
+        ),
+        skin_sensitivity=prefs.parse(
+            request.get(
+                'skin_sensitivity', prefs.default(SkinSensitivity)
+            ),
+            SkinSensitivity,
+        ),
+    )
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    if not socket_path.exists():
+        return
+    try:
+        send_request(socket_path, {'command': 'status'})
+    except DaemonUnavailableError:
+        logger.debug('Removing stale socket %s', socket_path)
+        socket_path.unlink()
+    else:
+        raise BiteHealerError(f'Daemon already running on {socket_path}')
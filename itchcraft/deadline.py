@@ -0,0 +1,71 @@
+"""Time limits for operations on bite healers
+
+A deadline applies to everything that runs inside a
+:py:func:`deadline` block on the same thread or asyncio task, so it
+reaches every USB transfer without being passed along explicitly.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from typing import Optional
+
+from .errors import DeadlineExceededError
+
+_expires_at: ContextVar[Optional[float]] = ContextVar(
+    'expires_at', default=None
+)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Limits the total time of all operations in the `with` block.
+
+    Nested deadlines can only shorten the time that is left, never
+    extend it.
+
+    :param seconds:
+        the time limit in seconds, or `None` for no additional limit.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    if (outer := _expires_at.get()) is not None:
+        expires_at = min(expires_at, outer)
+    token = _expires_at.set(expires_at)
+    try:
+        yield
+    finally:
+        _expires_at.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Returns the time in seconds until the current deadline expires,
+    or `None` if there is no deadline."""
+    if (expires_at := _expires_at.get()) is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def timeout(per_call: Optional[float]) -> Optional[float]:
+    """Returns the timeout in seconds for a single call, which is the
+    shorter of `per_call` and the time left until the deadline.
+
+    :param per_call:
+        the timeout for this kind of call, or `None` for no limit.
+
+    :raise DeadlineExceededError:
+        if the deadline has already expired.
+    """
+    if (left := remaining()) is None:
+        return per_call
+    if left <= 0:
+        raise DeadlineExceededError('Deadline exceeded')
+    return left if per_call is None else min(per_call, left)
+
+
+def expired() -> bool:
+    """Tells whether the current deadline has expired."""
+    return (left := remaining()) is not None and left <= 0
@@ -1,19 +1,86 @@
 """Base class for devices"""
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AbstractContextManager
 from dataclasses import dataclass
 import functools
+import threading
 from typing import cast, Literal, Optional, Union
 
 import usb.core
 
+from . import settings
 from .logging import get_logger
 from .support import SupportStatement
+from .sysfs import SysfsUsbDevice
 from .types import BiteHealer
 
 logger = get_logger(__name__)
 
+UsbStringName = Literal['product', 'serial_number']
+"""Name of a string descriptor attribute of a USB device."""
+
+
+class UsbStrings:
+    """String descriptors of a USB device, each of which is read on
+    first access and then memoized.
+
+    Reading a string descriptor from a PyUSB device takes a control
+    transfer, so callers that only need one device out of many
+    shouldn’t pay for reading the others.
+
+    :param read:
+        reads the string descriptor with the given name from the
+        device, or returns None if it can’t be read.
+    """
+
+    def __init__(
+        self, read: Callable[[UsbStringName], Optional[str]]
+    ) -> None:
+        self._read = read
+        self._lock = threading.Lock()
+        self._values: dict[UsbStringName, Optional[str]] = {}
+
+    @classmethod
+    def known(
+        cls, product: Optional[str], serial_number: Optional[str]
+    ) -> 'UsbStrings':
+        """Returns string descriptors whose values are already known.
+
+        :param product:
+            the product string descriptor, if any.
+
+        :param serial_number:
+            the serial number string descriptor, if any.
+        """
+        usb_strings = cls(_unreadable)
+        usb_strings._values.update(
+            product=product, serial_number=serial_number
+        )
+        return usb_strings
+
+    @property
+    def product(self) -> Optional[str]:
+        """Product string descriptor, if any."""
+        return self._get('product')
+
+    @property
+    def serial_number(self) -> Optional[str]:
+        """Serial number string descriptor, if any."""
+        return self._get('serial_number')
+
+    def prefetch(self) -> None:
+        """Reads all string descriptors that haven’t been read yet."""
+        self._get('product')
+        self._get('serial_number')
+
+    def _get(self, name: UsbStringName) -> Optional[str]:
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = self._read(name)
+            return self._values[name]
+
 
 @dataclass(frozen=True)
 class SupportedBiteHealerMetadata:
@@ -23,11 +90,8 @@ class SupportedBiteHealerMetadata:
     connection.
     """
 
-    usb_product_name: Optional[str]
-    """Product name of the backing USB device."""
-
-    serial_number: Optional[str]
-    """Serial number of the backing USB device."""
+    usb_strings: UsbStrings
+    """String descriptors of the backing USB device."""
 
     connection_supplier: Callable[
         [], AbstractContextManager[BiteHealer]
@@ -41,6 +105,16 @@ class SupportedBiteHealerMetadata:
         """Connects to the device."""
         return self.connection_supplier()
 
+    @property
+    def usb_product_name(self) -> Optional[str]:
+        """Product name of the backing USB device."""
+        return self.usb_strings.product
+
+    @property
+    def serial_number(self) -> Optional[str]:
+        """Serial number of the backing USB device."""
+        return self.usb_strings.serial_number
+
     @property
     def vendor_name(self) -> str:
         """Canonical vendor name from Itchcraft’s point of view."""
@@ -64,15 +138,22 @@ class UnsupportedBiteHealerMetadata:
     Clients can query information from the bite healer.
     """
 
-    usb_product_name: Optional[str]
-    """Product name of the backing USB device."""
-
-    serial_number: Optional[str]
-    """Serial number of the backing USB device."""
+    usb_strings: UsbStrings
+    """String descriptors of the backing USB device."""
 
     support_statement: SupportStatement
     """Details about the support status for this bite healer."""
 
+    @property
+    def usb_product_name(self) -> Optional[str]:
+        """Product name of the backing USB device."""
+        return self.usb_strings.product
+
+    @property
+    def serial_number(self) -> Optional[str]:
+        """Serial number of the backing USB device."""
+        return self.usb_strings.serial_number
+
     @property
     def vendor_name(self) -> str:
         """Canonical vendor name from Itchcraft’s point of view."""
@@ -93,51 +174,110 @@ BiteHealerMetadata = Union[
     SupportedBiteHealerMetadata, UnsupportedBiteHealerMetadata
 ]
 
+UsbDevice = Union[usb.core.Device, SysfsUsbDevice]
+"""A USB device discovered either via PyUSB or via sysfs."""
+
 
 def from_usb_device(
-    usb_device: usb.core.Device,
+    usb_device: UsbDevice,
     support_statement: SupportStatement,
 ) -> BiteHealerMetadata:
     """Creates a metadata object from a USB device.
 
+    The string descriptors of `usb_device` aren’t read until they’re
+    first accessed.
+
     :param usb_device:
-        the PyUSB device to be queried for metadata.
+        the PyUSB or sysfs device to be queried for metadata.
+        A sysfs device is resolved into a PyUSB device only once a
+        connection is requested.
 
     :param support_statement:
         Describes the level of support that Itchcraft offers for
         `usb_device`.
 
     :return:
-        a metadata object that unifies info from both the PyUSB device
+        a metadata object that unifies info from both the USB device
         and `support_statement`.
     """
-
-    def try_get_usb_attribute(
-        name: Literal['product', 'serial_number'],
-    ) -> Optional[str]:
-        try:
-            return cast(Optional[str], getattr(usb_device, name))
-        except ValueError:
-            if support_statement.supported:
-                logger.error(
-                    '%s: cannot read `%s` attribute; check permissions',
-                    support_statement.product_name,
-                    name.replace('_', ' '),
-                )
-            return None
-
+    usb_strings = UsbStrings(
+        functools.partial(_read_usb_string, usb_device, support_statement)
+    )
     if support_statement.supported is True:
         assert support_statement.connection_supplier is not None
         return SupportedBiteHealerMetadata(
-            usb_product_name=try_get_usb_attribute('product'),
-            serial_number=try_get_usb_attribute('serial_number'),
+            usb_strings=usb_strings,
             connection_supplier=functools.partial(
-                support_statement.connection_supplier, usb_device
+                _connect,
+                support_statement.connection_supplier,
+                usb_device,
             ),
             support_statement=support_statement,
         )
     return UnsupportedBiteHealerMetadata(
-        usb_product_name=try_get_usb_attribute('product'),
-        serial_number=try_get_usb_attribute('serial_number'),
+        usb_strings=usb_strings,
         support_statement=support_statement,
     )
+
+
+def prefetch_usb_strings(
+    bite_healers: Iterable[BiteHealerMetadata],
+    max_workers: Optional[int] = None,
+) -> None:
+    """Reads the string descriptors of several bite healers
+    concurrently, so that later accesses don’t block.
+
+    :param bite_healers:
+        the bite healers whose string descriptors to read.
+
+    :param max_workers:
+        the maximum number of devices to read from at the same time.
+        Defaults to the `ITCHCRAFT_DISCOVERY_WORKERS` environment
+        variable, or 1.
+    """
+    max_workers = max_workers or settings.discovery_workers()
+    if len(pending := list(bite_healers)) <= 1 or max_workers <= 1:
+        for metadata in pending:
+            metadata.usb_strings.prefetch()
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(pending)),
+        thread_name_prefix='itchcraft-prefetch',
+    ) as executor:
+        list(
+            executor.map(
+                lambda metadata: metadata.usb_strings.prefetch(), pending
+            )
+        )
+
+
+def _read_usb_string(
+    usb_device: UsbDevice,
+    support_statement: SupportStatement,
+    name: UsbStringName,
+) -> Optional[str]:
+    try:
+        return cast(Optional[str], getattr(usb_device, name))
+    except ValueError:
+        if support_statement.supported:
+            logger.error(
+                '%s: cannot read `%s` attribute; check permissions',
+                support_statement.product_name,
+                name.replace('_', ' '),
+            )
+        return None
+
+
+def _unreadable(_name: UsbStringName) -> Optional[str]:
+    return None
+
+
+def _connect(
+    connection_supplier: Callable[
+        [usb.core.Device], AbstractContextManager[BiteHealer]
+    ],
+    usb_device: UsbDevice,
+) -> AbstractContextManager[BiteHealer]:
+    if isinstance(usb_device, SysfsUsbDevice):
+        return connection_supplier(usb_device.resolve())
+    return connection_supplier(usb_device)
@@ -1,37 +1,232 @@
 """Device management and discovery"""
 
-from collections.abc import Iterator, Generator
-from typing import Any, cast
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Optional
 
+import usb.backend
 import usb.core
 
-from .device import from_usb_device, BiteHealerMetadata
+from . import prefs, settings
+from .device import (
+    BiteHealerMetadata,
+    from_usb_device,
+    prefetch_usb_strings,
+    UsbDevice,
+)
 from .logging import get_logger
-from .support import SUPPORT_STATEMENTS, SupportStatement, VidPid
+from .prefs import Backend
+from .settings import SYSFS_USB_DEVICES
+from .support import SUPPORT_DATABASE, SupportDatabase, VidPid
+from .sysfs import find_usb_devices
 
 logger = get_logger(__name__)
 
 
-def find_bite_healers() -> Iterator[BiteHealerMetadata]:
-    """Finds available bite healers."""
-    devices = cast(
-        Generator[usb.core.Device, Any, None],
-        usb.core.find(find_all=True),
+@dataclass(frozen=True)
+class DeviceSelector:
+    """Criteria that a bite healer must meet in order to be found.
+
+    Criteria that are None match any bite healer.
+    """
+
+    serial_number: Optional[str] = None
+    """Serial number of the bite healer."""
+
+    bus: Optional[int] = None
+    """Number of the bus to which the bite healer is attached."""
+
+    address: Optional[int] = None
+    """Address of the bite healer on its bus."""
+
+    vid_pid: Optional[VidPid] = None
+    """USB vendor ID and product ID of the bite healer."""
+
+    def __str__(self) -> str:
+        return ', '.join(
+            criterion
+            for criterion, value in (
+                (f'S/N {self.serial_number}', self.serial_number),
+                (f'bus {self.bus}', self.bus),
+                (f'address {self.address}', self.address),
+                (f'{self.vid_pid}', self.vid_pid),
+            )
+            if value is not None
+        )
+
+    @property
+    def by_location(self) -> bool:
+        """Whether this selector includes the bus or address."""
+        return self.bus is not None or self.address is not None
+
+    @property
+    def by_serial_number_only(self) -> bool:
+        """Whether this selector includes no criteria other than the
+        serial number, which is all that the daemon can select by."""
+        return not self.by_location and self.vid_pid is None
+
+    def vendor_ids(self, vendor_ids: frozenset[int]) -> frozenset[int]:
+        """Narrows down the given vendor IDs to those that can match.
+
+        :param vendor_ids:
+            the vendor IDs that Itchcraft knows about.
+        """
+        if self.vid_pid is None:
+            return vendor_ids
+        return vendor_ids & {self.vid_pid.vid}
+
+    def accepts_device(self, usb_device: UsbDevice) -> bool:
+        """Checks the criteria that don’t require reading string
+        descriptors.
+
+        :param usb_device:
+            the USB device to check.
+        """
+        return (
+            (
+                self.vid_pid is None
+                or (usb_device.idVendor, usb_device.idProduct)
+                == self.vid_pid
+            )
+            and self.bus in (None, usb_device.bus)
+            and self.address in (None, usb_device.address)
+        )
+
+    def accepts(self, metadata: BiteHealerMetadata) -> bool:
+        """Checks the serial number and the VID and PID.
+
+        :param metadata:
+            the bite healer to check.
+        """
+        return (
+            self.serial_number is None
+            or metadata.serial_number == self.serial_number
+        ) and (
+            self.vid_pid is None
+            or (
+                metadata.support_statement.vid,
+                metadata.support_statement.pid,
+            )
+            == self.vid_pid
+        )
+
+
+ANY_DEVICE = DeviceSelector()
+"""Selector that matches every bite healer."""
+
+
+def find_bite_healers(
+    backend: Optional[usb.backend.IBackend] = None,
+    workers: Optional[int] = None,
+    selector: DeviceSelector = ANY_DEVICE,
+) -> Iterator[BiteHealerMetadata]:
+    """Finds available bite healers.
+
+    Unless a custom backend is given, devices are discovered through
+    sysfs, which avoids initializing libusb and reading string
+    descriptors via control transfers.
+    If sysfs is unavailable, PyUSB is used instead.
+
+    In either case, devices whose vendor ID doesn’t appear in the
+    support database are filtered out during enumeration, so they are
+    never queried for metadata.
+
+    Devices that don’t match `selector` are filtered out as early as
+    possible: by vendor ID during enumeration, by location and product
+    ID before any string descriptor is read, and by serial number last.
+
+    If the `sim` backend is selected, simulated bite healers are
+    returned instead. Simulated bite healers have no location, so they
+    never match a selector that includes the bus or address.
+
+    With PyUSB, string descriptors are read lazily, one control
+    transfer at a time. If more than one worker is requested, all
+    matching devices are enumerated first, and their string descriptors
+    are then read in parallel, with results in enumeration order.
+
+    :param backend:
+        an optional PyUSB backend to use for enumeration instead of
+        sysfs or the system default.
+
+    :param workers:
+        the maximum number of devices to read string descriptors from
+        at the same time. Defaults to the `ITCHCRAFT_DISCOVERY_WORKERS`
+        environment variable, or 1.
+
+    :param selector:
+        criteria that the bite healers must meet.
+    """
+    if prefs.parse(settings.backend_name(), Backend) is Backend.SIM:
+        # pylint: disable=import-outside-toplevel
+        from . import simulator
+
+        if selector.by_location:
+            return
+        yield from (
+            bite_healer
+            for bite_healer in simulator.find_bite_healers(
+                simulator.SimulatorConfig.parse(settings.simulatorOptions)
+            )
+            if selector.accepts(bite_healer)
+        )
+        return
+
+    vendor_ids = selector.vendor_ids(SUPPORT_DATABASE.vendor_ids)
+
+    if backend is None and (
+        sysfs_devices := find_usb_devices(SYSFS_USB_DEVICES, vendor_ids)
+    ) is not None:
+        logger.debug('Discovering devices via sysfs')
+        yield from _from_usb_devices(
+            sysfs_devices, SUPPORT_DATABASE, selector
+        )
+        return
+
+    logger.debug('Discovering devices via PyUSB')
+    bite_healers = _from_usb_devices(
+        usb.core.find(
+            find_all=True,
+            backend=backend,
+            custom_match=lambda device: (
+                device.idVendor in vendor_ids
+                and selector.accepts_device(device)
+            ),
+        ),
+        SUPPORT_DATABASE,
+        selector,
     )
-    vid_pid_dict: dict[VidPid, SupportStatement] = {
-        VidPid(vid=statement.vid, pid=statement.pid): statement
-        for statement in SUPPORT_STATEMENTS
-    }
+    if (workers := workers or settings.discovery_workers()) <= 1:
+        yield from bite_healers
+        return
+    logger.debug('Reading string descriptors with %d workers', workers)
+    prefetch_usb_strings(collected := list(bite_healers), workers)
+    yield from collected
 
-    for device in devices:
-        vid_pid = VidPid(vid=device.idVendor, pid=device.idProduct)
 
-        if (statement := vid_pid_dict.get(vid_pid)) is None:
-            logger.debug('Ignoring USB device %s', vid_pid)
+def _from_usb_devices(
+    usb_devices: Iterable[UsbDevice],
+    database: SupportDatabase,
+    selector: DeviceSelector,
+) -> Iterator[BiteHealerMetadata]:
+    for device in usb_devices:
+        if not selector.accepts_device(device):
+            continue
+        if (
+            statement := database.lookup(device.idVendor, device.idProduct)
+        ) is None:
+            logger.debug(
+                'Ignoring USB device %s',
+                VidPid(vid=device.idVendor, pid=device.idProduct),
+            )
             continue
 
-        logger.debug('Detected bite healer %s', vid_pid)
-        yield from_usb_device(
+        logger.debug(
+            'Detected bite healer %s',
+            VidPid(vid=statement.vid, pid=statement.pid),
+        )
+        metadata = from_usb_device(
             usb_device=device,
             support_statement=statement,
         )
+        if selector.accepts(metadata):
+            yield metadata
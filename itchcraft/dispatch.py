@@ -0,0 +1,193 @@
+"""Lightweight dispatcher for the command line interface.
+
+Handles the usual invocations of the known commands, based on the
+signatures of the API class, without importing Python Fire.
+Anything it doesn’t understand, such as `--help` or positional
+arguments, is left to Fire.
+"""
+
+import ast
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+import inspect
+from typing import Any, Optional
+
+_FIRE_FLAGS = frozenset(('-h', '--help', '--'))
+_SEPARATOR = '='
+_INVALID = object()
+
+_Parameters = dict[str, inspect.Parameter]
+
+
+@dataclass(frozen=True)
+class Invocation:
+    """A call to one of the commands of an API class."""
+
+    api_class: type
+    """The class whose instance runs the command."""
+
+    command: str
+    """Name of the method that implements the command."""
+
+    init_kwargs: dict[str, Any] = field(default_factory=dict)
+    """Keyword arguments for the constructor of `api_class`."""
+
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    """Keyword arguments for the command."""
+
+    def __call__(self) -> None:
+        """Runs the command and prints its result, if any."""
+        api = self.api_class(**self.init_kwargs)
+        run_command = getattr(api, self.command)
+        if (result := run_command(**self.kwargs)) is not None:
+            print(result)
+
+
+def parse(api_class: type, args: Sequence[str]) -> Optional[Invocation]:
+    """Parses command line arguments the way Python Fire would.
+
+    Understands a single command name, and flags of the form
+    `--name=value`, `--name value`, and `-n value` if `n` is the first
+    letter of only one parameter. Boolean parameters also take the form
+    `--name` or `--noname`. Flags before the command name must be of the
+    form `--name=value`.
+    Flags may refer to parameters of the command or the constructor.
+
+    :param api_class:
+        the class whose public methods are the commands.
+
+    :param args:
+        the command line arguments, excluding the program name.
+
+    :return:
+        the invocation, or None if Fire needs to handle the arguments.
+    """
+    if _FIRE_FLAGS & set(args) or (split := _split(args)) is None:
+        return None
+    command, flags = split
+    if (
+        command_parameters := _parameters(api_class, command)
+    ) is None or (
+        init_parameters := _parameters(api_class, '__init__')
+    ) is None:
+        return None
+    invocation = Invocation(api_class, command)
+    remaining = iter(flags)
+    for flag in remaining:
+        if not _add_flag(
+            invocation, flag, remaining, command_parameters, init_parameters
+        ):
+            return None
+    return invocation
+
+
+def _split(args: Sequence[str]) -> Optional[tuple[str, list[str]]]:
+    # Returns the command name and the flags around it
+    for index, arg in enumerate(args):
+        if not arg.startswith('-'):
+            if arg.startswith('_'):
+                return None
+            return arg, [*args[:index], *args[index + 1 :]]
+        if _SEPARATOR not in arg:
+            return None
+    return None
+
+
+def _add_flag(
+    invocation: Invocation,
+    flag: str,
+    remaining: Iterator[str],
+    command_parameters: _Parameters,
+    init_parameters: _Parameters,
+) -> bool:
+    if not flag.startswith('-'):
+        return False
+    name, separator, text = flag.lstrip('-').partition(_SEPARATOR)
+    if (
+        resolved := _resolve(
+            name.replace('-', '_'), command_parameters, init_parameters
+        )
+    ) is None:
+        return False
+    parameter, negated, is_init_parameter = resolved
+    kwargs = (
+        invocation.init_kwargs if is_init_parameter else invocation.kwargs
+    )
+    if parameter.name in kwargs or (
+        value := _value(
+            parameter, negated, text if separator else None, remaining
+        )
+    ) is _INVALID:
+        return False
+    kwargs[parameter.name] = value
+    return True
+
+
+def _value(
+    parameter: inspect.Parameter,
+    negated: bool,
+    text: Optional[str],
+    remaining: Iterator[str],
+) -> Any:
+    if text is not None:
+        return _INVALID if negated else _literal(text)
+    if isinstance(parameter.default, bool):
+        return not negated
+    if (
+        next_arg := next(remaining, None)
+    ) is None or next_arg.startswith('-'):
+        return _INVALID
+    return _literal(next_arg)
+
+
+def _parameters(api_class: type, name: str) -> Optional[_Parameters]:
+    if not inspect.isfunction(function := vars(api_class).get(name)):
+        return None
+    _self, *parameters = inspect.signature(function).parameters.values()
+    if any(
+        parameter.kind
+        not in (
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.KEYWORD_ONLY,
+        )
+        for parameter in parameters
+    ):
+        return None
+    return {parameter.name: parameter for parameter in parameters}
+
+
+def _resolve(
+    name: str,
+    command_parameters: _Parameters,
+    init_parameters: _Parameters,
+) -> Optional[tuple[inspect.Parameter, bool, bool]]:
+    for parameters, is_init_parameter in (
+        (command_parameters, False),
+        (init_parameters, True),
+    ):
+        if (parameter := parameters.get(name)) is not None:
+            return parameter, False, is_init_parameter
+        if (
+            name.startswith('no')
+            and (parameter := parameters.get(name[2:])) is not None
+            and isinstance(parameter.default, bool)
+        ):
+            return parameter, True, is_init_parameter
+    if len(name) == 1:
+        matches = [
+            parameter
+            for parameter in command_parameters.values()
+            if parameter.name.startswith(name)
+        ]
+        if len(matches) == 1:
+            return matches[0], False, False
+    return None
+
+
+def _literal(text: str) -> Any:
+    # Same as Fire: Python literals are parsed, anything else stays a
+    # string
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
@@ -0,0 +1,128 @@
+"""Cache of bulk endpoint layouts, per USB device model"""
+
+import json
+import os
+from pathlib import Path
+import threading
+from typing import NamedTuple, Optional
+
+from .logging import get_logger
+from .settings import ENDPOINT_CACHE_FILE
+
+logger = get_logger(__name__)
+
+
+class EndpointLayout(NamedTuple):
+    """Where the bulk endpoints of a device model are located within
+    its first interface."""
+
+    out_index: int
+    """Index of the outbound endpoint within the interface."""
+    out_address: int
+    """Address of the outbound endpoint."""
+    in_index: int
+    """Index of the inbound endpoint within the interface."""
+    in_address: int
+    """Address of the inbound endpoint."""
+
+
+class EndpointCache:
+    """Maps each USB device model, given by its VID and PID, to the
+    layout of its bulk endpoints.
+
+    Entries are only hints: callers must check them against the live
+    device before relying on them.
+
+    :param path:
+        a JSON file in which to persist the cache across runs, or `None`
+        to keep it in memory only. Errors reading or writing the file
+        are logged and otherwise ignored.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._layouts: Optional[dict[str, EndpointLayout]] = None
+
+    def get(self, vid: int, pid: int) -> Optional[EndpointLayout]:
+        """Returns the cached layout for a model, if any.
+
+        :param vid:
+            the USB vendor ID of the model.
+
+        :param pid:
+            the USB product ID of the model.
+        """
+        with self._lock:
+            return self._loaded().get(_key(vid, pid))
+
+    def put(self, vid: int, pid: int, layout: EndpointLayout) -> None:
+        """Remembers the layout for a model.
+
+        :param vid:
+            the USB vendor ID of the model.
+
+        :param pid:
+            the USB product ID of the model.
+
+        :param layout:
+            where the model’s bulk endpoints are located.
+        """
+        with self._lock:
+            layouts = self._loaded()
+            if layouts.get(key := _key(vid, pid)) == layout:
+                return
+            layouts[key] = layout
+            self._save(layouts)
+
+    def _loaded(self) -> dict[str, EndpointLayout]:
+        if self._layouts is None:
+            self._layouts = self._load()
+        return self._layouts
+
+    def _load(self) -> dict[str, EndpointLayout]:
+        if self.path is None:
+            return {}
+        try:
+            return _parse(self.path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return {}
+        except (OSError, TypeError, ValueError, AttributeError) as ex:
+            logger.debug('Ignoring endpoint cache %s: %s', self.path, ex)
+            return {}
+
+    def _save(self, layouts: dict[str, EndpointLayout]) -> None:
+        if self.path is None:
+            return
+        try:
+            _write(self.path, layouts)
+        except OSError as ex:
+            logger.debug('Unable to write endpoint cache: %s', ex)
+
+
+def _parse(text: str) -> dict[str, EndpointLayout]:
+    return {
+        key: EndpointLayout(*(int(number) for number in value))
+        for key, value in json.loads(text).items()
+    }
+
+
+def _write(path: Path, layouts: dict[str, EndpointLayout]) -> None:
+    # Replaces the file atomically so that readers never see a partial
+    # cache
+    temporary_path = path.with_name(f'.{path.name}.{os.getpid()}')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(
+            {key: list(layout) for key, layout in layouts.items()},
+            file,
+        )
+    os.replace(temporary_path, path)
+
+
+def _key(vid: int, pid: int) -> str:
+    return f'{vid:04x}:{pid:04x}'
+
+
+ENDPOINT_CACHE = EndpointCache(ENDPOINT_CACHE_FILE)
+"""Endpoint layouts of all models that Itchcraft has connected to."""
@@ -15,3 +15,17 @@ class EndpointNotFound(Exception):
 
 class BiteHealerError(Exception):
     """An error that represents a general issue with the bite healer."""
+
+
+class DaemonUnavailableError(Exception):
+    """An error that is raised if the Itchcraft daemon can’t be
+    reached."""
+
+
+class FrameEncodingError(Exception):
+    """An error that is raised if a command frame can’t be encoded."""
+
+
+class DeadlineExceededError(BiteHealerError):
+    """An error that is raised if an operation on a bite healer runs
+    past its deadline."""
@@ -0,0 +1,119 @@
+"""Machine-readable output of bite healer metadata"""
+
+import csv
+from collections.abc import Callable, Iterable
+from enum import Enum
+import json
+from typing import Any, TextIO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .device import BiteHealerMetadata
+
+FIELDS = (
+    'vendor_name',
+    'product_name',
+    'usb_product_name',
+    'serial_number',
+    'supported',
+    'comment',
+)
+"""Names of the fields in each exported record, in column order."""
+
+
+class Format(Enum):
+    """Output format of the `info` command."""
+
+    TEXT = 1
+    """A human-readable, colored table."""
+
+    JSON = 2
+    """A single JSON array."""
+
+    NDJSON = 3
+    """One JSON object per line."""
+
+    CSV = 4
+    """Comma-separated values with a header row."""
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+def to_record(item: 'BiteHealerMetadata') -> dict[str, Any]:
+    """Returns a flat, JSON-serializable record for the given bite
+    healer."""
+    return {
+        'vendor_name': item.vendor_name,
+        'product_name': item.product_name,
+        'usb_product_name': item.usb_product_name,
+        'serial_number': item.serial_number,
+        'supported': item.supported,
+        'comment': item.support_statement.comment,
+    }
+
+
+def write_records(
+    bite_healers: Iterable['BiteHealerMetadata'],
+    output_format: Format,
+    out: TextIO,
+) -> int:
+    """Writes one record per bite healer as soon as it is discovered.
+
+    The output is neither sorted nor wrapped, and contains no escape
+    sequences.
+
+    :param bite_healers:
+        the bite healers to export, possibly a lazy iterator.
+
+    :param output_format:
+        a machine-readable format, i.e. anything but
+        :py:attr:`Format.TEXT`.
+
+    :param out:
+        the stream to write to. It is flushed after each record.
+
+    :return:
+        the number of records written.
+    """
+    return _WRITERS[output_format](
+        (to_record(item) for item in bite_healers), out
+    )
+
+
+def _write_json(records: Iterable[dict[str, Any]], out: TextIO) -> int:
+    out.write('[')
+    count = 0
+    for count, record in enumerate(records, start=1):
+        out.write((',\n' if count > 1 else '\n') + json.dumps(record))
+        out.flush()
+    out.write('\n]\n' if count else ']\n')
+    return count
+
+
+def _write_ndjson(
+    records: Iterable[dict[str, Any]], out: TextIO
+) -> int:
+    count = 0
+    for count, record in enumerate(records, start=1):
+        out.write(json.dumps(record) + '\n')
+        out.flush()
+    return count
+
+
+def _write_csv(records: Iterable[dict[str, Any]], out: TextIO) -> int:
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    count = 0
+    for count, record in enumerate(records, start=1):
+        writer.writerow(record)
+        out.flush()
+    return count
+
+
+_WRITERS: dict[
+    Format, Callable[[Iterable[dict[str, Any]], TextIO], int]
+] = {
+    Format.JSON: _write_json,
+    Format.NDJSON: _write_ndjson,
+    Format.CSV: _write_csv,
+}
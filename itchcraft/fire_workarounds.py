@@ -1,7 +1,6 @@
 """A collection of workarounds for known issues in our dependencies."""
 
 import colorama
-import fire  # type: ignore
 
 
 def __fire_suppress_pager() -> None:
@@ -10,6 +9,10 @@ def __fire_suppress_pager() -> None:
     See also:
     https://github.com/google/python-fire/issues/188#issuecomment-631419585
     """
+    # Imported here so that the CLI only loads Fire when it needs it
+    # pylint: disable=import-outside-toplevel
+    import fire  # type: ignore
+
     fire.core.Display = lambda lines, out: print(*lines, file=out)  # pyright: ignore
 
 
@@ -23,5 +26,15 @@ def __vscode_code_runner_fix_colors() -> None:
 
 def apply() -> None:
     """Applies all known workarounds."""
-    __fire_suppress_pager()
+    apply_colorama()
+    apply_fire()
+
+
+def apply_colorama() -> None:
+    """Applies the workarounds that concern colorama."""
     __vscode_code_runner_fix_colors()
+
+
+def apply_fire() -> None:
+    """Applies the workarounds that concern Python Fire."""
+    __fire_suppress_pager()
@@ -15,8 +15,9 @@ def format_table(
 ) -> str:
     """Returns a formatted table for the given list of bite healers."""
 
+    width = max_line_width()
     comment_wrapper = TextWrapper(
-        width=max_line_width(),
+        width=width,
         initial_indent='    ^ ',
         subsequent_indent='      ',
     )
@@ -50,7 +51,7 @@ def format_table(
         ):
             yield fill(
                 format_table_entry_header(item),
-                width=max_line_width(),
+                width=width,
                 initial_indent=(
                     f'{Fore.GREEN}[*]{Style.RESET_ALL} '
                     if item.supported
@@ -0,0 +1,68 @@
+"""Encoding of command frames for bulk transfer devices"""
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TypeVar
+
+from .errors import FrameEncodingError
+
+_K = TypeVar('_K')
+
+_BYTE_RANGE = range(0x100)
+
+
+@dataclass(frozen=True)
+class FrameFormat:
+    """Layout of a command frame: a fixed prefix, followed by the
+    payload, optionally followed by a one-byte additive checksum over
+    the payload.
+
+    :param prefix:
+        the bytes that precede every payload.
+
+    :param checksum:
+        whether to append the sum of all payload bytes.
+    """
+
+    prefix: bytes = b''
+    checksum: bool = True
+
+    def encode(self, *payload: int) -> bytes:
+        """Encodes the given payload into a frame.
+
+        :param payload:
+            the payload bytes, given as integers.
+
+        :raise FrameEncodingError:
+            if a payload byte or the checksum is out of range.
+        """
+        for value in payload:
+            _validate(value, 'Payload byte')
+        if not self.checksum:
+            return self.prefix + bytes(payload)
+        checksum = _validate(sum(payload), 'Checksum')
+        return self.prefix + bytes((*payload, checksum))
+
+
+def build_table(
+    keys: Iterable[_K], encode: Callable[[_K], bytes]
+) -> Mapping[_K, bytes]:
+    """Encodes a frame for each of the given keys up front and
+    returns a read-only lookup table.
+
+    :param keys:
+        all keys for which a frame may later be looked up.
+
+    :param encode:
+        a function that encodes the frame for a given key.
+    """
+    return MappingProxyType({key: encode(key) for key in keys})
+
+
+def _validate(value: int, description: str) -> int:
+    if value not in _BYTE_RANGE:
+        raise FrameEncodingError(
+            f'{description} out of range: {value:#x}'
+        )
+    return value
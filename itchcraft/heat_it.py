@@ -1,83 +1,171 @@
 """Backend for heat-it"""
 
-from collections.abc import Iterable
-from functools import reduce
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+import itertools
+import time
 from typing import Optional
 
-from tenacity import retry
-from tenacity.retry import retry_if_exception_type
-from tenacity.stop import stop_after_attempt
-from tenacity.wait import wait_fixed
 import usb.core
 
-from .backend import BulkTransferDevice
+from .backend import AsyncBulkTransferDevice, BulkTransferDevice
+from .errors import BiteHealerError
+from .frames import build_table, FrameFormat
 from .logging import get_logger
-from .prefs import Preferences
-from .settings import debugMode
-from .types import BiteHealer, SizedPayload
+from .prefs import Duration, Generation, Preferences, SkinSensitivity
+from .retry import DEFAULT_RETRY_POLICY, RetryPolicy
+from .types import AsyncBiteHealer, BiteHealer, SizedPayload
 
 
 RESPONSE_LENGTH = 12
 
+FRAME_FORMAT = FrameFormat(prefix=b'\xff')
+"""Frame layout of all heat-it commands except `TEST_BOOTLOADER`."""
+
+TEST_BOOTLOADER = FrameFormat(prefix=b'\xff', checksum=False).encode(
+    0xB0
+)
+"""Request payload of the `TEST_BOOTLOADER` command."""
+
+GET_STATUS = FRAME_FORMAT.encode(0x02)
+"""Request payload of the `GET_STATUS` command."""
+
+POLL_INTERVAL = 0.25
+"""Default time in seconds between two `GET_STATUS` polls right after
+the status has changed."""
+
+MAX_POLL_INTERVAL = 2.0
+"""Default upper bound in seconds for the time between two `GET_STATUS`
+polls while the status stays the same."""
+
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class HeatItStatus:
+    """Decoded response to a `GET_STATUS` command.
+
+    The heat-it protocol is not publicly documented. The first three
+    bytes are decoded; the remaining bytes are kept as they are.
+    """
+
+    header: int
+    """First byte of the response."""
+
+    command: int
+    """Second byte of the response, which echoes the command code."""
+
+    state: int
+    """Third byte of the response, treated as the device state."""
+
+    data: bytes
+    """Remaining bytes of the response, not decoded any further."""
+
+    @classmethod
+    def decode(cls, response: bytes) -> 'HeatItStatus':
+        """Decodes a response to a `GET_STATUS` command.
+
+        :param response:
+            the response, as received from the device.
+
+        :raise BiteHealerError:
+            if the response has an unexpected length.
+        """
+        if len(response) != RESPONSE_LENGTH:
+            raise BiteHealerError(
+                f'Unexpected status length: {len(response)} bytes'
+            )
+        header, command, state = response[:3]
+        return cls(header, command, state, response[3:])
+
+    def __str__(self) -> str:
+        return f'state {self.state:#04x} (data: {self.data.hex(" ")})'
+
+
 class HeatItDevice(BiteHealer):
     """A “heat it” bite healer, configured over USB.
 
     :param device:
         the backend object to which to delegate the USB bulk transfer.
+
+    :param retry_policy:
+        how to retry :py:meth:`self_test` if the device is not ready.
     """
 
     device: BulkTransferDevice
+    retry_policy: RetryPolicy
 
-    def __init__(self, device: BulkTransferDevice) -> None:
+    def __init__(
+        self,
+        device: BulkTransferDevice,
+        retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    ) -> None:
         self.device = device
+        self.retry_policy = retry_policy
 
     def test_bootloader(self) -> bytes:
         """Issues a `TEST_BOOTLOADER` command and returns the
         response.
         """
-        return self._command([0xFF, 0xB0], 'TEST_BOOTLOADER')
+        return self._command(TEST_BOOTLOADER, 'TEST_BOOTLOADER')
 
     def get_status(self) -> bytes:
         """Issues a `GET_STATUS` command and returns the response."""
-        return self._command([0xFF, 0x02, 0x02], 'GET_STATUS')
+        return self._command(GET_STATUS, 'GET_STATUS')
 
-    def msg_start_heating(self, preferences: Preferences) -> bytes:
-        """Issues a `MSG_START_HEATING` command and returns the
-        response.
+    def read_status(self) -> HeatItStatus:
+        """Issues a `GET_STATUS` command without logging it and returns
+        the decoded response."""
+        return HeatItStatus.decode(self._command(GET_STATUS))
 
-        :param preferences:
-            how the user wants the device to be configured.
-        """
+    def watch(
+        self,
+        interval: float = POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        idle_timeout: Optional[float] = None,
+    ) -> Iterator[HeatItStatus]:
+        """Polls the device status and yields it whenever it changes.
 
-        def duration_code() -> int:
-            return preferences.duration.value - 1
+        The first status is always yielded. While the status stays the
+        same, the time between two polls doubles until it reaches
+        `max_interval`; after a change, it drops back to `interval`.
 
-        def generation_code() -> int:
-            return preferences.generation.value - 1
+        :param interval:
+            time in seconds between two polls right after a change.
 
-        def skin_sensitivity_code() -> int:
-            return preferences.skin_sensitivity.value - 1
+        :param max_interval:
+            upper bound in seconds for the time between two polls.
 
-        def payload() -> list[int]:
-            return [
-                0x08,
-                (generation_code() << 1) + skin_sensitivity_code(),
-                duration_code(),
-            ]
+        :param idle_timeout:
+            if given, stop once the status has stayed the same for this
+            many seconds. Otherwise, keep polling indefinitely.
+        """
+        previous: Optional[HeatItStatus] = None
+        delay = interval
+        changed_at = time.monotonic()
+        for status in iter(self.read_status, None):
+            now = time.monotonic()
+            if status != previous:
+                yield status
+                previous, delay, changed_at = status, interval, now
+            elif (
+                idle_timeout is not None
+                and now - changed_at >= idle_timeout
+            ):
+                return
+            else:
+                delay = min(2 * delay, max_interval)
+            time.sleep(delay)
 
-        def checksum(payload: Iterable[int]) -> int:
-            return reduce(int.__add__, payload)
+    def msg_start_heating(self, preferences: Preferences) -> bytes:
+        """Issues a `MSG_START_HEATING` command and returns the
+        response.
 
+        :param preferences:
+            how the user wants the device to be configured.
+        """
         return self._command(
-            [
-                0xFF,
-                *payload(),
-                checksum(payload()),
-            ],
-            'MSG_START_HEATING',
+            msg_start_heating_request(preferences), 'MSG_START_HEATING'
         )
 
     def _command(
@@ -89,16 +177,40 @@ class HeatItDevice(BiteHealer):
         assert len(response) == RESPONSE_LENGTH
         return response
 
-    @retry(
-        reraise=True,
-        retry=retry_if_exception_type(usb.core.USBError),  # type: ignore
-        stop=stop_after_attempt(3 if debugMode else 10),  # type: ignore
-        wait=wait_fixed(1),  # type: ignore
-    )
+    def _commands(self, *commands: tuple[SizedPayload, str]) -> None:
+        for _, command_name in commands:
+            logger.info('Sending command: %s', command_name)
+        try:
+            responses = self.device.transact_many(
+                [request for request, _ in commands]
+            )
+        except usb.core.USBError:
+            # Keep responses to the rest of the batch from being taken
+            # for responses to the next attempt
+            self.device.discard_pending()
+            raise
+        if len(responses) != len(commands):
+            raise BiteHealerError(
+                f'Expected {len(commands)} responses,'
+                + f' got {len(responses)}'
+            )
+        for response in responses:
+            assert len(response) == RESPONSE_LENGTH
+            logger.debug('Response: %s', response.hex(' '))
+
     def self_test(self) -> None:
-        """Tests the bootloader and obtains the device status."""
-        logger.debug('Response: %s', self.test_bootloader().hex(' '))
-        logger.debug('Response: %s', self.get_status().hex(' '))
+        """Tests the bootloader and obtains the device status.
+
+        Transient USB errors are retried according to
+        :py:attr:`retry_policy`; all others are raised immediately.
+        """
+        self.retry_policy.call(self._self_test_once)
+
+    def _self_test_once(self) -> None:
+        self._commands(
+            (TEST_BOOTLOADER, 'TEST_BOOTLOADER'),
+            (GET_STATUS, 'GET_STATUS'),
+        )
 
     def start_with_preferences(self, preferences: Preferences) -> None:
         """Tells the device to start heating up.
@@ -109,18 +221,101 @@ class HeatItDevice(BiteHealer):
         logger.debug(
             'Response: %s', self.msg_start_heating(preferences).hex(' ')
         )
+        _log_instructions()
+
+    def __str__(self) -> str:
+        name: str = (
+            self.device.product_name
+            or 'unknown, self-identifies as heat-it'
+        )
+        return f'{name}  (S/N: {self.device.serial_number})'
 
-        logger.info('Device now preheating.')
-        logger.info('Watch the LED closely.')
-        logger.info('It will blink purple, then stop')
-        logger.info('and light up blue.')
 
-        logger.warning('While using this app, your')
-        logger.warning('bite healer is NOT SAFE for')
-        logger.warning('use on human skin.')
+class AsyncHeatItDevice(AsyncBiteHealer):
+    """A “heat it” bite healer, configured over USB from an asyncio
+    event loop.
+
+    Retries in :py:meth:`self_test` wait without blocking the event
+    loop, and every command can be cancelled.
+    To drive a PyUSB device, wrap its
+    :py:class:`~.backend.UsbBulkTransferDevice` in a
+    :py:class:`~.backend.ThreadedAsyncBulkTransferDevice`.
+
+    :param device:
+        the backend object to which to delegate the USB bulk transfer.
+
+    :param retry_policy:
+        how to retry :py:meth:`self_test` if the device is not ready.
+    """
 
-        logger.info('Once the LED turns green,')
-        logger.info('the tech demo has completed.')
+    device: AsyncBulkTransferDevice
+    retry_policy: RetryPolicy
+
+    def __init__(
+        self,
+        device: AsyncBulkTransferDevice,
+        retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    ) -> None:
+        self.device = device
+        self.retry_policy = retry_policy
+
+    async def test_bootloader(self) -> bytes:
+        """Issues a `TEST_BOOTLOADER` command and returns the
+        response.
+        """
+        return await self._command(TEST_BOOTLOADER, 'TEST_BOOTLOADER')
+
+    async def get_status(self) -> bytes:
+        """Issues a `GET_STATUS` command and returns the response."""
+        return await self._command(GET_STATUS, 'GET_STATUS')
+
+    async def msg_start_heating(self, preferences: Preferences) -> bytes:
+        """Issues a `MSG_START_HEATING` command and returns the
+        response.
+
+        :param preferences:
+            how the user wants the device to be configured.
+        """
+        return await self._command(
+            msg_start_heating_request(preferences), 'MSG_START_HEATING'
+        )
+
+    async def _command(
+        self, request: SizedPayload, command_name: Optional[str] = None
+    ) -> bytes:
+        if command_name is not None:
+            logger.info('Sending command: %s', command_name)
+        response = await self.device.bulk_transfer(request)
+        assert len(response) == RESPONSE_LENGTH
+        return response
+
+    async def self_test(self) -> None:
+        """Tests the bootloader and obtains the device status.
+
+        Transient USB errors are retried according to
+        :py:attr:`retry_policy`; all others are raised immediately.
+        """
+        await self.retry_policy.call_async(self._self_test_once)
+
+    async def _self_test_once(self) -> None:
+        logger.debug(
+            'Response: %s', (await self.test_bootloader()).hex(' ')
+        )
+        logger.debug('Response: %s', (await self.get_status()).hex(' '))
+
+    async def start_with_preferences(
+        self, preferences: Preferences
+    ) -> None:
+        """Tells the device to start heating up.
+
+        :param preferences:
+            how the user wants the device to be configured.
+        """
+        logger.debug(
+            'Response: %s',
+            (await self.msg_start_heating(preferences)).hex(' '),
+        )
+        _log_instructions()
 
     def __str__(self) -> str:
         name: str = (
@@ -128,3 +323,53 @@ class HeatItDevice(BiteHealer):
             or 'unknown, self-identifies as heat-it'
         )
         return f'{name}  (S/N: {self.device.serial_number})'
+
+
+def msg_start_heating_request(preferences: Preferences) -> bytes:
+    """Returns the request payload of a `MSG_START_HEATING` command.
+
+    :param preferences:
+        how the user wants the device to be configured.
+    """
+    return MSG_START_HEATING[preferences]
+
+
+def _encode_msg_start_heating(preferences: Preferences) -> bytes:
+    return FRAME_FORMAT.encode(
+        0x08,
+        ((preferences.generation.value - 1) << 1)
+        + preferences.skin_sensitivity.value
+        - 1,
+        preferences.duration.value - 1,
+    )
+
+
+MSG_START_HEATING: Mapping[Preferences, bytes] = build_table(
+    (
+        Preferences(
+            skin_sensitivity=skin_sensitivity,
+            generation=generation,
+            duration=duration,
+        )
+        for skin_sensitivity, generation, duration in itertools.product(
+            SkinSensitivity, Generation, Duration
+        )
+    ),
+    _encode_msg_start_heating,
+)
+"""Request payloads of the `MSG_START_HEATING` command, one for each
+possible combination of preferences."""
+
+
+def _log_instructions() -> None:
+    logger.info('Device now preheating.')
+    logger.info('Watch the LED closely.')
+    logger.info('It will blink purple, then stop')
+    logger.info('and light up blue.')
+
+    logger.warning('While using this app, your')
+    logger.warning('bite healer is NOT SAFE for')
+    logger.warning('use on human skin.')
+
+    logger.info('Once the LED turns green,')
+    logger.info('the tech demo has completed.')
@@ -1,22 +1,110 @@
-"""Customized logging with color support."""
+"""Customized logging with color support.
 
+All loggers obtained through :py:func:`get_logger` propagate to a
+single package logger, whose handler is configured exactly once.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import Enum
+import json
 import logging as python_logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Any, Optional, TextIO
 
 from colorama import Fore, Style
 
-from .settings import debugMode
+from .settings import debugMode, logFormat
+
+_PACKAGE_NAME = __name__.split('.', maxsplit=1)[0]
+
+_configured = False  # pylint: disable=invalid-name
+"""Whether the package logger has a handler yet, either from
+:py:func:`configure` or from the first call to :py:func:`get_logger`."""
+
+
+class LogFormat(Enum):
+    """How log records are rendered."""
+
+    TEXT = 'text'
+    """Human-readable, colored lines."""
+
+    JSON = 'json'
+    """One JSON object per line, for machine consumption."""
 
 
 def get_logger(name: str) -> python_logging.Logger:
     """Instantiate a custom logger with color support."""
-    logger = python_logging.getLogger(name)
+    _package_logger()
+    return python_logging.getLogger(name)
+
+
+def configure(
+    log_format: Optional[LogFormat] = None,
+    stream: Optional[TextIO] = None,
+) -> None:
+    """Replaces the handler of the package logger.
+
+    :param log_format:
+        how to render log records. Defaults to the format given by the
+        `ITCHCRAFT_LOG_FORMAT` environment variable.
+
+    :param stream:
+        where to write log records. Defaults to standard error.
+    """
+    global _configured  # pylint: disable=global-statement
+    _configured = True
+    logger = python_logging.getLogger(_PACKAGE_NAME)
     logger.setLevel(
         python_logging.DEBUG if debugMode else python_logging.INFO
     )
-    handler = python_logging.StreamHandler()
-    handler.setFormatter(_CustomFormatter())
+    handler = python_logging.StreamHandler(stream)
+    handler.setFormatter(
+        _FORMATTERS[log_format or _log_format_from_settings()]()
+    )
+    for old_handler in logger.handlers[:]:
+        logger.removeHandler(old_handler)
     logger.addHandler(handler)
-    return logger
+
+
+@contextmanager
+def queued_logging() -> Iterator[None]:
+    """Routes log records through a queue while the context is
+    active.
+
+    A background thread writes the records, so threads that do USB I/O
+    never block on the output stream.
+    """
+    logger = _package_logger()
+    handlers = logger.handlers[:]
+    queue: SimpleQueue[python_logging.LogRecord] = SimpleQueue()
+    listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    queue_handler = QueueHandler(queue)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        logger.removeHandler(queue_handler)
+        for handler in handlers:
+            logger.addHandler(handler)
+
+
+def _package_logger() -> python_logging.Logger:
+    if not _configured:
+        configure()
+    return python_logging.getLogger(_PACKAGE_NAME)
+
+
+def _log_format_from_settings() -> LogFormat:
+    try:
+        return LogFormat(logFormat)
+    except ValueError:
+        return LogFormat.TEXT
 
 
 class _CustomFormatter(python_logging.Formatter):
@@ -33,7 +121,33 @@ class _CustomFormatter(python_logging.Formatter):
         + Style.RESET_ALL,
     }
 
+    def __init__(self) -> None:
+        super().__init__(self._format)
+        self._formatters = {
+            level: python_logging.Formatter(log_fmt)
+            for level, log_fmt in self.FORMATS.items()
+        }
+
     def format(self, record: python_logging.LogRecord) -> str:
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = python_logging.Formatter(log_fmt)
+        if (formatter := self._formatters.get(record.levelno)) is None:
+            return super().format(record)
         return formatter.format(record)
+
+
+class _JsonFormatter(python_logging.Formatter):
+    def format(self, record: python_logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+_FORMATTERS: dict[LogFormat, type[python_logging.Formatter]] = {
+    LogFormat.TEXT: _CustomFormatter,
+    LogFormat.JSON: _JsonFormatter,
+}
@@ -0,0 +1,220 @@
+"""Pool of configured USB connections to bite healers"""
+
+import atexit
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import usb.core
+
+from .backend import BulkTransferDevice, UsbBulkTransferDevice
+from .logging import get_logger
+from .retry import is_transient
+
+IDLE_TIMEOUT = 60.0
+"""Default time in seconds after which an unused connection is
+closed."""
+
+logger = get_logger(__name__)
+
+
+class PoolKey(NamedTuple):
+    """Identifies a physical device across enumerations.
+
+    The kernel assigns a new address whenever a device is attached, so
+    the key changes when a device is replaced.
+    """
+
+    bus: int
+    """Number of the bus to which the device is attached."""
+    address: int
+    """Address of the device on its bus."""
+    vid: int
+    """USB vendor ID of the device."""
+    pid: int
+    """USB product ID of the device."""
+
+    @classmethod
+    def of(cls, usb_device: usb.core.Device) -> 'PoolKey':
+        """Returns the key for a PyUSB device, using only values from
+        its cached device descriptor.
+
+        :param usb_device:
+            the device to identify.
+        """
+        return cls(
+            usb_device.bus,
+            usb_device.address,
+            usb_device.idVendor,
+            usb_device.idProduct,
+        )
+
+
+@dataclass
+class _IdleConnection:
+    device: BulkTransferDevice
+    released_at: float
+
+
+class ConnectionPool:
+    """Keeps configured bulk transfer devices open between sessions.
+
+    A device that is checked out again skips configuration, endpoint
+    lookup and the kernel driver check. Checking out compares the
+    device’s bus, address, VID and PID, then verifies with
+    :py:meth:`~.backend.BulkTransferDevice.is_alive` that an idle
+    connection still works; a stale one is closed and replaced by a
+    new connection. Connections are closed when they have been idle
+    for longer than `idle_timeout`, when a session fails with anything
+    but a transient USB error, when the device is reported as
+    detached, even if the connection is checked out at the time, and
+    on :py:meth:`close`.
+
+    :param idle_timeout:
+        time in seconds after which an unused connection is closed.
+
+    :param factory:
+        creates a bulk transfer device for a PyUSB device.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = IDLE_TIMEOUT,
+        factory: Callable[
+            [usb.core.Device], BulkTransferDevice
+        ] = UsbBulkTransferDevice,
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._idle: dict[PoolKey, _IdleConnection] = {}
+        self._in_use: Counter[PoolKey] = Counter()
+        self._detached: set[PoolKey] = set()
+
+    @contextmanager
+    def checkout(
+        self, usb_device: usb.core.Device
+    ) -> Iterator[BulkTransferDevice]:
+        """Lends out a connection to the given device for the duration
+        of the `with` block, creating one if none is idle.
+
+        :param usb_device:
+            the PyUSB device to connect to.
+        """
+        key = PoolKey.of(usb_device)
+        self.evict_idle()
+        with self._lock:
+            idle = self._idle.pop(key, None)
+            self._in_use[key] += 1
+        try:
+            device = self._connect(usb_device, key, idle)
+        except BaseException:
+            self._check_in(key)
+            raise
+        healthy = True
+        try:
+            yield device
+        # The connection may be in any state after other errors, e.g.
+        # a deadline that expired between a write and its read
+        except BaseException as ex:
+            healthy = is_transient(ex)
+            raise
+        finally:
+            if not self._check_in(key):
+                logger.debug('Closing connection to detached %s', key)
+                device.close()
+            elif healthy:
+                self._release(key, device)
+            else:
+                logger.debug('Closing broken connection to %s', key)
+                device.close()
+
+    def evict(self, bus: int, address: int) -> None:
+        """Closes the idle connection to the device at the given
+        location, e.g. because it has been detached.
+        Connections to that device that are checked out are closed
+        instead of being returned to the pool.
+
+        :param bus:
+            number of the bus to which the device was attached.
+
+        :param address:
+            address of the device on its bus.
+        """
+        with self._lock:
+            evicted = [
+                self._idle.pop(key)
+                for key in list(self._idle)
+                if (key.bus, key.address) == (bus, address)
+            ]
+            self._detached.update(
+                key
+                for key in self._in_use
+                if (key.bus, key.address) == (bus, address)
+            )
+        for idle in evicted:
+            idle.device.close()
+
+    def evict_idle(self) -> None:
+        """Closes all connections that have been idle for too long."""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            expired = [
+                self._idle.pop(key)
+                for key, idle in list(self._idle.items())
+                if idle.released_at < cutoff
+            ]
+        for idle in expired:
+            idle.device.close()
+
+    def close(self) -> None:
+        """Closes all idle connections."""
+        with self._lock:
+            idle_connections = list(self._idle.values())
+            self._idle.clear()
+        for idle in idle_connections:
+            idle.device.close()
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def _connect(
+        self,
+        usb_device: usb.core.Device,
+        key: PoolKey,
+        idle: Optional[_IdleConnection],
+    ) -> BulkTransferDevice:
+        if idle is not None:
+            if idle.device.is_alive():
+                logger.debug('Reusing connection to %s', key)
+                return idle.device
+            logger.debug('Discarding stale connection to %s', key)
+            idle.device.close()
+        return self._factory(usb_device)
+
+    def _check_in(self, key: PoolKey) -> bool:
+        # Returns whether the device is still attached
+        with self._lock:
+            self._in_use[key] -= 1
+            attached = key not in self._detached
+            if not self._in_use[key]:
+                del self._in_use[key]
+                self._detached.discard(key)
+        return attached
+
+    def _release(self, key: PoolKey, device: BulkTransferDevice) -> None:
+        with self._lock:
+            previous = self._idle.get(key)
+            self._idle[key] = _IdleConnection(device, time.monotonic())
+        if previous is not None and previous.device is not device:
+            previous.device.close()
+
+
+POOL = ConnectionPool()
+"""Connections to all supported bite healers in this process."""
+
+atexit.register(POOL.close)
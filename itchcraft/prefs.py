@@ -80,6 +80,16 @@ class Duration(Enum):
         return f'{self.name.lower()} duration'
 
 
+class Backend(Enum):
+    """How Itchcraft reaches bite healers."""
+
+    USB = 1
+    SIM = 2
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
 @dataclass(frozen=True)
 class Preferences:
     """User preferences for a bite healer demo session."""
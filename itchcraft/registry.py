@@ -0,0 +1,287 @@
+"""Registry of connected bite healers, kept current by hotplug events"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from enum import Enum
+import os
+from pathlib import Path
+import socket
+import threading
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+from .device import BiteHealerMetadata, from_usb_device
+from .errors import BackendInitializationError
+from .logging import get_logger
+from .pool import POOL
+from .settings import SYSFS_USB_DEVICES
+from .support import SUPPORT_DATABASE, VidPid
+from .sysfs import find_usb_devices, read_usb_device, SysfsUsbDevice
+
+logger = get_logger(__name__)
+
+NETLINK_KOBJECT_UEVENT = 15
+"""Netlink protocol over which the kernel broadcasts uevents."""
+
+_UEVENT_GROUP_KERNEL = 1
+_UEVENT_BUFFER_SIZE = 16384
+_USB_DEVICE = ('usb', 'usb_device')
+
+
+class Location(NamedTuple):
+    """Where a USB device is attached to the host."""
+
+    bus: int
+    """Number of the bus to which the device is attached."""
+    address: int
+    """Address of the device on its bus."""
+
+
+class HotplugAction(Enum):
+    """What happened to a USB device."""
+
+    ADD = 'add'
+    REMOVE = 'remove'
+
+
+class HotplugEvent(NamedTuple):
+    """A USB device having been attached to or detached from the host."""
+
+    action: HotplugAction
+    """Whether the device was attached or detached."""
+    devpath: str
+    """Path of the device in sysfs, relative to `/sys`."""
+    location: Location
+    """Where the device is (or was) attached."""
+
+
+class HotplugEventSource(ABC):
+    """A source of hotplug events."""
+
+    @abstractmethod
+    def receive(self) -> list[HotplugEvent]:
+        """Returns all pending events without blocking."""
+
+    def close(self) -> None:
+        """Releases any resources held by this event source."""
+
+
+class NetlinkEventSource(HotplugEventSource):
+    """Receives hotplug events from the kernel via a netlink socket.
+
+    This is the same event stream that udev rules, such as those in
+    `contrib/udev`, are driven by.
+    """
+
+    def __init__(self) -> None:
+        try:
+            self._socket = _open_uevent_socket()
+        except (AttributeError, OSError) as ex:
+            raise BackendInitializationError(
+                f'Unable to listen for hotplug events: {ex}'
+            ) from ex
+
+    def receive(self) -> list[HotplugEvent]:
+        return [
+            event
+            for message in iter(self._receive_message, None)
+            if (event := parse_uevent(message)) is not None
+        ]
+
+    def close(self) -> None:
+        self._socket.close()
+
+    def _receive_message(self) -> Optional[bytes]:
+        try:
+            return self._socket.recv(_UEVENT_BUFFER_SIZE)
+        except BlockingIOError:
+            return None
+
+
+def parse_uevent(message: bytes) -> Optional[HotplugEvent]:
+    """Parses a kernel uevent message.
+
+    :param message:
+        the raw message as received from the netlink socket.
+
+    :return:
+        a hotplug event if the message represents a USB device being
+        added or removed; None otherwise.
+    """
+    _header, *fields = message.decode('utf-8', 'replace').split('\0')
+    properties = {
+        key: value
+        for key, _, value in (field.partition('=') for field in fields)
+    }
+    if (
+        properties.get('SUBSYSTEM'),
+        properties.get('DEVTYPE'),
+    ) != _USB_DEVICE:
+        return None
+    try:
+        return HotplugEvent(
+            action=HotplugAction(properties.get('ACTION')),
+            devpath=properties.get('DEVPATH', ''),
+            location=Location(
+                bus=int(properties['BUSNUM']),
+                address=int(properties['DEVNUM']),
+            ),
+        )
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """Immutable view of the bite healers connected at a given time."""
+
+    generation: int
+    """Counter that increases every time the registry changes."""
+
+    by_location: Mapping[Location, BiteHealerMetadata]
+    """Connected bite healers, keyed by where they are attached."""
+
+    by_serial_number: Mapping[str, BiteHealerMetadata]
+    """Connected bite healers that report a serial number, keyed by
+    that serial number."""
+
+    by_vid_pid: Mapping[VidPid, tuple[BiteHealerMetadata, ...]]
+    """Connected bite healers, grouped by their VID and PID."""
+
+    @property
+    def bite_healers(self) -> tuple[BiteHealerMetadata, ...]:
+        """All connected bite healers."""
+        return tuple(self.by_location.values())
+
+
+class DeviceRegistry:
+    """Keeps track of connected bite healers.
+
+    The registry scans sysfs once when it’s created. After that, it
+    only reads the sysfs entries of devices that hotplug events report
+    as newly attached.
+
+    :param event_source:
+        where hotplug events come from.
+
+    :param sysfs_root:
+        the directory in which the kernel lists USB devices.
+    """
+
+    def __init__(
+        self,
+        event_source: HotplugEventSource,
+        sysfs_root: Path = SYSFS_USB_DEVICES,
+    ) -> None:
+        self._event_source = event_source
+        self._sysfs_root = sysfs_root
+        self._vendor_ids = SUPPORT_DATABASE.vendor_ids
+        self._lock = threading.Lock()
+        self._entries: dict[Location, BiteHealerMetadata] = {}
+        self._snapshot = self._take_snapshot(generation=0)
+        self._populate()
+
+    def poll(self) -> RegistrySnapshot:
+        """Applies all pending hotplug events and returns a snapshot of
+        the bite healers that are currently connected.
+        """
+        if events := self._event_source.receive():
+            self.apply(events)
+        return self._snapshot
+
+    def apply(self, events: Iterable[HotplugEvent]) -> None:
+        """Updates the registry according to the given events.
+
+        :param events:
+            the hotplug events to apply, in the order they occurred.
+        """
+        with self._lock:
+            changed = False
+            for event in events:
+                if event.action is HotplugAction.REMOVE:
+                    POOL.evict(*event.location)
+                    changed |= (
+                        self._entries.pop(event.location, None) is not None
+                    )
+                elif (device := self._read(event.devpath)) is not None:
+                    self._add(device)
+                    changed = True
+            if changed:
+                self._snapshot = self._take_snapshot(
+                    generation=self._snapshot.generation + 1
+                )
+
+    def close(self) -> None:
+        """Closes the underlying event source."""
+        self._event_source.close()
+
+    def _populate(self) -> None:
+        if (
+            devices := find_usb_devices(self._sysfs_root, self._vendor_ids)
+        ) is None:
+            raise BackendInitializationError(
+                f'sysfs is unavailable at {self._sysfs_root}'
+            )
+        with self._lock:
+            for device in devices:
+                self._add(device)
+            self._snapshot = self._take_snapshot(generation=0)
+
+    def _read(self, devpath: str) -> Optional[SysfsUsbDevice]:
+        return read_usb_device(
+            str(self._sysfs_root / os.path.basename(devpath)),
+            self._vendor_ids,
+        )
+
+    def _add(self, device: SysfsUsbDevice) -> None:
+        if (
+            statement := SUPPORT_DATABASE.lookup(
+                device.idVendor, device.idProduct
+            )
+        ) is None:
+            return
+        vid_pid = VidPid(vid=device.idVendor, pid=device.idProduct)
+        location = Location(bus=device.bus, address=device.address)
+        logger.debug('Registering bite healer %s at %s', vid_pid, location)
+        self._entries[location] = from_usb_device(device, statement)
+
+    def _take_snapshot(self, generation: int) -> RegistrySnapshot:
+        by_vid_pid: dict[VidPid, list[BiteHealerMetadata]] = {}
+        for metadata in self._entries.values():
+            by_vid_pid.setdefault(
+                VidPid(
+                    vid=metadata.support_statement.vid,
+                    pid=metadata.support_statement.pid,
+                ),
+                [],
+            ).append(metadata)
+        return RegistrySnapshot(
+            generation=generation,
+            by_location=MappingProxyType(dict(self._entries)),
+            by_serial_number=MappingProxyType(
+                {
+                    metadata.serial_number: metadata
+                    for metadata in self._entries.values()
+                    if metadata.serial_number is not None
+                }
+            ),
+            by_vid_pid=MappingProxyType(
+                {
+                    vid_pid: tuple(entries)
+                    for vid_pid, entries in by_vid_pid.items()
+                }
+            ),
+        )
+
+
+def _open_uevent_socket() -> socket.socket:
+    uevent_socket = socket.socket(
+        socket.AF_NETLINK,  # pylint: disable=no-member
+        socket.SOCK_DGRAM,
+        NETLINK_KOBJECT_UEVENT,
+    )
+    # Port ID 0 lets the kernel assign a unique one
+    uevent_socket.bind((0, _UEVENT_GROUP_KERNEL))
+    uevent_socket.setblocking(False)
+    return uevent_socket
@@ -0,0 +1,238 @@
+"""Retry policy for commands sent to bite healers"""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import errno
+import threading
+import time
+from typing import Any, TypeVar, cast
+
+from tenacity import BaseRetrying, Retrying
+from tenacity._asyncio import AsyncRetrying
+from tenacity.retry import retry_if_exception
+from tenacity.stop import stop_after_attempt, stop_after_delay
+from tenacity.wait import wait_exponential, wait_random
+import usb.core
+
+from . import deadline
+from .logging import get_logger
+from .settings import debugMode
+
+FATAL_ERRNOS = frozenset(
+    (errno.ENODEV, errno.ENOENT, errno.EACCES, errno.EPERM)
+)
+"""Error numbers that indicate that retrying is pointless, e.g.
+because the device is gone or access was denied."""
+
+_T = TypeVar('_T')
+
+logger = get_logger(__name__)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Tells whether a failed command is worth retrying.
+
+    Timeouts, pipe errors and other USB errors are transient unless
+    their error number is one of :py:data:`FATAL_ERRNOS`.
+
+    :param error:
+        the exception that the command raised.
+    """
+    return (
+        isinstance(error, usb.core.USBError)
+        and error.errno not in FATAL_ERRNOS
+    )
+
+
+@dataclass
+class RetryMetrics:
+    """Counters that describe how retried operations have fared.
+
+    Safe to update from several threads at once.
+    """
+
+    operations: int = 0
+    """Number of operations that ran to completion or gave up."""
+
+    attempts: int = 0
+    """Total number of attempts across all operations."""
+
+    failures: int = 0
+    """Number of operations that failed even after retrying."""
+
+    seconds: float = 0.0
+    """Total wall time spent in all operations, including waits."""
+
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    @property
+    def retries(self) -> int:
+        """Number of attempts beyond the first one of each
+        operation."""
+        return self.attempts - self.operations
+
+    def record(self, attempts: int, seconds: float, failed: bool) -> None:
+        """Adds the outcome of one operation to the counters.
+
+        :param attempts:
+            how many times the operation was attempted.
+
+        :param seconds:
+            how long the operation took in total.
+
+        :param failed:
+            whether the operation gave up without succeeding.
+        """
+        with self._lock:
+            self.operations += 1
+            self.attempts += attempts
+            self.failures += failed
+            self.seconds += seconds
+
+
+METRICS = RetryMetrics()
+"""Metrics of every retried operation in this process."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how fast to retry an operation.
+
+    Errors for which :py:func:`is_transient` is false are raised
+    immediately. Otherwise, the wait between attempts starts at
+    `initial_wait` and doubles with every attempt up to `max_wait`, plus
+    a random jitter.
+    """
+
+    max_attempts: int = 10
+    """Maximum number of attempts, including the first one."""
+
+    initial_wait: float = 0.005
+    """Time in seconds to wait after the first failed attempt."""
+
+    max_wait: float = 0.5
+    """Upper bound in seconds for the wait between two attempts."""
+
+    jitter: float = 0.005
+    """Maximum random time in seconds to add to each wait."""
+
+    deadline: float = 5.0
+    """Time in seconds after which no new attempt is started.
+    An earlier :py:func:`~.deadline.deadline` takes precedence."""
+
+    def call(
+        self,
+        function: Callable[[], _T],
+        metrics: RetryMetrics = METRICS,
+    ) -> _T:
+        """Calls a function until it succeeds or the policy gives up.
+
+        :param function:
+            the function to call.
+
+        :param metrics:
+            the metrics to which to add the outcome.
+
+        :raise Exception:
+            the last error that `function` raised, if it never
+            succeeded.
+        """
+        retrying = self._retrying(Retrying)
+        run = cast(Callable[[Callable[[], _T]], _T], retrying)
+        start_time = time.monotonic()
+        try:
+            result = run(function)
+        except Exception:
+            self._record(retrying, metrics, start_time, failed=True)
+            raise
+        self._record(retrying, metrics, start_time, failed=False)
+        return result
+
+    async def call_async(
+        self,
+        function: Callable[[], Awaitable[_T]],
+        metrics: RetryMetrics = METRICS,
+    ) -> _T:
+        """Awaits a coroutine function until it succeeds or the policy
+        gives up, without blocking the event loop while waiting.
+
+        :param function:
+            the coroutine function to call.
+
+        :param metrics:
+            the metrics to which to add the outcome.
+
+        :raise Exception:
+            the last error that `function` raised, if it never
+            succeeded.
+        """
+        retrying = self._retrying(AsyncRetrying)
+        run = cast(
+            Callable[[Callable[[], Awaitable[_T]]], Awaitable[_T]],
+            retrying,
+        )
+        start_time = time.monotonic()
+        try:
+            result = await run(function)
+        except Exception:
+            self._record(retrying, metrics, start_time, failed=True)
+            raise
+        self._record(retrying, metrics, start_time, failed=False)
+        return result
+
+    def _retrying(
+        self, retrying_class: type[BaseRetrying]
+    ) -> BaseRetrying:
+        new_retrying = cast(Callable[..., BaseRetrying], retrying_class)
+        return new_retrying(**self._tenacity_args())
+
+    def _tenacity_args(self) -> dict[str, Any]:
+        return {
+            'reraise': True,
+            'retry': retry_if_exception(is_transient),  # type: ignore
+            'stop': (
+                stop_after_attempt(self.max_attempts)  # type: ignore
+                | stop_after_delay(self.deadline)  # type: ignore
+                | _stop_if_deadline_expired
+            ),
+            'wait': (
+                wait_exponential(  # type: ignore
+                    multiplier=self.initial_wait, max=self.max_wait
+                )
+                + wait_random(0, self.jitter)  # type: ignore
+            ),
+        }
+
+    @staticmethod
+    def _record(
+        retrying: BaseRetrying,
+        metrics: RetryMetrics,
+        start_time: float,
+        failed: bool,
+    ) -> None:
+        attempts = retrying.statistics.get('attempt_number', 1)
+        seconds = time.monotonic() - start_time
+        metrics.record(attempts, seconds, failed)
+        if attempts > 1 or failed:
+            logger.debug(
+                '%s after %d attempt(s) in %.3f s',
+                'Gave up' if failed else 'Succeeded',
+                attempts,
+                seconds,
+            )
+
+
+def _stop_if_deadline_expired(
+    retry_state: object,  # pylint: disable=unused-argument
+) -> bool:
+    # Tenacity passes `retry_state` by keyword, so the name matters
+    return deadline.expired()
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy(max_attempts=3 if debugMode else 10)
+"""Retry policy that bite healers use unless told otherwise."""
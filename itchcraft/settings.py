@@ -1,10 +1,147 @@
 """A place for shared paths and settings."""
 
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass
 import os
 from pathlib import Path
+import tempfile
+from typing import Optional, TypeVar
+
+from .errors import CliError
+
+_Number = TypeVar('_Number', int, float)
 
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
 PACKAGE_ROOT = Path(__file__).parent.absolute()
 PYPROJECT_TOML = PROJECT_ROOT / 'pyproject.toml'
+SYSFS_USB_DEVICES = Path('/sys/bus/usb/devices')
+SUPPORT_FILE = (
+    Path(support_file)
+    if (support_file := os.getenv('ITCHCRAFT_SUPPORT_FILE'))
+    else None
+)
+DAEMON_SOCKET = Path(
+    os.getenv('ITCHCRAFT_SOCKET')
+    or Path(
+        os.getenv('XDG_RUNTIME_DIR')
+        # The temporary directory is shared, so use a private subdirectory
+        or Path(tempfile.gettempdir()) / f'itchcraft-{os.getuid()}'
+    )
+    / 'itchcraft.sock'
+)
+DEFAULT_DISCOVERY_WORKERS = 1
+"""Default maximum number of devices whose string descriptors are read
+at the same time, both during discovery and by `info`."""
+ENDPOINT_CACHE_FILE = (
+    None
+    if os.getenv('ITCHCRAFT_NO_CACHE')
+    else Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache')
+    / 'itchcraft'
+    / 'endpoints.json'
+)
+
+backend = os.getenv('ITCHCRAFT_BACKEND') or 'usb'
+simulatorOptions = os.getenv('ITCHCRAFT_SIMULATOR') or ''
+
+# Parsed on use, so that a malformed value only affects the commands
+# that need it
+transferTimeout = os.getenv('ITCHCRAFT_TRANSFER_TIMEOUT') or '1'
+sessionTimeout = os.getenv('ITCHCRAFT_SESSION_TIMEOUT') or '15'
+discoveryWorkers = os.getenv('ITCHCRAFT_DISCOVERY_WORKERS') or str(
+    DEFAULT_DISCOVERY_WORKERS
+)
 
 debugMode = bool(os.getenv('ITCHCRAFT_DEBUG'))
+useFire = bool(os.getenv('ITCHCRAFT_USE_FIRE'))
+logFormat = os.getenv('ITCHCRAFT_LOG_FORMAT') or 'text'
+
+
+@dataclass(frozen=True)
+class Overrides:
+    """Settings given on the command line, which take precedence over
+    the corresponding environment variables."""
+
+    backend: Optional[str] = None
+    """Overrides `ITCHCRAFT_BACKEND`."""
+
+    transfer_timeout: Optional[float] = None
+    """Overrides `ITCHCRAFT_TRANSFER_TIMEOUT`."""
+
+    session_timeout: Optional[float] = None
+    """Overrides `ITCHCRAFT_SESSION_TIMEOUT`."""
+
+
+_overrides: ContextVar[Overrides] = ContextVar(
+    'overrides', default=Overrides()
+)
+
+
+@contextmanager
+def overridden(overrides: Overrides) -> Iterator[None]:
+    """Applies overrides to everything that runs inside the `with`
+    block on the same thread or asyncio task.
+
+    :param overrides:
+        the settings to override.
+    """
+    token = _overrides.set(overrides)
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+def current_overrides() -> Overrides:
+    """Returns the overrides that apply to the current thread or
+    asyncio task."""
+    return _overrides.get()
+
+
+def backend_name() -> str:
+    """Returns the name of the backend for talking to USB devices."""
+    return _overrides.get().backend or backend
+
+
+def transfer_timeout() -> float:
+    """Returns the time limit in seconds for each USB read or write.
+
+    :raise CliError:
+        if `ITCHCRAFT_TRANSFER_TIMEOUT` isn’t a positive number.
+    """
+    if (seconds := _overrides.get().transfer_timeout) is not None:
+        return seconds
+    return _positive(transferTimeout, 'ITCHCRAFT_TRANSFER_TIMEOUT', float)
+
+
+def session_timeout() -> float:
+    """Returns the time limit in seconds for testing and activating a
+    bite healer.
+
+    :raise CliError:
+        if `ITCHCRAFT_SESSION_TIMEOUT` isn’t a positive number.
+    """
+    if (seconds := _overrides.get().session_timeout) is not None:
+        return seconds
+    return _positive(sessionTimeout, 'ITCHCRAFT_SESSION_TIMEOUT', float)
+
+
+def discovery_workers() -> int:
+    """Returns the maximum number of devices to read string descriptors
+    from at the same time.
+
+    :raise CliError:
+        if `ITCHCRAFT_DISCOVERY_WORKERS` isn’t a positive integer.
+    """
+    return _positive(discoveryWorkers, 'ITCHCRAFT_DISCOVERY_WORKERS', int)
+
+
+def _positive(
+    text: str, name: str, value_type: Callable[[str], _Number]
+) -> _Number:
+    with suppress(ValueError):
+        if (value := value_type(text)) > 0:
+            return value
+    kind = 'integer' if value_type is int else 'number'
+    raise CliError(f'`{name}` must be a positive {kind}, got `{text}`')
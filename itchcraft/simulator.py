@@ -0,0 +1,247 @@
+"""Simulated heat-it bite healers for testing without hardware"""
+
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, fields, replace
+import errno
+from enum import IntEnum
+import functools
+import random
+import threading
+import time
+from typing import Any, Optional
+
+import usb.core
+
+from . import deadline
+from .backend import BulkTransferDevice
+from .device import SupportedBiteHealerMetadata, UsbStrings
+from .errors import CliError
+from .heat_it import (
+    GET_STATUS,
+    HeatItDevice,
+    MSG_START_HEATING,
+    RESPONSE_LENGTH,
+    TEST_BOOTLOADER,
+)
+from .logging import get_logger
+from .prefs import Duration
+from .support import SupportStatement
+from .types import BiteHealer, SizedPayload
+
+logger = get_logger(__name__)
+
+SIMULATED_HEAT_IT = SupportStatement(
+    vid=0x32F9,
+    pid=0xFCBA,
+    vendor_name='Itchcraft',
+    product_name='heat it (simulated)',
+)
+"""Support statement that every simulated bite healer reports."""
+
+PREHEAT_SECONDS = 2.0
+"""Simulated time it takes to reach the target temperature."""
+
+HOLD_SECONDS = {
+    Duration.SHORT: 3.0,
+    Duration.MEDIUM: 5.0,
+    Duration.LONG: 8.0,
+}
+"""Simulated time the target temperature is held, by duration."""
+
+_START_HEATING_FRAMES = {
+    frame: preferences for preferences, frame in MSG_START_HEATING.items()
+}
+
+
+class SimulatedState(IntEnum):
+    """State byte that a simulated bite healer reports in response to
+    `GET_STATUS`."""
+
+    IDLE = 0
+    PREHEATING = 1
+    HOLDING = 2
+
+
+@dataclass(frozen=True)
+class SimulatorConfig:
+    """Behavior of simulated bite healers.
+
+    Can be parsed from a string such as
+    ``devices=200,latency=0.005,error_rate=0.01``.
+    """
+
+    devices: int = 1
+    """Number of simulated bite healers to discover."""
+
+    latency: float = 0.0
+    """Mean time in seconds that each bulk transfer takes."""
+
+    jitter: float = 0.0
+    """Maximum deviation in seconds from the mean latency."""
+
+    error_rate: float = 0.0
+    """Probability that a transfer starts a burst of USB errors."""
+
+    error_burst: int = 1
+    """Number of consecutive transfers that fail in each burst."""
+
+    time_scale: float = 1.0
+    """Factor by which simulated heating sessions run faster."""
+
+    seed: int = 0
+    """Seed for the random number generators of all devices."""
+
+    @classmethod
+    def parse(cls, options: str) -> 'SimulatorConfig':
+        """Parses a comma-separated list of ``key=value`` options.
+
+        :param options:
+            the options to parse. Omitted keys keep their defaults.
+
+        :raise CliError:
+            if an option is unknown or has an invalid value.
+        """
+        defaults = cls()
+        names = {field.name for field in fields(cls)}
+        values: dict[str, Any] = {}
+        for option in options.split(','):
+            if not option:
+                continue
+            name, _, value = option.partition('=')
+            if (name := name.strip()) not in names:
+                raise CliError(f'Unknown simulator option `{name}`')
+            values[name] = _convert(value, type(getattr(defaults, name)))
+        return replace(defaults, **values)
+
+
+class SimulatedBulkTransferDevice(BulkTransferDevice):
+    """Bulk transfer device that emulates the heat-it protocol.
+
+    After a valid `MSG_START_HEATING` command, the reported state runs
+    through preheating and holding before returning to idle.
+
+    :param config:
+        latency, jitter, error injection and time scale to apply.
+
+    :param serial_number:
+        the serial number to report.
+    """
+
+    def __init__(
+        self,
+        config: SimulatorConfig = SimulatorConfig(),
+        serial_number: Optional[str] = None,
+    ) -> None:
+        self.config = config
+        self._serial_number = serial_number
+        self._random = random.Random(f'{config.seed}:{serial_number}')
+        self._lock = threading.Lock()
+        self._failures_left = 0
+        self._session: Optional[tuple[float, float]] = None
+
+    def bulk_transfer(self, request: SizedPayload) -> bytes:
+        request = bytes(request)
+        with self._lock:
+            delay = self._delay()
+            self._inject_error()
+        if (limit := deadline.timeout(None)) is not None and delay > limit:
+            time.sleep(limit)
+            raise usb.core.USBError(
+                'Operation timed out', errno=errno.ETIMEDOUT
+            )
+        time.sleep(delay)
+        with self._lock:
+            return self._respond(request)
+
+    def state(self) -> SimulatedState:
+        """Returns the state that the device is currently in."""
+        if self._session is None:
+            return SimulatedState.IDLE
+        started_at, hold_seconds = self._session
+        elapsed = (time.monotonic() - started_at) * self.config.time_scale
+        if elapsed < PREHEAT_SECONDS:
+            return SimulatedState.PREHEATING
+        if elapsed < PREHEAT_SECONDS + hold_seconds:
+            return SimulatedState.HOLDING
+        return SimulatedState.IDLE
+
+    @property
+    def product_name(self) -> Optional[str]:
+        return SIMULATED_HEAT_IT.product_name
+
+    @property
+    def serial_number(self) -> Optional[str]:
+        return self._serial_number
+
+    def _delay(self) -> float:
+        delay = self.config.latency
+        # Drawing no number without jitter keeps error injection
+        # reproducible for a given seed
+        if jitter := self.config.jitter:
+            delay += self._random.uniform(-jitter, jitter)
+        return max(0.0, delay)
+
+    def _inject_error(self) -> None:
+        if (
+            not self._failures_left
+            and self._random.random() < self.config.error_rate
+        ):
+            self._failures_left = self.config.error_burst
+        if self._failures_left:
+            self._failures_left -= 1
+            raise usb.core.USBError(
+                'Operation timed out', errno=errno.ETIMEDOUT
+            )
+
+    def _respond(self, request: bytes) -> bytes:
+        if request == GET_STATUS:
+            return _response(request, self.state())
+        if request == TEST_BOOTLOADER:
+            return _response(request)
+        if (preferences := _START_HEATING_FRAMES.get(request)) is None:
+            raise usb.core.USBError('Pipe error', errno=errno.EPIPE)
+        if self.state() is not SimulatedState.IDLE:
+            return _response(request, self.state())
+        self._session = (time.monotonic(), HOLD_SECONDS[preferences.duration])
+        return _response(request, SimulatedState.PREHEATING)
+
+
+def find_bite_healers(
+    config: SimulatorConfig,
+) -> Iterator[SupportedBiteHealerMetadata]:
+    """Discovers the given number of simulated bite healers.
+
+    Each bite healer keeps its state across connections.
+
+    :param config:
+        how many bite healers to simulate and how they behave.
+    """
+    logger.debug('Simulating %d bite healer(s)', config.devices)
+    for index in range(config.devices):
+        serial_number = f'SIM{index:05d}'
+        device = SimulatedBulkTransferDevice(config, serial_number)
+        yield SupportedBiteHealerMetadata(
+            usb_strings=UsbStrings.known(
+                device.product_name, serial_number
+            ),
+            connection_supplier=functools.partial(_connect, device),
+            support_statement=SIMULATED_HEAT_IT,
+        )
+
+
+def _connect(
+    device: SimulatedBulkTransferDevice,
+) -> AbstractContextManager[BiteHealer]:
+    return nullcontext(HeatItDevice(device))
+
+
+def _convert(value: str, value_type: type) -> object:
+    try:
+        return value_type(value)
+    except ValueError as ex:
+        raise CliError(f'Invalid simulator option value `{value}`') from ex
+
+
+def _response(request: bytes, state: int = 0) -> bytes:
+    return bytes((0xFF, request[1], state)).ljust(RESPONSE_LENGTH, b'\0')
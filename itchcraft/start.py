@@ -1,48 +1,235 @@
 """Activates a connected USB bite healer."""
 
-from typing import cast
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import cast, Optional
 
-from . import devices
-from .device import SupportedBiteHealerMetadata
+from . import daemon, devices, settings
+from .deadline import deadline
+from .device import BiteHealerMetadata, SupportedBiteHealerMetadata
+from .devices import ANY_DEVICE, DeviceSelector
 from .errors import BiteHealerError
 from .format import format_title
+from .heat_it import HeatItDevice
 from .logging import get_logger
 from .prefs import Preferences
 
+FOLLOW_IDLE_TIMEOUT = 30.0
+"""Time in seconds after which following a bite healer stops if its
+status doesn’t change."""
+
 logger = get_logger(__name__)
 
 
-def start_with_preferences(preferences: Preferences) -> None:
+@dataclass(frozen=True)
+class StartResult:
+    """Outcome of activating a single bite healer."""
+
+    bite_healer: SupportedBiteHealerMetadata
+    """The bite healer that was to be activated."""
+
+    error: Optional[Exception] = None
+    """The error that prevented activation, if any."""
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the bite healer was activated successfully."""
+        return self.error is None
+
+
+def start_with_preferences(
+    preferences: Preferences,
+    follow: bool = False,
+    selector: DeviceSelector = ANY_DEVICE,
+) -> None:
     """Activates (i.e. heats up) a connected USB bite healer for demonstration purposes.
 
+    Stops searching as soon as a supported bite healer is found.
+
     :param preferences:
         how the user wants the device to be configured.
+
+    :param follow:
+        whether to keep polling the bite healer after activation and
+        log each status change.
+
+    :param selector:
+        criteria that the bite healer must meet.
     """
-    logger.warning('This app is only a tech demo')
-    logger.warning('and NOT for medical use.')
-    logger.warning('The app is NOT SAFE to use')
-    logger.warning('for treating insect bites.')
+    _log_disclaimer()
 
     logger.info('Searching for bite healer')
 
-    if not (candidates := list(devices.find_bite_healers())):
-        raise BiteHealerError('No bite healer connected')
+    candidate = _first_supported_candidate(selector)
+    assert candidate.supported is True
+
+    logger.info('Using bite healer: %s', format_title(candidate))
+    logger.info('Using settings: %s', preferences)
+
+    _activate(candidate, preferences, follow=follow)
+
+
+def start_all_with_preferences(
+    preferences: Preferences,
+    max_workers: Optional[int] = None,
+    selector: DeviceSelector = ANY_DEVICE,
+) -> list[StartResult]:
+    """Activates (i.e. heats up) all connected USB bite healers
+    concurrently for demonstration purposes.
+
+    Each bite healer is self-tested and activated on a worker thread of
+    its own, so the total time is roughly that of the slowest device.
+    An error on one bite healer doesn’t affect the others.
+
+    :param preferences:
+        how the user wants the devices to be configured.
+
+    :param max_workers:
+        the maximum number of bite healers to activate at the same time.
+        Defaults to the number of supported bite healers.
+
+    :param selector:
+        criteria that the bite healers must meet.
+
+    :return:
+        one result for each supported bite healer, in discovery order.
+    """
+    _log_disclaimer()
+
+    logger.info('Searching for bite healers')
+    candidates = _supported_candidates(selector)
+
+    logger.info('Using %d bite healer(s)', len(candidates))
+    logger.info('Using settings: %s', preferences)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers or len(candidates)
+    ) as executor:
+        # Each worker runs in a copy of the caller’s context so that
+        # settings overrides and deadlines carry over
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                partial(_start_one, preferences=preferences),
+                candidate,
+            )
+            for candidate in candidates
+        ]
+        return [future.result() for future in futures]
+
+
+def start_via_daemon(
+    preferences: Preferences,
+    socket_path: Path,
+    serial_number: Optional[str] = None,
+) -> None:
+    """Asks a running daemon to activate the bite healer it manages.
+
+    :param preferences:
+        how the user wants the device to be configured.
+
+    :param socket_path:
+        the path of the Unix domain socket on which the daemon listens.
+
+    :param serial_number:
+        the serial number of the bite healer to activate, if the daemon
+        manages more than one.
+    """
+    _log_disclaimer()
+
+    logger.info('Using settings: %s', preferences)
+    response = daemon.send_request(
+        socket_path, daemon.start_request(preferences, serial_number)
+    )
+    logger.info(
+        'Bite healer activated by daemon: %s (S/N: %s)',
+        response['product_name'],
+        response['serial_number'],
+    )
+
+
+def _first_supported_candidate(
+    selector: DeviceSelector,
+) -> SupportedBiteHealerMetadata:
+    first_candidate: Optional[BiteHealerMetadata] = None
+    for candidate in devices.find_bite_healers(selector=selector):
+        if candidate.supported:
+            return cast(SupportedBiteHealerMetadata, candidate)
+        first_candidate = first_candidate or candidate
+    raise _no_supported_candidate(first_candidate, selector)
+
+
+def _supported_candidates(
+    selector: DeviceSelector,
+) -> list[SupportedBiteHealerMetadata]:
+    candidates = list(devices.find_bite_healers(selector=selector))
     supported_candidates: list[SupportedBiteHealerMetadata] = [
         cast(SupportedBiteHealerMetadata, candidate)
         for candidate in candidates
         if candidate.supported
     ]
     if not supported_candidates:
-        raise BiteHealerError(
-            f'Unsupported bite healer: {format_title(candidates[0])}.'
+        raise _no_supported_candidate(
+            candidates[0] if candidates else None, selector
+        )
+    return supported_candidates
+
+
+def _no_supported_candidate(
+    first_candidate: Optional[BiteHealerMetadata],
+    selector: DeviceSelector,
+) -> BiteHealerError:
+    if first_candidate is not None:
+        return BiteHealerError(
+            f'Unsupported bite healer: {format_title(first_candidate)}.'
             + ' Please raise an issue on Itchcraft’s project page.'
         )
-    candidate = supported_candidates[0]
-    assert candidate.supported is True
+    if selector != ANY_DEVICE:
+        return BiteHealerError(f'No bite healer matches {selector}')
+    return BiteHealerError('No bite healer connected')
 
-    logger.info('Using bite healer: %s', format_title(candidate))
-    logger.info('Using settings: %s', preferences)
 
+def _activate(
+    candidate: SupportedBiteHealerMetadata,
+    preferences: Preferences,
+    follow: bool = False,
+) -> None:
     with candidate.connect() as bite_healer:
-        bite_healer.self_test()
-        bite_healer.start_with_preferences(preferences)
+        with deadline(settings.session_timeout()):
+            bite_healer.self_test_and_start(preferences)
+        if follow:
+            _follow(bite_healer)
+
+
+def _follow(bite_healer: object) -> None:
+    if not isinstance(bite_healer, HeatItDevice):
+        raise BiteHealerError(f'Unable to follow {bite_healer}')
+    logger.info('Following status changes (Ctrl+C to stop)')
+    for status in bite_healer.watch(idle_timeout=FOLLOW_IDLE_TIMEOUT):
+        logger.info('Status: %s', status)
+    logger.info(
+        'No status change for %d seconds; stopped following',
+        FOLLOW_IDLE_TIMEOUT,
+    )
+
+
+def _start_one(
+    candidate: SupportedBiteHealerMetadata, preferences: Preferences
+) -> StartResult:
+    try:
+        _activate(candidate, preferences)
+    # One failing bite healer must not keep the others from starting
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        logger.error('%s: %s', format_title(candidate), ex)
+        return StartResult(candidate, ex)
+    return StartResult(candidate)
+
+
+def _log_disclaimer() -> None:
+    logger.warning('This app is only a tech demo')
+    logger.warning('and NOT for medical use.')
+    logger.warning('The app is NOT SAFE to use')
+    logger.warning('for treating insect bites.')
@@ -9,6 +9,7 @@ from typing import (
     Optional,
     overload,
     TYPE_CHECKING,
+    Union,
 )
 
 import usb.backend
@@ -49,6 +50,8 @@ else:
 class Device:
     idVendor: VendorId
     idProduct: ProductId
+    bus: int
+    address: int
     product: Optional[str]
     serial_number: Optional[str]
 
@@ -76,6 +79,15 @@ class Device:
         size_or_buffer: Payload,
         timeout: Optional[int] = ...,
     ) -> int: ...
+    def ctrl_transfer(
+        self,
+        bmRequestType: int,
+        bRequest: int,
+        wValue: int = ...,
+        wIndex: int = ...,
+        data_or_wLength: Optional[Union[int, Payload]] = ...,
+        timeout: Optional[int] = ...,
+    ) -> Union[int, _ArrayOfInts]: ...
     def write(
         self,
         endpoint: 'Endpoint',
@@ -92,4 +104,11 @@ class Interface:
     def __getitem__(self, index: EndpointIndex) -> Endpoint: ...
 
 class USBError(IOError):
-    pass
+    backend_error_code: Optional[int]
+
+    def __init__(
+        self,
+        strerror: str,
+        error_code: Optional[int] = ...,
+        errno: Optional[int] = ...,
+    ) -> None: ...
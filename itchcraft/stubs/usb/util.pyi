@@ -10,12 +10,19 @@ from typing import (
     TypeVar,
 )
 
-from itchcraft.types.usb import EndpointAddress
+import usb.core
+
+from itchcraft.types.usb import EndpointAddress, InterfaceIndex
 
 # endpoint direction
 ENDPOINT_IN: int
 ENDPOINT_OUT: int
 
+# control request type
+CTRL_IN: int
+CTRL_TYPE_STANDARD: int
+CTRL_RECIPIENT_DEVICE: int
+
 D = TypeVar('D')
 
 def endpoint_direction(
@@ -35,3 +42,7 @@ def find_descriptor(
     custom_match: Optional[Callable[[D], bool]] = ...,
     **args: dict[Any, Any],
 ) -> Optional[D]: ...
+def release_interface(
+    device: usb.core.Device, interface: InterfaceIndex
+) -> None: ...
+def dispose_resources(device: usb.core.Device) -> None: ...
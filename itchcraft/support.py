@@ -1,16 +1,24 @@
 """Database of supported bite healers."""
 
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, Mapping
 from contextlib import AbstractContextManager, contextmanager
 from dataclasses import dataclass
-from typing import Callable, NamedTuple, Optional
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, NamedTuple, Optional
 
 import usb.core
 
+from . import settings
 from .backend import UsbBulkTransferDevice
 from .heat_it import HeatItDevice
+from .logging import get_logger
+from .pool import POOL
 from .types import BiteHealer
 
+logger = get_logger(__name__)
+
 
 @dataclass(frozen=True)
 class SupportStatement:
@@ -60,12 +68,29 @@ class VidPid(NamedTuple):
             + f' (VID {self.vid}, PID {self.pid})'
         )
 
+    @classmethod
+    def parse(cls, text: str) -> 'VidPid':
+        """Parses a VID and PID in the `lsusb` notation, e.g.
+        `32f9:fcba`.
+
+        :param text:
+            the VID and PID as hexadecimal numbers, separated by a
+            colon.
+        """
+        vid_text, separator, pid_text = text.partition(':')
+        if not separator:
+            raise ValueError(f'Expected VID:PID, got `{text}`')
+        return cls(vid=int(vid_text, 16), pid=int(pid_text, 16))
+
 
 @contextmanager
 def _heat_it_device(
     usb_device: usb.core.Device,
 ) -> Iterator[HeatItDevice]:
-    yield HeatItDevice(UsbBulkTransferDevice(usb_device))
+    with POOL.checkout(usb_device) as device:
+        if isinstance(device, UsbBulkTransferDevice):
+            device.timeout = settings.transfer_timeout()
+        yield HeatItDevice(device)
 
 
 _UNTESTED = """\
@@ -187,3 +212,146 @@ SUPPORT_STATEMENTS: list[SupportStatement] = [
     ),
 ]
 """Hard-coded database of support statements for various bite healer models."""
+
+
+PROTOCOLS: Mapping[
+    str, Callable[[usb.core.Device], AbstractContextManager[BiteHealer]]
+] = MappingProxyType({'heat-it': _heat_it_device})
+"""Connection suppliers by the protocol name used in support files."""
+
+
+class SupportDatabase:
+    """Support statements, indexed by vendor ID and product ID.
+
+    If several statements share the same VID and PID, the last one wins.
+
+    :param statements:
+        the support statements to index.
+    """
+
+    by_vid: Mapping[int, Mapping[int, SupportStatement]]
+    """Support statements keyed by VID, then by PID."""
+
+    vendor_ids: frozenset[int]
+    """Every VID that appears in the database, for prefiltering
+    enumeration."""
+
+    def __init__(self, statements: Iterable[SupportStatement]) -> None:
+        by_vid: dict[int, dict[int, SupportStatement]] = {}
+        for statement in statements:
+            by_vid.setdefault(statement.vid, {})[statement.pid] = statement
+        self.by_vid = MappingProxyType(
+            {
+                vid: MappingProxyType(by_pid)
+                for vid, by_pid in by_vid.items()
+            }
+        )
+        self.vendor_ids = frozenset(self.by_vid)
+
+    def lookup(self, vid: int, pid: int) -> Optional[SupportStatement]:
+        """Returns the support statement for a device model, if any.
+
+        :param vid:
+            the USB vendor ID of the model.
+
+        :param pid:
+            the USB product ID of the model.
+        """
+        if (by_pid := self.by_vid.get(vid)) is None:
+            return None
+        return by_pid.get(pid)
+
+    def __iter__(self) -> Iterator[SupportStatement]:
+        for by_pid in self.by_vid.values():
+            yield from by_pid.values()
+
+    def __len__(self) -> int:
+        return sum(len(by_pid) for by_pid in self.by_vid.values())
+
+    def udev_rules(self) -> str:
+        """Returns udev rules that give all users access to every
+        supported bite healer in the database."""
+        lines = [
+            '# Generated from Itchcraft’s support database; do not edit.'
+        ]
+        models: Optional[tuple[str, str]] = None
+        for statement in self:
+            if not statement.supported:
+                continue
+            if models != (
+                names := (statement.vendor_name, statement.product_name)
+            ):
+                lines.append(f'# {names[0]} “{names[1]}”')
+                models = names
+            lines.append(
+                'ACTION=="add"'
+                + f', ATTRS{{idVendor}}=="{statement.vid:04x}"'
+                + f', ATTRS{{idProduct}}=="{statement.pid:04x}"'
+                + ', DRIVERS=="usb", MODE="0666"'
+            )
+        return '\n'.join(lines) + '\n'
+
+
+def load_support_statements(path: Path) -> list[SupportStatement]:
+    """Reads support statements from a JSON file.
+
+    The file contains a list of objects with the keys `vid` and `pid`
+    (hexadecimal strings), `vendor_name`, `product_name`, and
+    optionally `supported`, `comment`, and `protocol`. Supported models
+    need a protocol; the only protocol is `heat-it`.
+
+    :param path:
+        the file to read.
+
+    :raise ValueError:
+        if the file is not a valid list of support statements.
+    """
+    with open(path, encoding='utf-8') as file:
+        entries: list[dict[str, Any]] = json.load(file)
+    try:
+        return [_statement_from_json(entry) for entry in entries]
+    except (KeyError, TypeError, AttributeError) as ex:
+        raise ValueError(f'Invalid support statement: {ex}') from ex
+
+
+def _statement_from_json(entry: dict[str, Any]) -> SupportStatement:
+    supported = bool(entry.get('supported', True))
+    if (protocol := entry.get('protocol')) is None and supported:
+        raise ValueError('Supported models need a `protocol`')
+    if protocol is not None and protocol not in PROTOCOLS:
+        raise ValueError(f'Unknown protocol `{protocol}`')
+    return SupportStatement(
+        vid=int(entry['vid'], 16),
+        pid=int(entry['pid'], 16),
+        vendor_name=str(entry['vendor_name']),
+        product_name=str(entry['product_name']),
+        supported=supported,
+        comment=entry.get('comment'),
+        connection_supplier=(
+            None if protocol is None else PROTOCOLS[protocol]
+        ),
+    )
+
+
+def _extra_support_statements() -> list[SupportStatement]:
+    if settings.SUPPORT_FILE is None:
+        return []
+    try:
+        return load_support_statements(settings.SUPPORT_FILE)
+    except (OSError, ValueError) as ex:
+        logger.error(
+            'Ignoring support file %s: %s', settings.SUPPORT_FILE, ex
+        )
+        return []
+
+
+SUPPORT_DATABASE = SupportDatabase(
+    SUPPORT_STATEMENTS + _extra_support_statements()
+)
+"""Support statements for all known models, including those from the
+file named by `ITCHCRAFT_SUPPORT_FILE`."""
+
+
+def print_udev_rules() -> None:
+    """Prints udev rules generated from the support database."""
+    print(SUPPORT_DATABASE.udev_rules(), end='')
@@ -0,0 +1,149 @@
+"""Fast USB device discovery via the Linux sysfs"""
+
+from collections.abc import Collection, Iterator
+from dataclasses import dataclass
+import os
+from pathlib import Path
+from typing import Optional
+
+import usb.core
+
+from .errors import BackendInitializationError
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+_ATTRIBUTES = ('idProduct', 'busnum', 'devnum', 'product', 'serial')
+
+
+@dataclass(frozen=True)
+class SysfsUsbDevice:
+    """A USB device as described by the Linux kernel in sysfs.
+
+    Exposes the same descriptor attributes as a PyUSB device, but
+    obtains them from plain files instead of control transfers.
+    """
+
+    idVendor: int  # pylint: disable=invalid-name
+    """The USB vendor ID."""
+
+    idProduct: int  # pylint: disable=invalid-name
+    """The USB product ID."""
+
+    bus: int
+    """Number of the bus to which the device is attached."""
+
+    address: int
+    """Address of the device on its bus."""
+
+    product: Optional[str]
+    """Product string descriptor, if any."""
+
+    serial_number: Optional[str]
+    """Serial number string descriptor, if any."""
+
+    def resolve(self) -> usb.core.Device:
+        """Looks up the PyUSB device that corresponds to this device.
+
+        :return:
+            a PyUSB device, which can be used to open a connection.
+        """
+        if (
+            device := usb.core.find(
+                custom_match=lambda device: (
+                    device.bus == self.bus
+                    and device.address == self.address
+                ),
+            )
+        ) is None:
+            raise BackendInitializationError(
+                f'Device {self.bus:03d}:{self.address:03d}'
+                + ' is no longer connected',
+            )
+        return device
+
+
+def find_usb_devices(
+    sysfs_root: Path,
+    vendor_ids: Collection[int],
+) -> Optional[list[SysfsUsbDevice]]:
+    """Lists USB devices with one of the given vendor IDs.
+
+    Only the `idVendor` file is read for devices with other vendor IDs.
+
+    :param sysfs_root:
+        the directory in which the kernel lists USB devices, usually
+        `/sys/bus/usb/devices`.
+
+    :param vendor_ids:
+        the vendor IDs to look for.
+
+    :return:
+        a list of matching devices, or None if sysfs is unavailable.
+    """
+    if not sysfs_root.is_dir():
+        return None
+    return list(_iter_usb_devices(sysfs_root, vendor_ids))
+
+
+def read_usb_device(
+    device_dir: str,
+    vendor_ids: Collection[int],
+) -> Optional[SysfsUsbDevice]:
+    """Reads a single USB device from its sysfs directory.
+
+    :param device_dir:
+        the sysfs directory that represents the device.
+
+    :param vendor_ids:
+        the vendor IDs to look for.
+
+    :return:
+        the device, or None if the directory doesn’t represent a USB
+        device with one of the given vendor IDs.
+    """
+    if (vid_text := _read_attribute(device_dir, 'idVendor')) is None:
+        # Interfaces and other non-device entries lack an idVendor
+        return None
+    try:
+        vid = int(vid_text, 16)
+    except ValueError:
+        logger.debug('Malformed idVendor in sysfs entry: %s', device_dir)
+        return None
+    if vid not in vendor_ids:
+        return None
+    attributes = {
+        name: _read_attribute(device_dir, name) for name in _ATTRIBUTES
+    }
+    try:
+        return SysfsUsbDevice(
+            idVendor=vid,
+            idProduct=int(attributes['idProduct'] or '', 16),
+            bus=int(attributes['busnum'] or ''),
+            address=int(attributes['devnum'] or ''),
+            product=attributes['product'],
+            serial_number=attributes['serial'],
+        )
+    except ValueError:
+        logger.debug('Incomplete sysfs entry: %s', device_dir)
+        return None
+
+
+def _iter_usb_devices(
+    sysfs_root: Path,
+    vendor_ids: Collection[int],
+) -> Iterator[SysfsUsbDevice]:
+    with os.scandir(sysfs_root) as entries:
+        device_dirs = sorted(entry.path for entry in entries)
+
+    for device_dir in device_dirs:
+        if (device := read_usb_device(device_dir, vendor_ids)) is not None:
+            yield device
+
+
+def _read_attribute(device_dir: str, name: str) -> Optional[str]:
+    try:
+        text = Path(device_dir, name).read_text(encoding='utf-8')
+    except OSError:
+        return None
+    return text.rstrip('\n')
@@ -27,3 +27,34 @@ class BiteHealer(ABC):
         :param preferences:
             how the user wants the device to be configured.
         """
+
+    def self_test_and_start(self, preferences: Preferences) -> None:
+        """Tests the device, then tells it to start heating up.
+
+        Subclasses may override this to save round trips.
+
+        :param preferences:
+            how the user wants the device to be configured.
+        """
+        self.self_test()
+        self.start_with_preferences(preferences)
+
+
+class AsyncBiteHealer(ABC):
+    """Abstraction for a bite healer that is driven from an asyncio
+    event loop."""
+
+    @abstractmethod
+    async def self_test(self) -> None:
+        """Tests the device to make sure it is online and
+        functional."""
+
+    @abstractmethod
+    async def start_with_preferences(
+        self, preferences: Preferences
+    ) -> None:
+        """Tells the device to start heating up.
+
+        :param preferences:
+            how the user wants the device to be configured.
+        """
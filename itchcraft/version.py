@@ -1,7 +1,7 @@
 """Version number management."""
 
 from contextlib import suppress
-import importlib.metadata
+from pathlib import Path
 from typing import Optional
 
 from .settings import PYPROJECT_TOML
@@ -10,23 +10,62 @@ from .settings import PYPROJECT_TOML
 def version() -> Optional[str]:
     """Attempts to return a version number for this project.
 
-    Checks both `pyproject.toml` in the development tree and the
-    `importlib.metadata` facility for an installed package, with the
-    `pyproject.toml` file taking precedence if it exists.
+    The version number is embedded in the generated `_version` module,
+    so looking it up doesn’t touch the file system. If that module is
+    missing, falls back to the `importlib.metadata` facility for an
+    installed package.
+
+    :return:
+        a version string if one is found, None otherwise.
+    """
+    # pylint: disable=import-outside-toplevel
+    with suppress(ImportError):
+        from ._version import VERSION
+
+        return VERSION
+
+    import importlib.metadata
+
+    with suppress(importlib.metadata.PackageNotFoundError):
+        return importlib.metadata.version(
+            __package__ or __name__.split('.', maxsplit=1)[0])
+
+    return None
+
+
+def pyproject_version(path: Path = PYPROJECT_TOML) -> Optional[str]:
+    """Reads the version number from `pyproject.toml`.
+
+    :param path:
+        the path of the `pyproject.toml` file.
 
     :return:
         a version string if one is found, None otherwise.
     """
     with suppress(FileNotFoundError, StopIteration):
-        with open(PYPROJECT_TOML, encoding='utf-8') as pyproject_toml:
-            # Parse manually due to Debian 11 missing a `tomli` package
+        with open(path, encoding='utf-8') as pyproject_toml:
+            # Parse manually due to Debian 11 missing a `tomli` package
             version_lines = (
                 line for line in pyproject_toml
                 if line.startswith('version '))
             return next(version_lines).split('=')[1].strip("'\"\n ")
+    return None
 
-    with suppress(FileNotFoundError):
-        return importlib.metadata.version(
-            __package__ or __name__.split('.', maxsplit=1)[0])
 
-    return None
+def version_module(version_text: Optional[str]) -> str:
+    """Returns the source code of the `_version` module.
+
+    :param version_text:
+        the version number to embed.
+    """
+    return (
+        '"""Version number of this project, generated from'
+        + ' `pyproject.toml`;\ndo not edit."""\n\n'
+        + f'VERSION = {version_text!r}\n'
+    )
+
+
+def print_version_module() -> None:
+    """Prints the source code of the `_version` module, with the
+    version number from `pyproject.toml`."""
+    print(version_module(pyproject_version()), end='')
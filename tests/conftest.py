@@ -0,0 +1,24 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from itchcraft import api, backend
+from itchcraft.endpoints import EndpointCache
+
+
+@pytest.fixture(name='endpoint_cache', autouse=True)
+def fixture_endpoint_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[EndpointCache]:
+    cache = EndpointCache()
+    monkeypatch.setattr(backend, 'ENDPOINT_CACHE', cache)
+    yield cache
+
+
+@pytest.fixture(name='no_daemon', autouse=True)
+def fixture_no_daemon(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # Keeps tests away from a daemon that the developer may be running
+    monkeypatch.setattr(api, 'DAEMON_SOCKET', tmp_path / 'no-daemon.sock')
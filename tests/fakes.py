@@ -0,0 +1,379 @@
+# pylint: disable=invalid-name, missing-function-docstring, no-self-use, too-many-arguments, too-many-instance-attributes, unused-argument
+
+"""Fake backends and sysfs tree for tests and benchmarks.
+
+The fake PyUSB backend emulates just enough of `usb.backend.IBackend`
+for `usb.core.find` and string descriptor reads to work without any
+hardware.
+"""
+
+import array
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+import errno
+from pathlib import Path
+import time
+from typing import Any, Optional, Union
+
+import usb.backend
+import usb.core
+
+from itchcraft.backend import BulkTransferDevice
+from itchcraft.device import SupportedBiteHealerMetadata, UsbStrings
+from itchcraft.heat_it import HeatItDevice
+from itchcraft.registry import (
+    HotplugAction,
+    HotplugEvent,
+    HotplugEventSource,
+    Location,
+)
+from itchcraft.support import SupportStatement
+from itchcraft.types import BiteHealer, SizedPayload
+
+_DESC_TYPE_STRING = 0x03
+_LANGID_EN_US = 0x0409
+
+
+class FakeBulkTransferDevice(BulkTransferDevice):
+    """Bulk transfer device that records requests and responds with
+    a fixed 12-byte payload.
+
+    :param serial_number:
+        the serial number to report.
+
+    :param responses:
+        responses to return, in order, before falling back to the
+        fixed payload. Exceptions among them are raised instead.
+
+    :param latency:
+        time in seconds that each transfer takes.
+
+    :param error:
+        an exception to raise on every transfer, if any.
+    """
+
+    def __init__(
+        self,
+        serial_number: Optional[str] = None,
+        latency: float = 0.0,
+        error: Optional[Exception] = None,
+        responses: Iterable[Union[bytes, Exception]] = (),
+    ) -> None:
+        self.requests: list[bytes] = []
+        self.discards = 0
+        self._serial_number = serial_number
+        self._responses = iter(responses)
+        self._latency = latency
+        self._error = error
+
+    def bulk_transfer(self, request: SizedPayload) -> bytes:
+        self.requests.append(bytes(request))
+        if self._latency:
+            time.sleep(self._latency)
+        if self._error is not None:
+            raise self._error
+        if isinstance(
+            response := next(self._responses, b'123456789012'), Exception
+        ):
+            raise response
+        return response
+
+    def discard_pending(self) -> None:
+        self.discards += 1
+
+    @property
+    def product_name(self) -> Optional[str]:
+        return 'fake'
+
+    @property
+    def serial_number(self) -> Optional[str]:
+        return self._serial_number
+
+
+@dataclass
+class FakeEndpoint:
+    """Endpoint descriptor of a fake PyUSB device."""
+
+    bEndpointAddress: int
+
+
+@dataclass
+class FakeInterface:
+    """Interface descriptor of a fake PyUSB device."""
+
+    index: int = 0
+    endpoints: tuple[FakeEndpoint, ...] = (
+        FakeEndpoint(0x01),
+        FakeEndpoint(0x81),
+    )
+
+    def __iter__(self) -> Iterator[FakeEndpoint]:
+        return iter(self.endpoints)
+
+    def __getitem__(self, index: int) -> FakeEndpoint:
+        return self.endpoints[index]
+
+
+class FakePyUsbDevice:
+    """Stand-in for `usb.core.Device` with one bulk OUT and one bulk
+    IN endpoint, which echoes each request back as the response, in
+    the order the requests were written.
+
+    Every payload passed to `write` is recorded in `written`, as is.
+    The timeout of every `write` and `read` is recorded in `timeouts`.
+    Control requests fail once `detached` is set.
+    """
+
+    idVendor = 0xF055
+    idProduct = 0x17C4
+    product = 'fake'
+    serial_number: Optional[str] = None
+
+    def __init__(self, interface: Optional[FakeInterface] = None) -> None:
+        self.written: list[Any] = []
+        self.timeouts: list[Optional[int]] = []
+        self.reads = 0
+        self.detached = False
+        self._interface = interface or FakeInterface()
+
+    def get_active_configuration(self) -> dict[Any, FakeInterface]:
+        return {(0, 0): self._interface}
+
+    def is_kernel_driver_active(self, interface: int) -> bool:
+        return False
+
+    def ctrl_transfer(
+        self,
+        bmRequestType: int,
+        bRequest: int,
+        wValue: int = 0,
+        wIndex: int = 0,
+        data_or_wLength: Any = None,
+        timeout: Optional[int] = None,
+    ) -> Any:
+        if self.detached:
+            raise usb.core.USBError('No such device', errno=errno.ENODEV)
+        return array.array('B', [0, 0])
+
+    def write(
+        self,
+        endpoint: FakeEndpoint,
+        data: Any,
+        timeout: Optional[int] = None,
+    ) -> int:
+        self.written.append(data)
+        self.timeouts.append(timeout)
+        return len(data)
+
+    def read(
+        self,
+        endpoint: FakeEndpoint,
+        buffer: Any,
+        timeout: Optional[int] = None,
+    ) -> int:
+        self.timeouts.append(timeout)
+        if self.reads == len(self.written):
+            raise usb.core.USBError(
+                'Operation timed out', errno=errno.ETIMEDOUT
+            )
+        response = bytes(self.written[self.reads])
+        self.reads += 1
+        buffer[: len(response)] = array.array('B', response)
+        return len(response)
+
+
+def fake_bite_healer(
+    device: BulkTransferDevice,
+    connection_error: Optional[Exception] = None,
+) -> SupportedBiteHealerMetadata:
+    """Returns metadata for a supported heat-it bite healer that is
+    backed by the given bulk transfer device.
+
+    :param device:
+        the bulk transfer device to delegate to.
+
+    :param connection_error:
+        an exception to raise when connecting, if any.
+    """
+    bite_healer = HeatItDevice(device)
+
+    def connect() -> AbstractContextManager[BiteHealer]:
+        if connection_error is not None:
+            raise connection_error
+        return nullcontext(bite_healer)
+
+    return SupportedBiteHealerMetadata(
+        usb_strings=UsbStrings.known(
+            device.product_name, device.serial_number
+        ),
+        connection_supplier=connect,
+        support_statement=SupportStatement(
+            vid=0xF055,
+            pid=0x17C4,
+            vendor_name='ACME',
+            product_name='dummy',
+            connection_supplier=lambda _: connect(),
+        ),
+    )
+
+
+@dataclass
+class FakeUsbDevice:
+    """Device descriptor of a fake USB device."""
+
+    idVendor: int
+    idProduct: int
+    product: Optional[str] = None
+    serial_number: Optional[str] = None
+    bus: int = 1
+    address: int = 1
+    bLength: int = 18
+    bDescriptorType: int = 1
+    bcdUSB: int = 0x0200
+    bDeviceClass: int = 0
+    bDeviceSubClass: int = 0
+    bDeviceProtocol: int = 0
+    bMaxPacketSize0: int = 64
+    bcdDevice: int = 0x0100
+    iManufacturer: int = 0
+    iProduct: int = 1
+    iSerialNumber: int = 2
+    bNumConfigurations: int = 1
+    port_number: Optional[int] = None
+    port_numbers: Optional[tuple[int, ...]] = None
+    speed: Optional[int] = None
+
+
+@dataclass
+class FakeUsbBackend(usb.backend.IBackend):
+    """PyUSB backend that serves a fixed list of fake devices.
+
+    :param devices:
+        the devices to be enumerated.
+
+    :param string_latency:
+        time in seconds that each string descriptor read takes.
+    """
+
+    devices: list[FakeUsbDevice]
+    string_latency: float = 0.0
+    enumerations: int = field(default=0, init=False)
+    string_reads: int = field(default=0, init=False)
+
+    def enumerate_devices(self) -> Iterator[FakeUsbDevice]:
+        self.enumerations += 1
+        return iter(self.devices)
+
+    def get_device_descriptor(self, dev: FakeUsbDevice) -> FakeUsbDevice:
+        return dev
+
+    def open_device(self, dev: FakeUsbDevice) -> FakeUsbDevice:
+        return dev
+
+    def close_device(self, dev_handle: FakeUsbDevice) -> None:
+        pass
+
+    def ctrl_transfer(
+        self,
+        dev_handle: FakeUsbDevice,
+        bmRequestType: int,
+        bRequest: int,
+        wValue: int,
+        wIndex: int,
+        data: Any,
+        timeout: int,
+    ) -> int:
+        assert wValue >> 8 == _DESC_TYPE_STRING
+        self.string_reads += 1
+        if self.string_latency:
+            time.sleep(self.string_latency)
+        if (index := wValue & 0xFF) == 0:
+            payload = _LANGID_EN_US.to_bytes(2, 'little')
+        else:
+            text = {
+                dev_handle.iProduct: dev_handle.product,
+                dev_handle.iSerialNumber: dev_handle.serial_number,
+            }.get(index)
+            payload = (text or '').encode('utf-16-le')
+        descriptor = bytes([len(payload) + 2, _DESC_TYPE_STRING]) + payload
+        data[: len(descriptor)] = array.array(data.typecode, descriptor)
+        return len(descriptor)
+
+
+def fake_bus(
+    size: int,
+    healers: Iterable[FakeUsbDevice] = (),
+) -> list[FakeUsbDevice]:
+    """Returns a list of fake devices that contains the given bite
+    healers, padded with unrelated devices up to the given bus size.
+    """
+    devices = list(healers)
+    devices += [
+        FakeUsbDevice(
+            idVendor=0x1D6B,
+            idProduct=0x0002,
+            product='Unrelated device',
+            address=address,
+        )
+        for address in range(len(devices) + 1, size + 1)
+    ]
+    return devices
+
+
+def write_sysfs_device(
+    sysfs_root: Path,
+    name: str,
+    vid: int,
+    pid: int,
+    product: Optional[str] = None,
+    serial_number: Optional[str] = None,
+    bus: int = 1,
+    address: int = 1,
+) -> None:
+    """Creates a device directory in a fake sysfs tree."""
+    (device_dir := sysfs_root / name).mkdir(parents=True)
+    attributes = {
+        'idVendor': f'{vid:04x}',
+        'idProduct': f'{pid:04x}',
+        'busnum': str(bus),
+        'devnum': str(address),
+        'product': product,
+        'serial': serial_number,
+    }
+    for attribute, value in attributes.items():
+        if value is not None:
+            (device_dir / attribute).write_text(f'{value}\n')
+
+
+class FakeEventSource(HotplugEventSource):
+    """Hotplug event source whose events are appended to `pending` by
+    the test."""
+
+    def __init__(self) -> None:
+        self.pending: list[HotplugEvent] = []
+
+    def receive(self) -> list[HotplugEvent]:
+        events, self.pending = self.pending, []
+        return events
+
+
+def hotplug_event(
+    action: HotplugAction, name: str, address: int
+) -> HotplugEvent:
+    """Returns an event for a device on bus 1.
+
+    :param action:
+        whether the device was attached or detached.
+
+    :param name:
+        the name of the device directory in sysfs.
+
+    :param address:
+        the address of the device on bus 1.
+    """
+    return HotplugEvent(
+        action=action,
+        devpath=f'/devices/pci0000:00/0000:00:14.0/usb1/{name}',
+        location=Location(bus=1, address=address),
+    )
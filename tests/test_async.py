@@ -0,0 +1,104 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from itchcraft.backend import ThreadedAsyncBulkTransferDevice
+from itchcraft.heat_it import AsyncHeatItDevice, GET_STATUS
+from itchcraft.prefs import Duration, Preferences
+from itchcraft.types import SizedPayload
+
+from .fakes import FakeBulkTransferDevice
+
+_LATENCY = 0.05
+
+
+def test_self_test_and_start() -> None:
+    fake_device = FakeBulkTransferDevice()
+    bite_healer = AsyncHeatItDevice(
+        ThreadedAsyncBulkTransferDevice(fake_device)
+    )
+
+    async def run() -> None:
+        await bite_healer.self_test()
+        await bite_healer.start_with_preferences(
+            Preferences(duration=Duration.LONG)
+        )
+
+    asyncio.run(run())
+    assert fake_device.requests == [
+        b'\xff\xb0',
+        b'\xff\x02\x02',
+        b'\xff\x08\x00\x02\x0a',
+    ]
+
+
+def test_one_loop_drives_many_devices() -> None:
+    bite_healers = [
+        AsyncHeatItDevice(
+            ThreadedAsyncBulkTransferDevice(
+                FakeBulkTransferDevice(latency=_LATENCY)
+            )
+        )
+        for _ in range(4)
+    ]
+
+    async def run() -> None:
+        await asyncio.gather(
+            *(bite_healer.self_test() for bite_healer in bite_healers)
+        )
+
+    start_time = time.perf_counter()
+    asyncio.run(run())
+    assert time.perf_counter() - start_time < 2 * _LATENCY * 4
+
+
+def test_cancellation() -> None:
+    bite_healer = AsyncHeatItDevice(
+        ThreadedAsyncBulkTransferDevice(
+            FakeBulkTransferDevice(latency=_LATENCY)
+        )
+    )
+
+    async def run() -> None:
+        await asyncio.wait_for(bite_healer.self_test(), _LATENCY / 2)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+
+
+class _OverlapDetectingDevice(FakeBulkTransferDevice):
+    def __init__(self) -> None:
+        super().__init__(latency=_LATENCY)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._counter_lock = threading.Lock()
+
+    def bulk_transfer(self, request: SizedPayload) -> bytes:
+        with self._counter_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return super().bulk_transfer(request)
+        finally:
+            with self._counter_lock:
+                self.in_flight -= 1
+
+
+def test_cancellation_keeps_transfers_serialized() -> None:
+    fake_device = _OverlapDetectingDevice()
+    device = ThreadedAsyncBulkTransferDevice(fake_device)
+
+    async def run() -> None:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                device.bulk_transfer(GET_STATUS), _LATENCY / 2
+            )
+        await device.bulk_transfer(GET_STATUS)
+
+    asyncio.run(run())
+    assert fake_device.max_in_flight == 1
+    assert len(fake_device.requests) == 2
@@ -0,0 +1,96 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+import array
+from typing import cast
+
+import pytest_mock
+import usb.core
+
+from itchcraft.backend import UsbBulkTransferDevice
+from itchcraft.heat_it import GET_STATUS
+
+from .fakes import FakeBulkTransferDevice, FakePyUsbDevice
+
+
+def _connect(device: FakePyUsbDevice) -> UsbBulkTransferDevice:
+    return UsbBulkTransferDevice(cast(usb.core.Device, device))
+
+
+def test_bulk_transfer_returns_bytes() -> None:
+    backend = _connect(FakePyUsbDevice())
+    assert backend.bulk_transfer([0xFF, 0xB0]) == b'\xff\xb0'
+    assert backend.bulk_transfer(GET_STATUS) == b'\xff\x02\x02'
+
+
+def test_bulk_transfer_into() -> None:
+    backend = _connect(FakePyUsbDevice())
+    out = memoryview(bytearray(UsbBulkTransferDevice.MAX_RESPONSE_LENGTH))
+    assert backend.bulk_transfer_into(GET_STATUS, out) == 3
+    assert out[:3].tobytes() == b'\xff\x02\x02'
+
+
+def test_bulk_transfer_into_reads_into_byte_array(
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    device = FakePyUsbDevice()
+    read = mocker.spy(device, 'read')
+    backend = _connect(device)
+    buffer = array.array(
+        'B', bytes(UsbBulkTransferDevice.MAX_RESPONSE_LENGTH)
+    )
+    assert backend.bulk_transfer_into(GET_STATUS, memoryview(buffer)) == 3
+    assert read.call_args.args[1] is buffer
+    assert buffer[:3].tobytes() == b'\xff\x02\x02'
+
+
+def test_bytes_requests_are_encoded_once() -> None:
+    device = FakePyUsbDevice()
+    backend = _connect(device)
+    for _ in range(3):
+        backend.bulk_transfer(GET_STATUS)
+    first, *rest = device.written
+    assert all(payload is first for payload in rest)
+
+
+def test_default_bulk_transfer_into() -> None:
+    out = memoryview(bytearray(16))
+    assert FakeBulkTransferDevice().bulk_transfer_into(b'\x01', out) == 12
+    assert out[:12].tobytes() == b'123456789012'
+
+
+def test_transact_many_writes_before_reading() -> None:
+    device = FakePyUsbDevice()
+    backend = _connect(device)
+    requests = [b'\xff\xb0', GET_STATUS, b'\xff\x01']
+    assert backend.transact_many(requests) == [
+        b'\xff\xb0',
+        b'\xff\x02\x02',
+        b'\xff\x01',
+    ]
+    assert len(device.written) == 3
+    assert device.reads == 3
+
+
+def test_default_transact_many() -> None:
+    device = FakeBulkTransferDevice()
+    assert device.transact_many([b'\x01', b'\x02']) == [
+        b'123456789012'
+    ] * 2
+    assert device.requests == [b'\x01', b'\x02']
+
+
+def test_discard_pending_reads_queued_responses() -> None:
+    device = FakePyUsbDevice()
+    backend = _connect(device)
+    device.written.extend((b'\xff\xb0', GET_STATUS))
+    backend.discard_pending()
+    assert device.reads == 2
+    assert backend.bulk_transfer(GET_STATUS) == b'\xff\x02\x02'
+
+
+def test_is_alive() -> None:
+    device = FakePyUsbDevice()
+    backend = _connect(device)
+    assert backend.is_alive()
+    device.detached = True
+    assert not backend.is_alive()
@@ -0,0 +1,66 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring
+
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.startup import import_times
+from itchcraft import cli, version
+from itchcraft.settings import PACKAGE_ROOT
+
+_FIRE = 'fire'
+
+
+def test_version(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        cli.run('--version')
+    assert excinfo.value.code == 0
+    assert capsys.readouterr().out.startswith('Itchcraft')
+
+
+def test_version_module_is_up_to_date() -> None:
+    assert (PACKAGE_ROOT / '_version.py').read_text(
+        encoding='utf-8'
+    ) == version.version_module(version.pyproject_version())
+    assert version.version() == version.pyproject_version()
+
+
+def test_version_skips_heavy_imports() -> None:
+    modules = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            'import sys\n'
+            + 'from itchcraft import cli\n'
+            + 'try:\n'
+            + "    cli.run('--version')\n"
+            + 'finally:\n'
+            + '    print(*sys.modules, file=sys.stderr)\n',
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr.split()
+    assert not {'usb', 'tenacity', 'fire', 'importlib.metadata'} & set(
+        modules
+    )
+
+
+def _import_times(*args: str, use_fire: bool) -> dict[str, int]:
+    return import_times(
+        *args,
+        env={
+            'ITCHCRAFT_BACKEND': 'sim',
+            'ITCHCRAFT_USE_FIRE': '1' if use_fire else '',
+        },
+    )
+
+
+def test_dispatcher_imports_less_than_fire() -> None:
+    dispatcher = _import_times('info', '--format=json', use_fire=False)
+    fire = _import_times('info', '--format=json', use_fire=True)
+    assert _FIRE not in dispatcher
+    assert _FIRE in fire
+    # Import times are too noisy to compare, so compare modules instead
+    assert dispatcher.keys() < fire.keys()
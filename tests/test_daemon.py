@@ -0,0 +1,278 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from dataclasses import replace
+import json
+from pathlib import Path
+import shutil
+import socket
+import stat
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from itchcraft import api, daemon as daemon_module, registry, start
+from itchcraft.daemon import Daemon, send_request
+from itchcraft.device import BiteHealerMetadata
+from itchcraft.errors import (
+    BackendInitializationError,
+    BiteHealerError,
+    DaemonUnavailableError,
+)
+from itchcraft.registry import DeviceRegistry, HotplugAction
+from itchcraft.sysfs import SysfsUsbDevice
+from itchcraft.types import BiteHealer
+
+from .fakes import (
+    fake_bite_healer,
+    FakeBulkTransferDevice,
+    FakeEventSource,
+    hotplug_event,
+    write_sysfs_device,
+)
+
+_SELF_TEST = [b'\xff\xb0', b'\xff\x02\x02']
+_START_DEFAULT = b'\xff\x08\x00\x00\x08'
+_LATENCY = 0.05
+
+
+@pytest.fixture(name='fake_device')
+def fixture_fake_device() -> FakeBulkTransferDevice:
+    return FakeBulkTransferDevice(serial_number='0815')
+
+
+@pytest.fixture(name='socket_path')
+def fixture_socket_path(
+    fake_device: FakeBulkTransferDevice,
+    tmp_path: Path,
+) -> Iterator[Path]:
+    metadata = fake_bite_healer(fake_device)
+    with Daemon(
+        tmp_path / 'run' / 'itchcraft.sock', lambda: [metadata]
+    ) as daemon:
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        yield daemon.socket_path
+        daemon.shutdown()
+        thread.join()
+    assert not daemon.socket_path.exists()
+
+
+def test_status(socket_path: Path) -> None:
+    response = send_request(socket_path, {'command': 'status'})
+    assert response['bite_healers'] == [
+        {
+            'vendor_name': 'ACME',
+            'product_name': 'dummy',
+            'usb_product_name': 'fake',
+            'serial_number': '0815',
+        }
+    ]
+
+
+def test_start_reuses_connection(
+    fake_device: FakeBulkTransferDevice,
+    socket_path: Path,
+) -> None:
+    for _ in range(2):
+        send_request(socket_path, {'command': 'start'})
+    assert fake_device.requests == [
+        *_SELF_TEST,
+        _START_DEFAULT,
+        _START_DEFAULT,
+    ]
+
+
+def test_start_invalid_preferences(socket_path: Path) -> None:
+    with pytest.raises(BiteHealerError):
+        send_request(socket_path, {'command': 'start', 'duration': 'x'})
+
+
+def test_api_start_uses_daemon(
+    fake_device: FakeBulkTransferDevice,
+    monkeypatch: pytest.MonkeyPatch,
+    socket_path: Path,
+) -> None:
+    monkeypatch.setattr(api, 'DAEMON_SOCKET', socket_path)
+    api.Api().start(duration='long')
+    assert fake_device.requests[-1] == b'\xff\x08\x00\x02\x0a'
+
+
+@pytest.mark.parametrize(
+    'overrides',
+    [{'backend': 'sim'}, {'transfer_timeout': 2}, {'session_timeout': 20}],
+)
+def test_api_start_bypasses_daemon_with_overrides(
+    fake_device: FakeBulkTransferDevice,
+    monkeypatch: pytest.MonkeyPatch,
+    socket_path: Path,
+    overrides: dict[str, Any],
+) -> None:
+    monkeypatch.setattr(api, 'DAEMON_SOCKET', socket_path)
+    started: list[object] = []
+    monkeypatch.setattr(
+        start,
+        'start_with_preferences',
+        lambda *args, **_: started.extend(args),
+    )
+    api.Api(**overrides).start(duration='long')
+    assert fake_device.requests == _SELF_TEST
+    assert len(started) == 1
+
+
+def test_hotplug(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def from_usb_device(
+        device: SysfsUsbDevice, _support_statement: object
+    ) -> BiteHealerMetadata:
+        return fake_bite_healer(
+            FakeBulkTransferDevice(serial_number=device.serial_number)
+        )
+
+    def serial_numbers() -> list[str]:
+        response = daemon.handle({'command': 'status'})
+        return [
+            bite_healer['serial_number']
+            for bite_healer in response['bite_healers']
+        ]
+
+    monkeypatch.setattr(registry, 'from_usb_device', from_usb_device)
+    sysfs_root = tmp_path / 'sysfs'
+    write_sysfs_device(
+        sysfs_root, '1-1', 0x32F9, 0xFCBA, serial_number='0815', address=2
+    )
+    event_source = FakeEventSource()
+    with Daemon(
+        tmp_path / 'run' / 'itchcraft.sock',
+        registry=DeviceRegistry(event_source, sysfs_root),
+    ) as daemon:
+        assert serial_numbers() == ['0815']
+
+        write_sysfs_device(
+            sysfs_root,
+            '1-2',
+            0x32F9,
+            0xFCBA,
+            serial_number='4711',
+            address=3,
+        )
+        shutil.rmtree(sysfs_root / '1-1')
+        event_source.pending += [
+            hotplug_event(HotplugAction.ADD, '1-2', address=3),
+            hotplug_event(HotplugAction.REMOVE, '1-1', address=2),
+        ]
+        daemon.refresh()
+        assert serial_numbers() == ['4711']
+
+
+def test_failed_connection_is_retried(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    attempts: list[None] = []
+
+    def from_usb_device(
+        device: SysfsUsbDevice, _support_statement: object
+    ) -> BiteHealerMetadata:
+        def connect() -> AbstractContextManager[BiteHealer]:
+            attempts.append(None)
+            if len(attempts) == 1:
+                raise BackendInitializationError('Access denied')
+            return metadata.connect()
+
+        metadata = fake_bite_healer(
+            FakeBulkTransferDevice(serial_number=device.serial_number)
+        )
+        return replace(metadata, connection_supplier=connect)
+
+    monkeypatch.setattr(registry, 'from_usb_device', from_usb_device)
+    monkeypatch.setattr(daemon_module, 'RECONNECT_DELAY', _LATENCY)
+    sysfs_root = tmp_path / 'sysfs'
+    write_sysfs_device(sysfs_root, '1-1', 0x32F9, 0xFCBA, serial_number='0815')
+    with Daemon(
+        tmp_path / 'run' / 'itchcraft.sock',
+        registry=DeviceRegistry(FakeEventSource(), sysfs_root),
+    ) as daemon:
+        daemon.refresh()
+        assert len(attempts) == 1
+        assert not daemon.handle({'command': 'status'})['bite_healers']
+        time.sleep(_LATENCY)
+        daemon.refresh()
+        assert len(attempts) == 2
+        assert daemon.handle({'command': 'status'})['bite_healers']
+
+
+def test_socket_is_private(tmp_path: Path) -> None:
+    metadata = fake_bite_healer(FakeBulkTransferDevice())
+    socket_path = tmp_path / 'private' / 'itchcraft.sock'
+    with Daemon(socket_path, lambda: [metadata]):
+        assert stat.S_IMODE(socket_path.parent.stat().st_mode) == 0o700
+        assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+
+
+def test_unexpected_errors_are_reported(tmp_path: Path) -> None:
+    fake_device = FakeBulkTransferDevice(
+        responses=[
+            b'\xff\xb0'.ljust(12, b'\0'),
+            b'\xff\x02'.ljust(12, b'\0'),
+            RuntimeError('Scripted failure'),
+        ]
+    )
+    metadata = fake_bite_healer(fake_device)
+    socket_path = tmp_path / 'run' / 'itchcraft.sock'
+    with Daemon(socket_path, lambda: [metadata]) as daemon:
+        assert daemon.handle({'command': 'start'}) == {
+            'error': 'Scripted failure'
+        }
+
+
+@pytest.mark.parametrize('request_', [[], 'status', 5, None])
+def test_non_object_requests_are_rejected(
+    socket_path: Path, request_: object
+) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request_).encode() + b'\n')
+        response = json.loads(client.makefile('rb').readline())
+    assert 'expected a JSON object' in response['error']
+
+
+@pytest.mark.parametrize('mode', [0o755, 0o770])
+def test_shared_directory_is_refused(tmp_path: Path, mode: int) -> None:
+    metadata = fake_bite_healer(FakeBulkTransferDevice())
+    (directory := tmp_path / 'shared').mkdir()
+    directory.chmod(mode)
+    with pytest.raises(BiteHealerError, match='mode 0700'):
+        with Daemon(directory / 'itchcraft.sock', lambda: [metadata]):
+            pass
+    assert not (directory / 'itchcraft.sock').exists()
+
+
+@pytest.fixture(name='mute_server')
+def fixture_mute_server(tmp_path: Path) -> Iterator[socket.socket]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(tmp_path / 'itchcraft.sock'))
+        server.listen()
+        yield server
+
+
+def test_daemon_times_out(mute_server: socket.socket) -> None:
+    with pytest.raises(DaemonUnavailableError):
+        send_request(
+            Path(mute_server.getsockname()),
+            {'command': 'status'},
+            timeout=0.1,
+        )
+
+
+def test_daemon_hangs_up(mute_server: socket.socket) -> None:
+    def hang_up() -> None:
+        connection, _ = mute_server.accept()
+        connection.close()
+
+    thread = threading.Thread(target=hang_up)
+    thread.start()
+    with pytest.raises(DaemonUnavailableError):
+        send_request(Path(mute_server.getsockname()), {'command': 'status'})
+    thread.join()
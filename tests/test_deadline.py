@@ -0,0 +1,121 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+import asyncio
+import errno
+import os
+import subprocess
+import sys
+from typing import cast
+
+import pytest
+import usb.core
+
+from itchcraft import deadline, settings
+from itchcraft.backend import (
+    ThreadedAsyncBulkTransferDevice,
+    UsbBulkTransferDevice,
+)
+from itchcraft.errors import CliError, DeadlineExceededError
+from itchcraft.heat_it import GET_STATUS, HeatItDevice
+from itchcraft.retry import RetryPolicy
+
+from .fakes import FakeBulkTransferDevice, FakePyUsbDevice
+
+
+def test_no_deadline() -> None:
+    assert deadline.remaining() is None
+    assert deadline.timeout(1.5) == 1.5
+    assert deadline.timeout(None) is None
+
+
+def test_nested_deadlines_only_shorten() -> None:
+    with deadline.deadline(1.0):
+        with deadline.deadline(100.0):
+            remaining = deadline.remaining()
+            assert remaining is not None and remaining <= 1.0
+        with deadline.deadline(None):
+            assert deadline.remaining() is not None
+        assert deadline.timeout(0.25) == 0.25
+    assert deadline.remaining() is None
+
+
+def test_expired_deadline() -> None:
+    with deadline.deadline(0):
+        assert deadline.expired()
+        with pytest.raises(DeadlineExceededError):
+            deadline.timeout(1.0)
+
+
+def test_transfer_timeout() -> None:
+    device = FakePyUsbDevice()
+    backend = UsbBulkTransferDevice(
+        cast(usb.core.Device, device), timeout=2.0
+    )
+    backend.bulk_transfer(GET_STATUS)
+    with deadline.deadline(0.5):
+        backend.bulk_transfer(GET_STATUS)
+    assert device.timeouts[:2] == [2000, 2000]
+    assert all(
+        timeout is not None and 0 < timeout <= 500
+        for timeout in device.timeouts[2:]
+    )
+
+
+def test_transfer_past_deadline() -> None:
+    device = FakePyUsbDevice()
+    backend = UsbBulkTransferDevice(cast(usb.core.Device, device))
+    with deadline.deadline(0), pytest.raises(DeadlineExceededError):
+        backend.bulk_transfer(GET_STATUS)
+    assert not device.written
+
+
+def test_retries_stop_at_deadline() -> None:
+    fake_device = FakeBulkTransferDevice(
+        error=usb.core.USBError('Timeout', errno=errno.ETIMEDOUT),
+        latency=0.02,
+    )
+    bite_healer = HeatItDevice(fake_device, RetryPolicy(initial_wait=0))
+    with deadline.deadline(0.05), pytest.raises(usb.core.USBError):
+        bite_healer.self_test()
+    assert len(fake_device.requests) < 5
+
+
+def test_deadline_reaches_executor() -> None:
+    remaining_in_worker: list[object] = []
+
+    class _Probe(FakeBulkTransferDevice):
+        def bulk_transfer(self, request: object) -> bytes:
+            remaining_in_worker.append(deadline.remaining())
+            return b'123456789012'
+
+    async def run() -> None:
+        with deadline.deadline(10.0):
+            await ThreadedAsyncBulkTransferDevice(_Probe()).bulk_transfer(
+                GET_STATUS
+            )
+
+    asyncio.run(run())
+    assert remaining_in_worker != [None]
+
+
+def test_session_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'sessionTimeout', '2.5')
+    assert settings.session_timeout() == 2.5
+
+
+@pytest.mark.parametrize('text', ['soon', '0', '-1', 'nan'])
+def test_invalid_session_timeout(
+    monkeypatch: pytest.MonkeyPatch, text: str
+) -> None:
+    monkeypatch.setattr(settings, 'sessionTimeout', text)
+    with pytest.raises(CliError, match='ITCHCRAFT_SESSION_TIMEOUT'):
+        settings.session_timeout()
+
+
+def test_invalid_timeouts_are_ignored_until_used() -> None:
+    subprocess.run(
+        [sys.executable, '-m', 'itchcraft', '--version'],
+        check=True,
+        capture_output=True,
+        env={**os.environ, 'ITCHCRAFT_TRANSFER_TIMEOUT': 'soon'},
+    )
@@ -0,0 +1,204 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from pathlib import Path
+
+import pytest
+import pytest_mock
+
+from itchcraft import device, devices, settings
+from itchcraft.devices import DeviceSelector
+from itchcraft.device import (
+    prefetch_usb_strings,
+    SupportedBiteHealerMetadata,
+)
+from itchcraft.support import VidPid
+
+from .fakes import (
+    fake_bus,
+    FakeUsbBackend,
+    FakeUsbDevice,
+    write_sysfs_device,
+)
+
+
+def test_find_bite_healers_skips_unrelated_devices() -> None:
+    backend = FakeUsbBackend(
+        fake_bus(
+            size=50,
+            healers=[
+                FakeUsbDevice(
+                    idVendor=0x32F9,
+                    idProduct=0xFCBA,
+                    product='heat it',
+                    serial_number='0815',
+                ),
+            ],
+        )
+    )
+    (bite_healer,) = devices.find_bite_healers(backend=backend)
+    assert isinstance(bite_healer, SupportedBiteHealerMetadata)
+    assert bite_healer.usb_product_name == 'heat it'
+    assert bite_healer.serial_number == '0815'
+    assert backend.string_reads == 3
+
+
+def test_find_bite_healers_empty_bus() -> None:
+    backend = FakeUsbBackend(fake_bus(size=10))
+    assert not list(devices.find_bite_healers(backend=backend))
+
+
+def test_sysfs_discovery_skips_usb_scan(
+    mocker: pytest_mock.MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    write_sysfs_device(tmp_path, 'usb1', vid=0x1D6B, pid=0x0002)
+    write_sysfs_device(
+        tmp_path, '1-1', vid=0x32F9, pid=0xFCBA, product='heat it'
+    )
+    monkeypatch.setattr(devices, 'SYSFS_USB_DEVICES', tmp_path)
+    find = mocker.patch('usb.core.find')
+    (bite_healer,) = devices.find_bite_healers()
+    assert bite_healer.supported
+    assert bite_healer.usb_product_name == 'heat it'
+    find.assert_not_called()
+
+
+def test_pyusb_fallback_without_sysfs(
+    mocker: pytest_mock.MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(devices, 'SYSFS_USB_DEVICES', tmp_path / 'nope')
+    find = mocker.patch('usb.core.find', return_value=iter(()))
+    assert not list(devices.find_bite_healers())
+    find.assert_called_once()
+
+
+def test_string_descriptors_are_read_lazily() -> None:
+    backend = FakeUsbBackend(
+        fake_bus(
+            size=5,
+            healers=[
+                FakeUsbDevice(
+                    idVendor=0x32F9,
+                    idProduct=0xFCBA,
+                    product='heat it',
+                    serial_number=str(address),
+                    address=address,
+                )
+                for address in (1, 2, 3)
+            ],
+        )
+    )
+    bite_healers = list(devices.find_bite_healers(backend=backend))
+    assert backend.string_reads == 0
+    assert bite_healers[0].serial_number == '1'
+    assert bite_healers[0].serial_number == '1'
+    reads_for_one = backend.string_reads
+    prefetch_usb_strings(bite_healers)
+    assert [item.serial_number for item in bite_healers] == [
+        '1',
+        '2',
+        '3',
+    ]
+    assert all(
+        item.usb_product_name == 'heat it' for item in bite_healers
+    )
+    assert backend.string_reads > reads_for_one
+
+
+def test_parallel_discovery_preserves_order() -> None:
+    backend = FakeUsbBackend(
+        fake_bus(
+            size=20,
+            healers=[
+                FakeUsbDevice(
+                    idVendor=0x32F9,
+                    idProduct=0xFCBA,
+                    serial_number=str(address),
+                    address=address,
+                )
+                for address in range(1, 11)
+            ],
+        ),
+        string_latency=0.001,
+    )
+    bite_healers = list(
+        devices.find_bite_healers(backend=backend, workers=4)
+    )
+    assert backend.string_reads >= 10
+    assert [item.serial_number for item in bite_healers] == [
+        str(address) for address in range(1, 11)
+    ]
+
+
+def _heat_its(count: int) -> FakeUsbBackend:
+    return FakeUsbBackend(
+        fake_bus(
+            size=count,
+            healers=[
+                FakeUsbDevice(
+                    idVendor=0x32F9,
+                    idProduct=0xFCBA,
+                    serial_number=str(address),
+                    address=address,
+                )
+                for address in range(1, count + 1)
+            ],
+        )
+    )
+
+
+def test_prefetch_uses_discovery_workers(
+    monkeypatch: pytest.MonkeyPatch, mocker: pytest_mock.MockerFixture
+) -> None:
+    monkeypatch.setattr(settings, 'discoveryWorkers', '2')
+    executor = mocker.spy(device, 'ThreadPoolExecutor')
+    bite_healers = list(
+        devices.find_bite_healers(backend=_heat_its(5), workers=1)
+    )
+    assert not executor.called
+    prefetch_usb_strings(bite_healers)
+    assert executor.call_args.kwargs['max_workers'] == 2
+
+
+def test_select_by_location_reads_no_strings() -> None:
+    backend = _heat_its(5)
+    (bite_healer,) = devices.find_bite_healers(
+        backend=backend, selector=DeviceSelector(bus=1, address=4)
+    )
+    assert backend.string_reads == 0
+    assert bite_healer.serial_number == '4'
+
+
+def test_select_by_serial_number() -> None:
+    backend = _heat_its(5)
+    (bite_healer,) = devices.find_bite_healers(
+        backend=backend, selector=DeviceSelector(serial_number='3')
+    )
+    assert bite_healer.serial_number == '3'
+    assert not list(
+        devices.find_bite_healers(
+            backend=backend, selector=DeviceSelector(serial_number='6')
+        )
+    )
+
+
+def test_select_by_vid_pid() -> None:
+    backend = _heat_its(3)
+    for pid, expected_count in ((0xFCBA, 3), (0xFCBB, 0)):
+        selector = DeviceSelector(vid_pid=VidPid(0x32F9, pid))
+        bite_healers = devices.find_bite_healers(
+            backend=backend, selector=selector
+        )
+        assert len(list(bite_healers)) == expected_count
+
+
+def test_selection_is_lazy() -> None:
+    backend = _heat_its(5)
+    bite_healers = devices.find_bite_healers(
+        backend=backend, selector=DeviceSelector(serial_number='1')
+    )
+    assert next(bite_healers).serial_number == '1'
+    assert backend.string_reads <= 2
@@ -0,0 +1,99 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from typing import Optional
+
+import pytest
+
+from itchcraft import Api
+from itchcraft.dispatch import Invocation, parse
+
+
+@pytest.mark.parametrize(
+    'args, expected',
+    [
+        (['info'], Invocation(Api, 'info')),
+        (
+            ['info', '-f', 'json'],
+            Invocation(Api, 'info', kwargs={'format': 'json'}),
+        ),
+        (
+            ['--backend=sim', 'info', '--format=csv'],
+            Invocation(
+                Api,
+                'info',
+                init_kwargs={'backend': 'sim'},
+                kwargs={'format': 'csv'},
+            ),
+        ),
+        (
+            ['start', '-d', 'long', '-s', 'regular', '-a'],
+            Invocation(
+                Api,
+                'start',
+                kwargs={
+                    'duration': 'long',
+                    'skin_sensitivity': 'regular',
+                    'all': True,
+                },
+            ),
+        ),
+        (
+            ['start', '--nofollow', '--usb-serial=0815', '--usb_bus=2'],
+            Invocation(
+                Api,
+                'start',
+                kwargs={
+                    'follow': False,
+                    'usb_serial': '0815',
+                    'usb_bus': 2,
+                },
+            ),
+        ),
+        (
+            ['start', '--transfer_timeout', '0.5'],
+            Invocation(
+                Api, 'start', init_kwargs={'transfer_timeout': 0.5}
+            ),
+        ),
+    ],
+)
+def test_parse(args: list[str], expected: Invocation) -> None:
+    assert parse(Api, args) == expected
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        [],
+        ['--help'],
+        ['start', '-h'],
+        ['start', 'short'],
+        ['start', '--all', '--noall'],
+        ['start', '--duration'],
+        ['start', '-u', '0815'],
+        ['--backend', 'sim', 'info'],
+        ['frobnicate'],
+        ['_start'],
+    ],
+)
+def test_parse_leaves_to_fire(args: list[str]) -> None:
+    assert parse(Api, args) is None
+
+
+class _Greeter:  # pylint: disable=too-few-public-methods
+    def __init__(self, name: str = 'world') -> None:
+        self.name = name
+
+    def hello(self, greeting: Optional[str] = None) -> str:
+        return f"{greeting or 'Hello'}, {self.name}"
+
+
+def test_invocation_prints_result(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    invocation = parse(
+        _Greeter, ['hello', '--name=you', '--greeting=Hi']
+    )
+    assert invocation is not None
+    invocation()
+    assert capsys.readouterr().out == 'Hi, you\n'
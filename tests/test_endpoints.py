@@ -0,0 +1,80 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from pathlib import Path
+from typing import cast
+
+import usb.core
+
+from itchcraft.backend import UsbBulkTransferDevice
+from itchcraft.endpoints import EndpointCache, EndpointLayout
+
+from .fakes import FakeEndpoint, FakeInterface, FakePyUsbDevice
+
+_LAYOUT = EndpointLayout(
+    out_index=0, out_address=0x01, in_index=1, in_address=0x81
+)
+
+
+def _connect(device: FakePyUsbDevice) -> UsbBulkTransferDevice:
+    return UsbBulkTransferDevice(cast(usb.core.Device, device))
+
+
+def _fake(endpoint: usb.core.Endpoint) -> FakeEndpoint:
+    return cast(FakeEndpoint, endpoint)
+
+
+def test_layout_is_cached(endpoint_cache: EndpointCache) -> None:
+    _connect(FakePyUsbDevice())
+    assert endpoint_cache.get(0xF055, 0x17C4) == _LAYOUT
+
+
+def test_cached_layout_is_used(
+    endpoint_cache: EndpointCache,
+) -> None:
+    interface = FakeInterface(
+        endpoints=(
+            FakeEndpoint(0x81),
+            FakeEndpoint(0x02),
+            FakeEndpoint(0x01),
+        )
+    )
+    endpoint_cache.put(
+        0xF055,
+        0x17C4,
+        EndpointLayout(
+            out_index=2, out_address=0x01, in_index=0, in_address=0x81
+        ),
+    )
+    backend = _connect(FakePyUsbDevice(interface))
+    assert _fake(backend.endpoint_out) is interface.endpoints[2]
+    assert _fake(backend.endpoint_in) is interface.endpoints[0]
+
+
+def test_stale_layout_is_replaced(
+    endpoint_cache: EndpointCache,
+) -> None:
+    endpoint_cache.put(
+        0xF055,
+        0x17C4,
+        EndpointLayout(
+            out_index=5, out_address=0x02, in_index=1, in_address=0x82
+        ),
+    )
+    backend = _connect(FakePyUsbDevice())
+    assert backend.bulk_transfer(b'\xff\xb0') == b'\xff\xb0'
+    assert endpoint_cache.get(0xF055, 0x17C4) == _LAYOUT
+
+
+def test_persistence(tmp_path: Path) -> None:
+    path = tmp_path / 'cache' / 'endpoints.json'
+    EndpointCache(path).put(0x32F9, 0xFCBA, _LAYOUT)
+    assert EndpointCache(path).get(0x32F9, 0xFCBA) == _LAYOUT
+    assert EndpointCache(path).get(0x32F9, 0xFCBB) is None
+
+
+def test_corrupt_file_is_ignored(tmp_path: Path) -> None:
+    (path := tmp_path / 'endpoints.json').write_text('{"32f9:fcba": 1}')
+    cache = EndpointCache(path)
+    assert cache.get(0x32F9, 0xFCBA) is None
+    cache.put(0x32F9, 0xFCBA, _LAYOUT)
+    assert EndpointCache(path).get(0x32F9, 0xFCBA) == _LAYOUT
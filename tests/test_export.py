@@ -0,0 +1,90 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from collections.abc import Iterator
+import csv
+import io
+import json
+
+import pytest
+
+from itchcraft import Api, devices
+from itchcraft.device import (
+    BiteHealerMetadata,
+    UnsupportedBiteHealerMetadata,
+    UsbStrings,
+)
+from itchcraft.errors import CliError
+from itchcraft.export import Format, write_records
+from itchcraft.support import SupportStatement
+
+from .fakes import fake_bite_healer, FakeBulkTransferDevice
+
+
+def _bite_healers() -> Iterator[BiteHealerMetadata]:
+    yield UnsupportedBiteHealerMetadata(
+        usb_strings=UsbStrings.known(None, '4711'),
+        support_statement=SupportStatement(
+            vid=0xF055,
+            pid=0x0001,
+            vendor_name='ACME',
+            product_name='legacy',
+            supported=False,
+            comment='Not supported yet',
+        ),
+    )
+    yield fake_bite_healer(FakeBulkTransferDevice(serial_number='0815'))
+
+
+def test_json() -> None:
+    out = io.StringIO()
+    assert write_records(_bite_healers(), Format.JSON, out) == 2
+    records = json.loads(out.getvalue())
+    assert [record['serial_number'] for record in records] == [
+        '4711',
+        '0815',
+    ]
+    assert records[0]['comment'] == 'Not supported yet'
+
+
+def test_json_empty() -> None:
+    out = io.StringIO()
+    assert write_records(iter(()), Format.JSON, out) == 0
+    assert json.loads(out.getvalue()) == []
+
+
+def test_ndjson_streams() -> None:
+    out = io.StringIO()
+    lines: list[str] = []
+
+    def observe() -> Iterator[BiteHealerMetadata]:
+        for item in _bite_healers():
+            lines.append(out.getvalue())
+            yield item
+
+    write_records(observe(), Format.NDJSON, out)
+    assert lines[0] == ''
+    assert json.loads(lines[1])['product_name'] == 'legacy'
+    assert len(out.getvalue().splitlines()) == 2
+
+
+def test_csv() -> None:
+    out = io.StringIO()
+    write_records(_bite_healers(), Format.CSV, out)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row['supported'] for row in rows] == ['False', 'True']
+    assert rows[1]['usb_product_name'] == 'fake'
+
+
+def test_api_info_format(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(devices, 'find_bite_healers', _bite_healers)
+    Api().info(format='ndjson')
+    assert '\x1b' not in (stdout := capsys.readouterr().out)
+    assert len(stdout.splitlines()) == 2
+
+
+def test_api_info_invalid_format() -> None:
+    with pytest.raises(CliError):
+        Api().info(format='xml')
@@ -0,0 +1,46 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+import pytest
+
+from itchcraft.errors import FrameEncodingError
+from itchcraft.frames import build_table, FrameFormat
+from itchcraft.heat_it import (
+    MSG_START_HEATING,
+    msg_start_heating_request,
+)
+from itchcraft.prefs import Duration, Generation, Preferences
+
+
+def test_encode_with_checksum() -> None:
+    assert FrameFormat(prefix=b'\xff').encode(0x08, 1, 2) == (
+        b'\xff\x08\x01\x02\x0b'
+    )
+
+
+def test_encode_without_checksum() -> None:
+    frame_format = FrameFormat(prefix=b'\xaa\x55', checksum=False)
+    assert frame_format.encode(0xB0) == b'\xaa\x55\xb0'
+
+
+@pytest.mark.parametrize('payload', [(0x100,), (-1,), (0xF0, 0x10)])
+def test_encode_out_of_range(payload: tuple[int, ...]) -> None:
+    with pytest.raises(FrameEncodingError):
+        FrameFormat().encode(*payload)
+
+
+def test_build_table_is_read_only() -> None:
+    table = build_table(range(3), FrameFormat(checksum=False).encode)
+    assert table[2] == b'\x02'
+    with pytest.raises(TypeError):
+        table[3] = b'\x03'  # type: ignore[index]
+
+
+def test_msg_start_heating_table() -> None:
+    assert len(MSG_START_HEATING) == 12
+    preferences = Preferences(
+        generation=Generation.ADULT, duration=Duration.MEDIUM
+    )
+    assert msg_start_heating_request(preferences) is (
+        MSG_START_HEATING[preferences]
+    )
+    assert MSG_START_HEATING[preferences] == b'\xff\x08\x02\x01\x0b'
@@ -13,7 +13,7 @@ import pytest_mock
 
 from itchcraft import Api, devices
 from itchcraft.backend import BulkTransferDevice
-from itchcraft.device import SupportedBiteHealerMetadata
+from itchcraft.device import SupportedBiteHealerMetadata, UsbStrings
 from itchcraft.heat_it import HeatItDevice
 from itchcraft.prefs import (
     CliEnum,
@@ -55,14 +55,13 @@ def fixture_dummy_support_statement(
 def fixture_find_dummy_bite_healer(
     dummy_device: AbstractContextManager[BiteHealer],
     dummy_support_statement: SupportStatement,
-) -> Callable[[], Iterator[SupportedBiteHealerMetadata]]:
+) -> Callable[..., Iterator[SupportedBiteHealerMetadata]]:
     metadata = SupportedBiteHealerMetadata(
-        usb_product_name='dummy',
-        serial_number=None,
+        usb_strings=UsbStrings.known('dummy', None),
         connection_supplier=lambda: dummy_device,
         support_statement=dummy_support_statement,
     )
-    return lambda: iter((metadata,))
+    return lambda **_: iter((metadata,))
 
 
 @pytest.fixture(name='bulk_transfer')
@@ -84,7 +83,7 @@ def fixture_bulk_transfer(
 def test_no_preferences(bulk_transfer: pytest_mock.MockType) -> None:
     Api().start()
     bulk_transfer.assert_called_with(
-        ANY, [0xFF, 0x08, 0x00, 0x00, 0x08]
+        ANY, bytes([0xFF, 0x08, 0x00, 0x00, 0x08])
     )
 
 
@@ -137,7 +136,7 @@ def test_child_sensitive_short(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x00, 0x00, 0x08],
+        bytes([0xFF, 0x08, 0x00, 0x00, 0x08]),
     )
 
 
@@ -184,7 +183,7 @@ def test_child_sensitive_medium(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x00, 0x01, 0x09],
+        bytes([0xFF, 0x08, 0x00, 0x01, 0x09]),
     )
 
 
@@ -231,7 +230,7 @@ def test_child_sensitive_long(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x00, 0x02, 0x0A],
+        bytes([0xFF, 0x08, 0x00, 0x02, 0x0A]),
     )
 
 
@@ -273,7 +272,7 @@ def test_adult_sensitive_short(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x02, 0x00, 0x0A],
+        bytes([0xFF, 0x08, 0x02, 0x00, 0x0A]),
     )
 
 
@@ -313,7 +312,7 @@ def test_adult_sensitive_medium(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x02, 0x01, 0x0B],
+        bytes([0xFF, 0x08, 0x02, 0x01, 0x0B]),
     )
 
 
@@ -353,7 +352,7 @@ def test_adult_sensitive_long(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x02, 0x02, 0x0C],
+        bytes([0xFF, 0x08, 0x02, 0x02, 0x0C]),
     )
 
 
@@ -396,7 +395,7 @@ def test_child_regular_short(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x01, 0x00, 0x09],
+        bytes([0xFF, 0x08, 0x01, 0x00, 0x09]),
     )
 
 
@@ -437,7 +436,7 @@ def test_child_regular_medium(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x01, 0x01, 0x0A],
+        bytes([0xFF, 0x08, 0x01, 0x01, 0x0A]),
     )
 
 
@@ -478,7 +477,7 @@ def test_child_regular_long(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x01, 0x02, 0x0B],
+        bytes([0xFF, 0x08, 0x01, 0x02, 0x0B]),
     )
 
 
@@ -519,7 +518,7 @@ def test_adult_regular_short(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x03, 0x00, 0x0B],
+        bytes([0xFF, 0x08, 0x03, 0x00, 0x0B]),
     )
 
 
@@ -555,7 +554,7 @@ def test_adult_regular_medium(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x03, 0x01, 0x0C],
+        bytes([0xFF, 0x08, 0x03, 0x01, 0x0C]),
     )
 
 
@@ -591,7 +590,7 @@ def test_adult_regular_long(
     Api().start(**preferences)
     bulk_transfer.assert_called_with(
         ANY,
-        [0xFF, 0x08, 0x03, 0x02, 0x0D],
+        bytes([0xFF, 0x08, 0x03, 0x02, 0x0D]),
     )
 
 
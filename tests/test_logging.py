@@ -0,0 +1,74 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from collections.abc import Iterator
+import io
+import json
+import logging as python_logging
+import threading
+
+import pytest
+
+from itchcraft.logging import (
+    configure,
+    get_logger,
+    LogFormat,
+    queued_logging,
+)
+
+
+@pytest.fixture(name='stream')
+def fixture_stream() -> Iterator[io.StringIO]:
+    stream = io.StringIO()
+    yield stream
+    configure()
+
+
+def test_handler_is_configured_once() -> None:
+    first = get_logger('itchcraft.first')
+    second = get_logger('itchcraft.second')
+    get_logger('itchcraft.first')
+    assert not first.handlers
+    assert not second.handlers
+    assert len(python_logging.getLogger('itchcraft').handlers) == 1
+
+
+def test_configured_handler_is_kept(stream: io.StringIO) -> None:
+    configure(LogFormat.JSON, stream)
+    get_logger('itchcraft.kept').warning('kept')
+    assert json.loads(stream.getvalue())['message'] == 'kept'
+
+
+def test_text_format(stream: io.StringIO) -> None:
+    configure(LogFormat.TEXT, stream)
+    logger = get_logger('itchcraft.text')
+    logger.warning('one')
+    logger.warning('two')
+    assert stream.getvalue().count('[WARNING]') == 2
+
+
+def test_json_format(stream: io.StringIO) -> None:
+    configure(LogFormat.JSON, stream)
+    get_logger('itchcraft.json').info('Found %d devices', 3)
+    entry = json.loads(stream.getvalue())
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'itchcraft.json'
+    assert entry['message'] == 'Found 3 devices'
+
+
+def test_queued_logging(stream: io.StringIO) -> None:
+    configure(LogFormat.JSON, stream)
+    logger = get_logger('itchcraft.queued')
+    with queued_logging():
+        thread = threading.Thread(
+            target=logger.info, args=('From a worker thread',)
+        )
+        thread.start()
+        thread.join()
+    assert [
+        json.loads(line)['message']
+        for line in stream.getvalue().splitlines()
+    ] == ['From a worker thread']
+    assert isinstance(
+        python_logging.getLogger('itchcraft').handlers[0],
+        python_logging.StreamHandler,
+    )
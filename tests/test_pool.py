@@ -0,0 +1,163 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+import errno
+from typing import cast
+
+import pytest
+import usb.core
+
+from itchcraft.errors import DeadlineExceededError
+from itchcraft.pool import ConnectionPool
+
+from .fakes import FakeBulkTransferDevice, FakeUsbDevice
+
+
+class _ClosableDevice(FakeBulkTransferDevice):
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = False
+        self.alive = True
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _usb_device(address: int = 1, pid: int = 0xFCBA) -> usb.core.Device:
+    return cast(
+        usb.core.Device,
+        FakeUsbDevice(
+            idVendor=0x32F9,
+            idProduct=pid,
+            serial_number='0815',
+            address=address,
+        ),
+    )
+
+
+def _pool(
+    idle_timeout: float = 60.0,
+) -> tuple[ConnectionPool, list[_ClosableDevice]]:
+    created: list[_ClosableDevice] = []
+
+    def factory(_usb_device: usb.core.Device) -> _ClosableDevice:
+        created.append(_ClosableDevice())
+        return created[-1]
+
+    return ConnectionPool(idle_timeout, factory), created
+
+
+def test_connection_is_reused() -> None:
+    pool, created = _pool()
+    for _ in range(3):
+        with pool.checkout(_usb_device()) as device:
+            assert device is created[0]
+    assert len(created) == 1
+    assert len(pool) == 1
+
+
+def test_key_includes_location_and_model() -> None:
+    pool, created = _pool()
+    for usb_device in (
+        _usb_device(),
+        _usb_device(address=2),
+        _usb_device(pid=0x0001),
+    ):
+        with pool.checkout(usb_device):
+            pass
+    assert len(created) == 3
+
+
+def test_idle_timeout() -> None:
+    pool, created = _pool(idle_timeout=0)
+    with pool.checkout(_usb_device()):
+        pass
+    with pool.checkout(_usb_device()):
+        pass
+    assert len(created) == 2
+    assert created[0].closed
+
+
+def test_fatal_error_closes_connection() -> None:
+    pool, created = _pool()
+    with pytest.raises(usb.core.USBError):
+        with pool.checkout(_usb_device()):
+            raise usb.core.USBError('No such device', errno=errno.ENODEV)
+    assert created[0].closed
+    assert len(pool) == 0
+
+
+def test_other_error_closes_connection() -> None:
+    pool, created = _pool()
+    with pytest.raises(DeadlineExceededError):
+        with pool.checkout(_usb_device()):
+            raise DeadlineExceededError('Deadline exceeded')
+    assert created[0].closed
+    assert len(pool) == 0
+
+
+def test_transient_error_keeps_connection() -> None:
+    pool, created = _pool()
+    with pytest.raises(usb.core.USBError):
+        with pool.checkout(_usb_device()):
+            raise usb.core.USBError('Timeout', errno=errno.ETIMEDOUT)
+    assert not created[0].closed
+    assert len(pool) == 1
+
+
+def test_evict_and_close() -> None:
+    pool, created = _pool()
+    for address in (1, 2):
+        with pool.checkout(_usb_device(address=address)):
+            pass
+    pool.evict(bus=1, address=1)
+    assert [device.closed for device in created] == [True, False]
+    pool.close()
+    assert all(device.closed for device in created)
+    assert len(pool) == 0
+
+
+def test_evict_closes_checked_out_connection() -> None:
+    pool, created = _pool()
+    with pool.checkout(_usb_device()):
+        pool.evict(bus=1, address=1)
+    assert created[0].closed
+    assert len(pool) == 0
+    with pool.checkout(_usb_device()):
+        pass
+    assert not created[1].closed
+    assert len(pool) == 1
+
+
+def test_stale_connection_is_replaced() -> None:
+    pool, created = _pool()
+    with pool.checkout(_usb_device()):
+        pass
+    created[0].alive = False
+    with pool.checkout(_usb_device()) as device:
+        assert device is created[1]
+    assert created[0].closed
+    assert len(pool) == 1
+
+
+def test_failed_connect_is_checked_in() -> None:
+    created: list[_ClosableDevice] = []
+
+    def factory(_usb_device: usb.core.Device) -> _ClosableDevice:
+        if not created:
+            created.append(_ClosableDevice())
+            raise usb.core.USBError('Busy', errno=errno.EBUSY)
+        created.append(_ClosableDevice())
+        return created[-1]
+
+    pool = ConnectionPool(factory=factory)
+    with pytest.raises(usb.core.USBError):
+        with pool.checkout(_usb_device()):
+            pass
+    pool.evict(bus=1, address=1)
+    with pool.checkout(_usb_device()):
+        pass
+    assert not created[1].closed
+    assert len(pool) == 1
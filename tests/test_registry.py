@@ -0,0 +1,127 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from pathlib import Path
+import shutil
+
+import pytest
+
+from itchcraft.errors import BackendInitializationError
+from itchcraft.registry import (
+    DeviceRegistry,
+    HotplugAction,
+    HotplugEvent,
+    Location,
+    parse_uevent,
+)
+from itchcraft.support import VidPid
+
+from .fakes import FakeEventSource, hotplug_event, write_sysfs_device
+
+
+@pytest.fixture(name='event_source')
+def fixture_event_source() -> FakeEventSource:
+    return FakeEventSource()
+
+
+@pytest.fixture(name='registry')
+def fixture_registry(
+    event_source: FakeEventSource, tmp_path: Path
+) -> DeviceRegistry:
+    write_sysfs_device(
+        tmp_path, '1-1', 0x32F9, 0xFCBA, serial_number='0815', address=2
+    )
+    write_sysfs_device(tmp_path, 'usb1', vid=0x1D6B, pid=0x0002)
+    return DeviceRegistry(event_source, sysfs_root=tmp_path)
+
+
+def test_initial_scan(registry: DeviceRegistry) -> None:
+    snapshot = registry.poll()
+    assert snapshot.generation == 0
+    assert set(snapshot.by_location) == {Location(bus=1, address=2)}
+    assert snapshot.by_serial_number['0815'].supported
+    assert len(snapshot.by_vid_pid[VidPid(0x32F9, 0xFCBA)]) == 1
+
+
+def test_add_and_remove(
+    event_source: FakeEventSource,
+    registry: DeviceRegistry,
+    tmp_path: Path,
+) -> None:
+    write_sysfs_device(
+        tmp_path,
+        '1-2',
+        vid=0x32F9,
+        pid=0x0001,
+        serial_number='4711',
+        address=3,
+    )
+    event_source.pending.append(
+        hotplug_event(HotplugAction.ADD, '1-2', address=3)
+    )
+    snapshot = registry.poll()
+    assert snapshot.generation == 1
+    assert set(snapshot.by_serial_number) == {'0815', '4711'}
+
+    shutil.rmtree(tmp_path / '1-1')
+    event_source.pending.append(
+        hotplug_event(HotplugAction.REMOVE, '1-1', address=2)
+    )
+    snapshot = registry.poll()
+    assert snapshot.generation == 2
+    assert set(snapshot.by_serial_number) == {'4711'}
+
+
+def test_unrelated_events_keep_snapshot(
+    event_source: FakeEventSource,
+    registry: DeviceRegistry,
+    tmp_path: Path,
+) -> None:
+    before = registry.poll()
+    write_sysfs_device(
+        tmp_path, '1-3', vid=0x1D6B, pid=0x0003, address=4
+    )
+    event_source.pending.append(
+        hotplug_event(HotplugAction.ADD, '1-3', address=4)
+    )
+    assert registry.poll() is before
+
+
+def test_sysfs_unavailable(
+    event_source: FakeEventSource, tmp_path: Path
+) -> None:
+    with pytest.raises(BackendInitializationError):
+        DeviceRegistry(event_source, sysfs_root=tmp_path / 'missing')
+
+
+def test_parse_uevent() -> None:
+    message = b'\0'.join(
+        [
+            b'add@/devices/pci0000:00/0000:00:14.0/usb1/1-2',
+            b'ACTION=add',
+            b'DEVPATH=/devices/pci0000:00/0000:00:14.0/usb1/1-2',
+            b'SUBSYSTEM=usb',
+            b'DEVTYPE=usb_device',
+            b'PRODUCT=32f9/fcba/100',
+            b'BUSNUM=001',
+            b'DEVNUM=003',
+            b'',
+        ]
+    )
+    assert parse_uevent(message) == HotplugEvent(
+        action=HotplugAction.ADD,
+        devpath='/devices/pci0000:00/0000:00:14.0/usb1/1-2',
+        location=Location(bus=1, address=3),
+    )
+
+
+def test_parse_uevent_ignores_interfaces() -> None:
+    message = b'\0'.join(
+        [
+            b'add@/devices/pci0000:00/0000:00:14.0/usb1/1-2/1-2:1.0',
+            b'ACTION=add',
+            b'SUBSYSTEM=usb',
+            b'DEVTYPE=usb_interface',
+            b'',
+        ]
+    )
+    assert parse_uevent(message) is None
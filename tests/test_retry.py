@@ -0,0 +1,126 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+import asyncio
+import errno
+
+import pytest
+import usb.core
+
+from itchcraft.backend import ThreadedAsyncBulkTransferDevice
+from itchcraft.heat_it import (
+    AsyncHeatItDevice,
+    HeatItDevice,
+    msg_start_heating_request,
+)
+from itchcraft.prefs import Preferences
+from itchcraft.retry import (
+    is_transient,
+    METRICS,
+    RetryMetrics,
+    RetryPolicy,
+)
+
+from .fakes import FakeBulkTransferDevice
+
+_NO_WAIT = RetryPolicy(initial_wait=0, jitter=0)
+
+
+def _usb_error(error_number: int) -> usb.core.USBError:
+    return usb.core.USBError('Scripted failure', errno=error_number)
+
+
+@pytest.mark.parametrize(
+    'error_number, expected',
+    [
+        (errno.ETIMEDOUT, True),
+        (errno.EPIPE, True),
+        (errno.ENODEV, False),
+        (errno.EACCES, False),
+    ],
+)
+def test_is_transient(error_number: int, expected: bool) -> None:
+    assert is_transient(_usb_error(error_number)) is expected
+
+
+def test_transient_errors_are_retried() -> None:
+    fake_device = FakeBulkTransferDevice(
+        responses=[
+            _usb_error(errno.ETIMEDOUT),
+            _usb_error(errno.EPIPE),
+        ]
+    )
+    retries_before = METRICS.retries
+    HeatItDevice(fake_device, _NO_WAIT).self_test()
+    assert fake_device.requests == [b'\xff\xb0'] * 3 + [b'\xff\x02\x02']
+    assert METRICS.retries - retries_before == 2
+
+
+@pytest.mark.parametrize('error_number', [errno.ENODEV, errno.EACCES])
+def test_fatal_errors_fail_fast(error_number: int) -> None:
+    fake_device = FakeBulkTransferDevice(error=_usb_error(error_number))
+    with pytest.raises(usb.core.USBError):
+        HeatItDevice(fake_device, _NO_WAIT).self_test()
+    assert len(fake_device.requests) == 1
+
+
+def test_max_attempts() -> None:
+    fake_device = FakeBulkTransferDevice(error=_usb_error(errno.EPIPE))
+    metrics = RetryMetrics()
+    policy = RetryPolicy(max_attempts=4, initial_wait=0, jitter=0)
+    with pytest.raises(usb.core.USBError):
+        policy.call(HeatItDevice(fake_device).test_bootloader, metrics)
+    assert len(fake_device.requests) == 4
+    assert (metrics.operations, metrics.failures) == (1, 1)
+
+
+def test_deadline() -> None:
+    fake_device = FakeBulkTransferDevice(error=_usb_error(errno.EPIPE))
+    with pytest.raises(usb.core.USBError):
+        HeatItDevice(fake_device, RetryPolicy(deadline=0)).self_test()
+    assert len(fake_device.requests) == 1
+
+
+def test_async_retry() -> None:
+    fake_device = FakeBulkTransferDevice(
+        responses=[_usb_error(errno.ETIMEDOUT)]
+    )
+    bite_healer = AsyncHeatItDevice(
+        ThreadedAsyncBulkTransferDevice(fake_device), _NO_WAIT
+    )
+    asyncio.run(bite_healer.self_test())
+    assert fake_device.requests == [b'\xff\xb0'] * 2 + [b'\xff\x02\x02']
+
+
+def test_start_follows_retried_self_test() -> None:
+    fake_device = FakeBulkTransferDevice(
+        responses=[_usb_error(errno.ETIMEDOUT)]
+    )
+    preferences = Preferences()
+    HeatItDevice(fake_device, _NO_WAIT).self_test_and_start(preferences)
+    assert fake_device.requests == [
+        b'\xff\xb0',
+        b'\xff\xb0',
+        b'\xff\x02\x02',
+        msg_start_heating_request(preferences),
+    ]
+    assert fake_device.discards == 1
+
+
+def test_fatal_errors_prevent_start() -> None:
+    fake_device = FakeBulkTransferDevice(error=_usb_error(errno.ENODEV))
+    with pytest.raises(usb.core.USBError):
+        HeatItDevice(fake_device, _NO_WAIT).self_test_and_start(
+            Preferences()
+        )
+    assert len(fake_device.requests) == 1
+
+
+def test_responses_need_not_echo_the_command() -> None:
+    fake_device = FakeBulkTransferDevice()
+    preferences = Preferences()
+    HeatItDevice(fake_device, _NO_WAIT).self_test_and_start(preferences)
+    assert fake_device.requests == [
+        b'\xff\xb0',
+        b'\xff\x02\x02',
+        msg_start_heating_request(preferences),
+    ]
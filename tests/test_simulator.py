@@ -0,0 +1,99 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+import pytest
+import usb.core
+
+from itchcraft import Api, devices, settings, simulator
+from itchcraft.errors import CliError
+from itchcraft.heat_it import GET_STATUS, HeatItDevice
+from itchcraft.prefs import Duration, Preferences
+from itchcraft.simulator import (
+    SimulatedBulkTransferDevice,
+    SimulatedState,
+    SimulatorConfig,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture(name='clock')
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> _FakeClock:
+    clock = _FakeClock()
+    monkeypatch.setattr(simulator, 'time', clock)
+    return clock
+
+
+def test_parse_config() -> None:
+    assert SimulatorConfig.parse('devices=200, latency=0.5') == (
+        SimulatorConfig(devices=200, latency=0.5)
+    )
+    assert SimulatorConfig.parse('') == SimulatorConfig()
+
+
+@pytest.mark.parametrize('options', ['colour=red', 'devices=many'])
+def test_parse_invalid_config(options: str) -> None:
+    with pytest.raises(CliError):
+        SimulatorConfig.parse(options)
+
+
+def test_state_machine(clock: _FakeClock) -> None:
+    device = SimulatedBulkTransferDevice(SimulatorConfig(time_scale=2))
+    bite_healer = HeatItDevice(device)
+    bite_healer.self_test()
+    assert bite_healer.read_status().state == SimulatedState.IDLE
+    bite_healer.start_with_preferences(Preferences(duration=Duration.LONG))
+    assert bite_healer.read_status().state == SimulatedState.PREHEATING
+    clock.now += 1
+    assert device.state() is SimulatedState.HOLDING
+    clock.now += 4
+    assert device.state() is SimulatedState.IDLE
+
+
+def test_invalid_frame() -> None:
+    with pytest.raises(usb.core.USBError):
+        SimulatedBulkTransferDevice().bulk_transfer(b'\xff\x08\x00')
+
+
+def test_error_burst(
+    clock: _FakeClock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    device = SimulatedBulkTransferDevice(
+        SimulatorConfig(latency=0.1, error_rate=0.5, error_burst=3)
+    )
+    monkeypatch.setattr(
+        device._random,  # pylint: disable=protected-access
+        'random',
+        iter([0.0, 0.9]).__next__,
+    )
+    outcomes = []
+    for _ in range(4):
+        try:
+            device.bulk_transfer(GET_STATUS)
+        except usb.core.USBError:
+            outcomes.append(False)
+        else:
+            outcomes.append(True)
+    assert outcomes == [False, False, False, True]
+    assert clock.now == pytest.approx(100.1)
+
+
+def test_api_start_all_simulated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'simulatorOptions', 'devices=50')
+    Api(backend='sim', session_timeout=5).start(all=True)
+    with settings.overridden(settings.Overrides(backend='sim')):
+        assert len(list(devices.find_bite_healers())) == 50
+
+
+def test_api_overrides_stay_with_the_instance() -> None:
+    Api(backend='sim', transfer_timeout=0.5, session_timeout=5)
+    assert settings.current_overrides() == settings.Overrides()
+    assert settings.backend_name() == settings.backend
@@ -0,0 +1,146 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from collections.abc import Callable, Iterator
+import time
+from typing import cast
+
+import pytest
+
+from itchcraft import Api, devices, start
+from itchcraft.device import SupportedBiteHealerMetadata
+from itchcraft.devices import DeviceSelector
+from itchcraft.errors import BackendInitializationError, CliError
+from itchcraft.prefs import Preferences
+from itchcraft.start import start_all_with_preferences
+from itchcraft.support import VidPid
+
+from .fakes import fake_bite_healer, FakeBulkTransferDevice
+
+_LATENCY = 0.05
+
+
+def _install(
+    monkeypatch: pytest.MonkeyPatch,
+    bite_healers: list[SupportedBiteHealerMetadata],
+) -> None:
+    find: Callable[..., object] = lambda **_: iter(bite_healers)
+    monkeypatch.setattr(devices, 'find_bite_healers', find)
+
+
+def test_start_all_runs_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_devices = [
+        FakeBulkTransferDevice(serial_number=str(n), latency=_LATENCY)
+        for n in range(8)
+    ]
+    _install(
+        monkeypatch, [fake_bite_healer(device) for device in fake_devices]
+    )
+    start_time = time.perf_counter()
+    results = start_all_with_preferences(Preferences())
+    elapsed = time.perf_counter() - start_time
+    assert all(result.succeeded for result in results)
+    assert [result.bite_healer.serial_number for result in results] == [
+        str(n) for n in range(8)
+    ]
+    assert all(len(device.requests) == 3 for device in fake_devices)
+    assert elapsed < 3 * _LATENCY * len(fake_devices) / 2
+
+
+@pytest.mark.parametrize(
+    'error', [BackendInitializationError('gone'), RuntimeError('bug')]
+)
+def test_start_all_aggregates_errors(
+    error: Exception,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install(
+        monkeypatch,
+        [
+            fake_bite_healer(FakeBulkTransferDevice(serial_number='good')),
+            fake_bite_healer(
+                FakeBulkTransferDevice(serial_number='bad'),
+                connection_error=error,
+            ),
+        ],
+    )
+    good, bad = start_all_with_preferences(Preferences(), max_workers=1)
+    assert good.succeeded
+    assert bad.error is error
+
+
+def test_api_start_all_fails_if_any_device_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install(
+        monkeypatch,
+        [
+            fake_bite_healer(
+                FakeBulkTransferDevice(),
+                connection_error=BackendInitializationError('gone'),
+            )
+        ],
+    )
+    with pytest.raises(CliError):
+        Api().start(all=True)
+
+
+def test_api_start_follow(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(start, 'FOLLOW_IDLE_TIMEOUT', 0.0)
+    fake_device = FakeBulkTransferDevice()
+    _install(monkeypatch, [fake_bite_healer(fake_device)])
+    Api().start(follow=True)
+    assert fake_device.requests[3:] == [b'\xff\x02\x02'] * 2
+
+
+def test_api_start_follow_all() -> None:
+    with pytest.raises(CliError):
+        Api().start(all=True, follow=True)
+
+
+def test_start_stops_at_first_supported_device(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_device = FakeBulkTransferDevice()
+
+    def find(**_: object) -> Iterator[SupportedBiteHealerMetadata]:
+        yield fake_bite_healer(fake_device)
+        raise AssertionError('Scanned past the first bite healer')
+
+    monkeypatch.setattr(devices, 'find_bite_healers', find)
+    start.start_with_preferences(Preferences())
+    assert len(fake_device.requests) == 3
+
+
+def test_start_passes_selector(monkeypatch: pytest.MonkeyPatch) -> None:
+    selectors: list[DeviceSelector] = []
+
+    def find(
+        selector: DeviceSelector,
+    ) -> Iterator[SupportedBiteHealerMetadata]:
+        selectors.append(selector)
+        return iter(())
+
+    monkeypatch.setattr(devices, 'find_bite_healers', find)
+    with pytest.raises(CliError, match='No bite healer matches'):
+        Api().start(
+            # Fire passes numeric serial numbers as int
+            usb_serial=cast(str, 4711),
+            usb_bus=1,
+            usb_address=2,
+            usb_id='32f9:fcba',
+        )
+    assert selectors == [
+        DeviceSelector(
+            serial_number='4711',
+            bus=1,
+            address=2,
+            vid_pid=VidPid(0x32F9, 0xFCBA),
+        )
+    ]
+
+
+def test_start_rejects_invalid_usb_id() -> None:
+    with pytest.raises(CliError):
+        Api().start(usb_id='heat it')
@@ -0,0 +1,108 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+import json
+from pathlib import Path
+
+import pytest
+
+from itchcraft.settings import PROJECT_ROOT
+from itchcraft.support import (
+    load_support_statements,
+    PROTOCOLS,
+    SUPPORT_DATABASE,
+    SUPPORT_STATEMENTS,
+    SupportDatabase,
+    SupportStatement,
+)
+
+
+def _statement(pid: int, product_name: str = 'dummy') -> SupportStatement:
+    return SupportStatement(
+        vid=0xF055,
+        pid=pid,
+        vendor_name='ACME',
+        product_name=product_name,
+        supported=False,
+    )
+
+
+def test_lookup() -> None:
+    database = SupportDatabase(SUPPORT_STATEMENTS)
+    statement = database.lookup(0x32F9, 0xFCBA)
+    assert statement is not None and statement.supported
+    assert database.lookup(0x32F9, 0xFFFF) is None
+    assert database.lookup(0x1D6B, 0x0002) is None
+    assert database.vendor_ids == {0x32F9, 0x10C4}
+    assert len(database) == len(SUPPORT_STATEMENTS)
+
+
+def test_last_statement_wins() -> None:
+    database = SupportDatabase(
+        [_statement(1, 'old'), _statement(2), _statement(1, 'new')]
+    )
+    statement = database.lookup(0xF055, 1)
+    assert statement is not None and statement.product_name == 'new'
+    assert len(database) == 2
+
+
+def test_load_support_statements(tmp_path: Path) -> None:
+    (path := tmp_path / 'support.json').write_text(
+        json.dumps(
+            [
+                {
+                    'vid': 'f055',
+                    'pid': '17c4',
+                    'vendor_name': 'ACME',
+                    'product_name': 'heat it clone',
+                    'protocol': 'heat-it',
+                },
+                {
+                    'vid': 'f055',
+                    'pid': '17c5',
+                    'vendor_name': 'ACME',
+                    'product_name': 'something else',
+                    'supported': False,
+                },
+            ]
+        )
+    )
+    supported, unsupported = load_support_statements(path)
+    assert (supported.vid, supported.pid) == (0xF055, 0x17C4)
+    assert supported.connection_supplier is PROTOCOLS['heat-it']
+    assert not unsupported.supported
+    assert unsupported.connection_supplier is None
+
+
+@pytest.mark.parametrize(
+    'entry',
+    [
+        {'vid': 'f055', 'pid': '17c4'},
+        {
+            'vid': 'f055',
+            'pid': '17c4',
+            'vendor_name': 'ACME',
+            'product_name': 'dummy',
+        },
+        {
+            'vid': 'f055',
+            'pid': '17c4',
+            'vendor_name': 'ACME',
+            'product_name': 'dummy',
+            'protocol': 'carrier-pigeon',
+        },
+    ],
+)
+def test_load_invalid_support_statements(
+    tmp_path: Path, entry: dict[str, str]
+) -> None:
+    (path := tmp_path / 'support.json').write_text(json.dumps([entry]))
+    with pytest.raises(ValueError):
+        load_support_statements(path)
+
+
+def test_udev_rules_are_up_to_date() -> None:
+    rules = PROJECT_ROOT / 'contrib' / 'udev' / '60-itchcraft.rules'
+    assert rules.read_text(encoding='utf-8') == (
+        SupportDatabase(SUPPORT_STATEMENTS).udev_rules()
+    )
+    assert len(SUPPORT_DATABASE) >= len(SUPPORT_STATEMENTS)
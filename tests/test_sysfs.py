@@ -0,0 +1,71 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from pathlib import Path
+
+import pytest
+import pytest_mock
+
+from itchcraft.errors import BackendInitializationError
+from itchcraft.sysfs import find_usb_devices, SysfsUsbDevice
+
+from .fakes import write_sysfs_device
+
+
+def test_find_usb_devices(tmp_path: Path) -> None:
+    write_sysfs_device(tmp_path, 'usb1', vid=0x1D6B, pid=0x0002)
+    write_sysfs_device(
+        tmp_path,
+        '1-1',
+        vid=0x32F9,
+        pid=0xFCBA,
+        product='heat it',
+        serial_number='0815',
+        bus=3,
+        address=7,
+    )
+    (tmp_path / '1-1:1.0').mkdir()
+    assert find_usb_devices(tmp_path, {0x32F9}) == [
+        SysfsUsbDevice(
+            idVendor=0x32F9,
+            idProduct=0xFCBA,
+            bus=3,
+            address=7,
+            product='heat it',
+            serial_number='0815',
+        )
+    ]
+
+
+def test_find_usb_devices_without_strings(tmp_path: Path) -> None:
+    write_sysfs_device(tmp_path, '1-1', vid=0x32F9, pid=0x0001)
+    (device,) = find_usb_devices(tmp_path, {0x32F9}) or []
+    assert device.product is None
+    assert device.serial_number is None
+
+
+def test_find_usb_devices_skips_malformed_entries(tmp_path: Path) -> None:
+    write_sysfs_device(tmp_path, '1-1', vid=0x32F9, pid=0xFCBA)
+    write_sysfs_device(tmp_path, '1-2', vid=0x32F9, pid=0xFCBA, address=2)
+    (tmp_path / '1-1' / 'idVendor').write_text('heat it\n')
+    (device,) = find_usb_devices(tmp_path, {0x32F9}) or []
+    assert device.address == 2
+
+
+def test_find_usb_devices_unavailable(tmp_path: Path) -> None:
+    assert find_usb_devices(tmp_path / 'missing', {0x32F9}) is None
+
+
+def test_resolve_disconnected_device(
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    mocker.patch('usb.core.find', return_value=None)
+    device = SysfsUsbDevice(
+        idVendor=0x32F9,
+        idProduct=0xFCBA,
+        bus=3,
+        address=7,
+        product=None,
+        serial_number=None,
+    )
+    with pytest.raises(BackendInitializationError):
+        device.resolve()
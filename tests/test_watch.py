@@ -0,0 +1,72 @@
+# pylint: disable=magic-value-comparison, missing-function-docstring, missing-module-docstring
+
+from itertools import islice
+
+import pytest
+
+from itchcraft import heat_it
+from itchcraft.errors import BiteHealerError
+from itchcraft.heat_it import HeatItDevice, HeatItStatus
+
+from .fakes import FakeBulkTransferDevice
+
+_IDLE = b'\xff\x02\x00' + bytes(9)
+_HEATING = b'\xff\x02\x01' + bytes(9)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(name='clock')
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> _FakeClock:
+    clock = _FakeClock()
+    monkeypatch.setattr(heat_it, 'time', clock)
+    return clock
+
+
+def test_decode() -> None:
+    status = HeatItStatus.decode(_HEATING)
+    assert (status.header, status.command, status.state) == (
+        0xFF,
+        0x02,
+        0x01,
+    )
+    assert status.data == bytes(9)
+
+
+def test_decode_wrong_length() -> None:
+    with pytest.raises(BiteHealerError):
+        HeatItStatus.decode(b'\xff\x02')
+
+
+def test_watch_yields_changes_only(clock: _FakeClock) -> None:
+    device = FakeBulkTransferDevice(
+        responses=[_HEATING, _HEATING, _HEATING, _IDLE, _IDLE]
+    )
+    statuses = list(
+        islice(HeatItDevice(device).watch(interval=1, max_interval=3), 2)
+    )
+    assert [status.state for status in statuses] == [1, 0]
+    assert device.requests == [b'\xff\x02\x02'] * 4
+    assert clock.sleeps == [1, 2, 3]
+
+
+def test_watch_idle_timeout(clock: _FakeClock) -> None:
+    device = FakeBulkTransferDevice(responses=[_IDLE] * 10)
+    statuses = list(
+        HeatItDevice(device).watch(
+            interval=1, max_interval=2, idle_timeout=4
+        )
+    )
+    assert len(statuses) == 1
+    assert clock.now == 5